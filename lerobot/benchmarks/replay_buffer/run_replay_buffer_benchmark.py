@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare the sampling throughput of the RL replay buffer with uniform and prioritized sampling.
+
+The buffer is filled with random transitions (one image and one state key by default). In prioritized mode,
+each sampled batch is followed by a priority update with random TD-errors, as done by the learner.
+
+Example:
+    python benchmarks/replay_buffer/run_replay_buffer_benchmark.py --capacity 100000 --batch-size 256
+"""
+
+import argparse
+import time
+
+import torch
+
+from lerobot.rl.buffer import ReplayBuffer
+from lerobot.utils.constants import OBS_IMAGE, OBS_STATE
+
+
+def make_buffer(args: argparse.Namespace, prioritized: bool) -> ReplayBuffer:
+    state_keys = [OBS_STATE] + ([OBS_IMAGE] if args.image_size > 0 else [])
+    buffer = ReplayBuffer(
+        capacity=args.capacity,
+        device=args.device,
+        state_keys=state_keys,
+        use_drq=False,
+        image_augmentation_function=lambda images: images,
+        optimize_memory=True,
+        prioritized=prioritized,
+    )
+
+    chunk_size = 1000
+    for start in range(0, args.capacity, chunk_size):
+        n = min(chunk_size, args.capacity - start)
+        state = {OBS_STATE: torch.randn(n, args.state_dim)}
+        if args.image_size > 0:
+            state[OBS_IMAGE] = torch.rand(n, 3, args.image_size, args.image_size)
+        done = torch.zeros(n, dtype=torch.bool)
+        done[args.episode_length - 1 :: args.episode_length] = True
+        buffer.add_batch(
+            state=state,
+            action=torch.randn(n, args.action_dim),
+            reward=torch.zeros(n),
+            next_state=state,
+            done=done,
+            truncated=torch.zeros(n, dtype=torch.bool),
+        )
+    return buffer
+
+
+def benchmark(buffer: ReplayBuffer, args: argparse.Namespace) -> float:
+    """Returns the number of sampled transitions per second"""
+
+    def step():
+        batch = buffer.sample(args.batch_size)
+        if buffer.prioritized:
+            buffer.update_priorities(batch["index"], torch.rand(args.batch_size))
+
+    for _ in range(args.num_warmup):
+        step()
+    if torch.device(args.device).type == "cuda":
+        torch.cuda.synchronize()
+
+    start = time.perf_counter()
+    for _ in range(args.num_iterations):
+        step()
+    if torch.device(args.device).type == "cuda":
+        torch.cuda.synchronize()
+    elapsed = time.perf_counter() - start
+
+    return args.num_iterations * args.batch_size / elapsed
+
+
+def main(args: argparse.Namespace):
+    torch.manual_seed(args.seed)
+    for prioritized in (False, True):
+        buffer = make_buffer(args, prioritized=prioritized)
+        samples_per_second = benchmark(buffer, args)
+        name = "prioritized" if prioritized else "uniform"
+        print(f"{name:>12}: {samples_per_second:,.0f} samples/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--capacity", type=int, default=100_000, help="Number of transitions in the buffer.")
+    parser.add_argument("--batch-size", type=int, default=256, help="Number of transitions per batch.")
+    parser.add_argument("--state-dim", type=int, default=18, help="Dimension of the state key.")
+    parser.add_argument("--action-dim", type=int, default=4, help="Dimension of the actions.")
+    parser.add_argument(
+        "--image-size", type=int, default=64, help="Side of the (square) images, 0 to disable the image key."
+    )
+    parser.add_argument("--episode-length", type=int, default=100, help="Length of the episodes.")
+    parser.add_argument("--device", type=str, default="cpu", help="Device the batches are sampled on.")
+    parser.add_argument("--num-warmup", type=int, default=10, help="Number of untimed iterations.")
+    parser.add_argument("--num-iterations", type=int, default=200, help="Number of timed iterations.")
+    parser.add_argument("--seed", type=int, default=1000, help="Random seed.")
+    main(parser.parse_args())
@@ -17,12 +17,17 @@ from dataclasses import dataclass, field
 
 import torch
 
+from lerobot.configs.policies import POLICY_RUNTIMES
 from lerobot.robots.config import RobotConfig
 
 from .constants import (
     DEFAULT_FPS,
     DEFAULT_INFERENCE_LATENCY,
+    DEFAULT_LATENCY_EWMA_ALPHA,
+    DEFAULT_LATENCY_PERCENTILE,
     DEFAULT_OBS_QUEUE_TIMEOUT,
+    DEFAULT_SHARED_MEMORY_SLOTS,
+    SUPPORTED_TRANSPORTS,
 )
 
 # Aggregate function registry for CLI usage
@@ -64,11 +69,29 @@ class PolicyServerConfig:
         default=DEFAULT_OBS_QUEUE_TIMEOUT, metadata={"help": "Timeout for observation queue in seconds"}
     )
 
+    # Transport configuration
+    transport: str = field(
+        default="grpc",
+        metadata={"help": f"Observation transports accepted from clients. Options: {SUPPORTED_TRANSPORTS}"},
+    )
+
+    # Policy loading configuration
+    fast_load: bool = field(
+        default=True,
+        metadata={
+            "help": "Build the policies directly on their device and stream their memory-mapped weights into "
+            "them (see `PreTrainedPolicy.from_pretrained`)"
+        },
+    )
+
     def __post_init__(self):
         """Validate configuration after initialization."""
         if self.port < 1 or self.port > 65535:
             raise ValueError(f"Port must be between 1 and 65535, got {self.port}")
 
+        if self.transport not in SUPPORTED_TRANSPORTS:
+            raise ValueError(f"transport must be one of {SUPPORTED_TRANSPORTS}, got {self.transport}")
+
         if self.environment_dt <= 0:
             raise ValueError(f"environment_dt must be positive, got {self.environment_dt}")
 
@@ -96,6 +119,7 @@ class PolicyServerConfig:
             "fps": self.fps,
             "environment_dt": self.environment_dt,
             "inference_latency": self.inference_latency,
+            "transport": self.transport,
         }
 
 
@@ -124,13 +148,42 @@ class RobotClientConfig:
     # Network configuration
     server_address: str = field(default="localhost:8080", metadata={"help": "Server address to connect to"})
 
+    # With "shared_memory", observations are written in a shared-memory ring buffer and only a reference to them
+    # goes through gRPC. Requires the policy server to run on the same host.
+    transport: str = field(
+        default="grpc", metadata={"help": f"Observation transport. Options: {SUPPORTED_TRANSPORTS}"}
+    )
+    shared_memory_slots: int = field(
+        default=DEFAULT_SHARED_MEMORY_SLOTS,
+        metadata={"help": "Number of observations held in the shared-memory ring buffer"},
+    )
+
     # Device configuration
     policy_device: str = field(default="cpu", metadata={"help": "Device for policy inference"})
+    policy_runtime: str = field(
+        default="eager",
+        metadata={"help": f"Runtime of the policy on the server. Options: {list(POLICY_RUNTIMES)}"},
+    )
 
     # Control behavior configuration
     chunk_size_threshold: float = field(default=0.5, metadata={"help": "Threshold for chunk size control"})
     fps: int = field(default=DEFAULT_FPS, metadata={"help": "Frames per second"})
 
+    # Adaptive chunk scheduling: send observations based on the measured round-trip latency rather than on the
+    # static `chunk_size_threshold` (which is only used until the first latency measurement is available)
+    adaptive_chunk_scheduling: bool = field(
+        default=False, metadata={"help": "Trigger observations based on the measured server round-trip"}
+    )
+    latency_ewma_alpha: float = field(
+        default=DEFAULT_LATENCY_EWMA_ALPHA, metadata={"help": "Smoothing factor of the latency EWMA"}
+    )
+    latency_percentile: float = field(
+        default=DEFAULT_LATENCY_PERCENTILE, metadata={"help": "High percentile of the latency distribution"}
+    )
+    latency_safety_margin_steps: int = field(
+        default=1, metadata={"help": "Extra control steps to keep in the queue when the next chunk arrives"}
+    )
+
     # Aggregate function configuration (CLI-compatible)
     aggregate_fn_name: str = field(
         default="weighted_average",
@@ -161,15 +214,35 @@ class RobotClientConfig:
         if not self.policy_device:
             raise ValueError("policy_device cannot be empty")
 
+        if self.policy_runtime not in POLICY_RUNTIMES:
+            raise ValueError(f"policy_runtime must be one of {POLICY_RUNTIMES}, got {self.policy_runtime}")
+
         if self.chunk_size_threshold < 0 or self.chunk_size_threshold > 1:
             raise ValueError(f"chunk_size_threshold must be between 0 and 1, got {self.chunk_size_threshold}")
 
         if self.fps <= 0:
             raise ValueError(f"fps must be positive, got {self.fps}")
 
+        if self.transport not in SUPPORTED_TRANSPORTS:
+            raise ValueError(f"transport must be one of {SUPPORTED_TRANSPORTS}, got {self.transport}")
+
+        if self.shared_memory_slots <= 0:
+            raise ValueError(f"shared_memory_slots must be positive, got {self.shared_memory_slots}")
+
         if self.actions_per_chunk <= 0:
             raise ValueError(f"actions_per_chunk must be positive, got {self.actions_per_chunk}")
 
+        if self.latency_ewma_alpha <= 0 or self.latency_ewma_alpha > 1:
+            raise ValueError(f"latency_ewma_alpha must be in (0, 1], got {self.latency_ewma_alpha}")
+
+        if self.latency_percentile <= 0 or self.latency_percentile > 1:
+            raise ValueError(f"latency_percentile must be in (0, 1], got {self.latency_percentile}")
+
+        if self.latency_safety_margin_steps < 0:
+            raise ValueError(
+                f"latency_safety_margin_steps must be non-negative, got {self.latency_safety_margin_steps}"
+            )
+
         self.aggregate_fn = get_aggregate_function(self.aggregate_fn_name)
 
     @classmethod
@@ -181,11 +254,18 @@ class RobotClientConfig:
         """Convert the configuration to a dictionary."""
         return {
             "server_address": self.server_address,
+            "transport": self.transport,
+            "shared_memory_slots": self.shared_memory_slots,
             "policy_type": self.policy_type,
             "pretrained_name_or_path": self.pretrained_name_or_path,
             "policy_device": self.policy_device,
+            "policy_runtime": self.policy_runtime,
             "chunk_size_threshold": self.chunk_size_threshold,
             "fps": self.fps,
+            "adaptive_chunk_scheduling": self.adaptive_chunk_scheduling,
+            "latency_ewma_alpha": self.latency_ewma_alpha,
+            "latency_percentile": self.latency_percentile,
+            "latency_safety_margin_steps": self.latency_safety_margin_steps,
             "actions_per_chunk": self.actions_per_chunk,
             "task": self.task,
             "debug_visualize_queue_size": self.debug_visualize_queue_size,
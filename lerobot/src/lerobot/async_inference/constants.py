@@ -22,6 +22,17 @@ DEFAULT_INFERENCE_LATENCY = 1 / DEFAULT_FPS
 """Server side: Timeout for observation queue in seconds"""
 DEFAULT_OBS_QUEUE_TIMEOUT = 2
 
+"""Client side: Smoothing factor and high percentile used to estimate the observation -> action round-trip"""
+DEFAULT_LATENCY_EWMA_ALPHA = 0.1
+DEFAULT_LATENCY_PERCENTILE = 0.95
+
+"""Client side: Number of observations the shared-memory ring buffer can hold before overwriting the oldest"""
+DEFAULT_SHARED_MEMORY_SLOTS = 16
+
+# Transports used to send observations from the robot client to the policy server.
+# "shared_memory" requires the client and the server to run on the same host.
+SUPPORTED_TRANSPORTS = ["grpc", "shared_memory"]
+
 # All action chunking policies
 SUPPORTED_POLICIES = ["act", "smolvla", "diffusion", "tdmpc", "vqbet", "pi0", "pi05"]
 
@@ -14,8 +14,11 @@
 
 import logging
 import logging.handlers
+import math
 import os
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -34,6 +37,7 @@ from lerobot.policies import (  # noqa: F401
     VQBeTConfig,
 )
 from lerobot.robots.robot import Robot
+from lerobot.transport.shared_memory import SharedMemoryRef, SharedMemoryRingBuffer, SharedMemoryRingSpec
 from lerobot.utils.constants import OBS_IMAGES, OBS_STATE, OBS_STR
 from lerobot.utils.utils import init_logging
 
@@ -66,6 +70,28 @@ def map_robot_keys_to_lerobot_features(robot: Robot) -> dict[str, dict]:
     return hw_to_dataset_features(robot.observation_features, OBS_STR, use_video=False)
 
 
+def robot_observation_fields(robot: Robot) -> dict[str, tuple[tuple[int, ...], str]]:
+    """Fixed (shape, dtype) layout of the robot raw observations, used to allocate shared-memory buffers"""
+    return {
+        key: (tuple(ft), "uint8") if isinstance(ft, tuple) else ((), "float32")
+        for key, ft in robot.observation_features.items()
+    }
+
+
+def read_raw_observation_from_shared_memory(
+    ring: SharedMemoryRingBuffer, ref: SharedMemoryRef
+) -> RawObservation | None:
+    """Zero-copy read of a raw observation written in a shared-memory ring buffer.
+    Returns None if the observation has already been overwritten by the client."""
+    views = ring.read(ref)
+    if views is None:
+        return None
+
+    # Scalars (motor positions) are copied out, as they are also used for similarity checks against later
+    # observations. Images are returned as views over the shared memory.
+    return {key: view if view.ndim > 0 else float(view) for key, view in views.items()}
+
+
 def is_image_key(k: str) -> bool:
     return k.startswith(OBS_IMAGES)
 
@@ -228,6 +254,8 @@ class TimedAction(TimedData):
 class TimedObservation(TimedData):
     observation: RawObservation
     must_go: bool = False
+    # Set when the observation content lives in a shared-memory ring buffer rather than in `observation`
+    shared_memory_ref: SharedMemoryRef | None = None
 
     def get_observation(self):
         return self.observation
@@ -261,6 +289,117 @@ class FPSTracker:
         self.total_obs_count = 0
 
 
+@dataclass
+class LatencyTracker:
+    """Online estimate of the observation -> action chunk round-trip latency.
+
+    Combines an exponentially weighted moving average with a high percentile over a sliding window of
+    recent measurements, so that occasional slow inferences are accounted for without overreacting to them.
+    """
+
+    ewma_alpha: float = 0.1
+    percentile: float = 0.95
+    window_size: int = 100
+    ewma: float | None = None
+    samples: deque = field(default_factory=deque)
+
+    def update(self, latency: float) -> None:
+        """Record a new round-trip latency measurement, in seconds"""
+        self.ewma = (
+            latency if self.ewma is None else (1 - self.ewma_alpha) * self.ewma + self.ewma_alpha * latency
+        )
+        self.samples.append(latency)
+        if len(self.samples) > self.window_size:
+            self.samples.popleft()
+
+    def high_percentile(self) -> float | None:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))]
+
+    def estimate(self) -> float | None:
+        """Conservative latency estimate: the larger between the EWMA and the high percentile"""
+        if self.ewma is None:
+            return None
+        return max(self.ewma, self.high_percentile())
+
+    def reset(self):
+        self.ewma = None
+        self.samples.clear()
+
+
+class AdaptiveChunkScheduler:
+    """Decides when the client should send a new observation, based on the measured round-trip latency.
+
+    A new observation is triggered as soon as the actions left in the queue cover less than the expected
+    time needed to receive the next chunk (plus a safety margin of a few control steps), so that the next
+    chunk arrives before the queue drains. Until a latency measurement is available, it falls back to the
+    static `chunk_size_threshold` rule.
+    """
+
+    def __init__(
+        self,
+        environment_dt: float,
+        chunk_size_threshold: float,
+        ewma_alpha: float = 0.1,
+        percentile: float = 0.95,
+        window_size: int = 100,
+        safety_margin_steps: int = 1,
+    ):
+        self.environment_dt = environment_dt
+        self.chunk_size_threshold = chunk_size_threshold
+        self.safety_margin_steps = safety_margin_steps
+        self.latency_tracker = LatencyTracker(ewma_alpha, percentile, window_size)
+
+        self._lock = threading.Lock()
+        self._underrun_count = 0
+        self._in_underrun = False
+
+    def record_latency(self, latency: float) -> None:
+        with self._lock:
+            self.latency_tracker.update(latency)
+
+    def update_underrun(self, stalled: bool) -> None:
+        """Records whether the robot stalls at this control step for lack of queued actions. A stall lasting
+        several steps counts as a single underrun."""
+        with self._lock:
+            if stalled and not self._in_underrun:
+                self._underrun_count += 1
+            self._in_underrun = stalled
+
+    @property
+    def underrun_count(self) -> int:
+        with self._lock:
+            return self._underrun_count
+
+    def latency_estimate(self) -> float | None:
+        with self._lock:
+            return self.latency_tracker.estimate()
+
+    def steps_needed(self) -> int | None:
+        """Number of queued actions needed to cover the expected round-trip latency"""
+        latency = self.latency_estimate()
+        if latency is None:
+            return None
+        return math.ceil(latency / self.environment_dt) + self.safety_margin_steps
+
+    def ready_to_send(self, queue_size: int, action_chunk_size: int) -> bool:
+        steps_needed = self.steps_needed()
+        if steps_needed is None:
+            return queue_size / action_chunk_size <= self.chunk_size_threshold
+
+        return queue_size <= steps_needed
+
+    def get_metrics(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "latency_ewma": self.latency_tracker.ewma,
+                "latency_high_percentile": self.latency_tracker.high_percentile(),
+                "underrun_count": self._underrun_count,
+            }
+
+
 @dataclass
 class RemotePolicyConfig:
     policy_type: str
@@ -269,6 +408,8 @@ class RemotePolicyConfig:
     actions_per_chunk: int
     device: str = "cpu"
     rename_map: dict[str, str] = field(default_factory=dict)
+    shared_memory_spec: SharedMemoryRingSpec | None = None
+    runtime: str = "eager"
 
 
 def _compare_observation_states(obs1_state: torch.Tensor, obs2_state: torch.Tensor, atol: float) -> bool:
@@ -20,7 +20,9 @@ python -m lerobot.async_inference.policy_server \
      --port=8080 \
      --fps=30 \
      --inference_latency=0.033 \
-     --obs_queue_timeout=1
+     --obs_queue_timeout=1 \
+     --transport=grpc \
+     --fast_load=true
 ```
 """
 
@@ -38,7 +40,9 @@ import draccus
 import grpc
 import torch
 
+from lerobot.configs.policies import PreTrainedConfig
 from lerobot.policies.factory import get_policy_class, make_pre_post_processors
+from lerobot.policies.runtime import apply_policy_runtime
 from lerobot.processor import (
     PolicyAction,
     PolicyProcessorPipeline,
@@ -47,6 +51,7 @@ from lerobot.transport import (
     services_pb2,  # type: ignore
     services_pb2_grpc,  # type: ignore
 )
+from lerobot.transport.shared_memory import SharedMemoryRingBuffer
 from lerobot.transport.utils import receive_bytes_in_chunks
 
 from .configs import PolicyServerConfig
@@ -60,6 +65,7 @@ from .helpers import (
     get_logger,
     observations_similar,
     raw_observation_to_observation,
+    read_raw_observation_from_shared_memory,
 )
 
 
@@ -81,6 +87,9 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
 
         self.last_processed_obs = None
 
+        # Shared-memory ring buffer the client writes observations to, when using the "shared_memory" transport
+        self.shm_ring: SharedMemoryRingBuffer | None = None
+
         # Attributes will be set by SendPolicyInstructions
         self.device = None
         self.policy_type = None
@@ -140,18 +149,30 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
             f"Policy type: {policy_specs.policy_type} | "
             f"Pretrained name or path: {policy_specs.pretrained_name_or_path} | "
             f"Actions per chunk: {policy_specs.actions_per_chunk} | "
-            f"Device: {policy_specs.device}"
+            f"Device: {policy_specs.device} | "
+            f"Runtime: {policy_specs.runtime}"
         )
 
         self.device = policy_specs.device
+        if policy_specs.runtime == "cpu_int8" and self.device != "cpu":
+            self.logger.warning(
+                f"Runtime 'cpu_int8' runs on CPU. Ignoring the requested device {self.device}."
+            )
+            self.device = "cpu"
         self.policy_type = policy_specs.policy_type  # act, pi0, etc.
         self.lerobot_features = policy_specs.lerobot_features
         self.actions_per_chunk = policy_specs.actions_per_chunk
 
+        self._attach_shared_memory(policy_specs)
+
         policy_class = get_policy_class(self.policy_type)
 
         start = time.perf_counter()
-        self.policy = policy_class.from_pretrained(policy_specs.pretrained_name_or_path)
+        # The policy is built for the requested device, to load its weights there directly
+        policy_config = PreTrainedConfig.from_pretrained(policy_specs.pretrained_name_or_path)
+        policy_config.device = self.device
+        policy_config.fast_load = self.config.fast_load
+        self.policy = policy_class.from_pretrained(policy_specs.pretrained_name_or_path, config=policy_config)
         self.policy.to(self.device)
 
         # Load preprocessor and postprocessor, overriding device to match requested device
@@ -165,6 +186,8 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
             },
             postprocessor_overrides={"device_processor": device_override},
         )
+        self.policy.config.runtime = policy_specs.runtime
+        self.policy = apply_policy_runtime(self.policy, self.preprocessor, self.postprocessor)
 
         end = time.perf_counter()
 
@@ -172,6 +195,41 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
 
         return services_pb2.Empty()
 
+    def _attach_shared_memory(self, policy_specs: RemotePolicyConfig) -> None:
+        """Attach to the client's shared-memory ring buffer, if the client uses the shared memory transport"""
+        if self.shm_ring is not None:
+            self.shm_ring.close()
+            self.shm_ring = None
+
+        if policy_specs.shared_memory_spec is None:
+            return
+
+        if self.config.transport != "shared_memory":
+            raise ValueError(
+                "Client requested the shared memory transport, but the server was started with "
+                f"transport={self.config.transport}"
+            )
+
+        self.shm_ring = SharedMemoryRingBuffer.attach(policy_specs.shared_memory_spec)
+        self.logger.info(f"Attached to shared memory block {policy_specs.shared_memory_spec.name}")
+
+    def _resolve_shared_memory_observation(self, timed_observation: TimedObservation) -> bool:
+        """Fills in the observation content from shared memory. Returns False if it is no longer available"""
+        if timed_observation.shared_memory_ref is None:
+            return True
+
+        if self.shm_ring is None:
+            raise RuntimeError("Received a shared memory observation, but no shared memory block is attached")
+
+        raw_observation = read_raw_observation_from_shared_memory(
+            self.shm_ring, timed_observation.shared_memory_ref
+        )
+        if raw_observation is None:
+            return False
+
+        timed_observation.observation = {**raw_observation, **timed_observation.get_observation()}
+        return True
+
     def SendObservations(self, request_iterator, context):  # noqa: N802
         """Receive observations from the robot client"""
         client_id = context.peer()
@@ -183,6 +241,11 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
             request_iterator, None, self.shutdown_event, self.logger
         )  # blocking call while looping over request_iterator
         timed_observation = pickle.loads(received_bytes)  # nosec
+        if not self._resolve_shared_memory_observation(timed_observation):
+            self.logger.warning(
+                f"Observation #{timed_observation.get_timestep()} overwritten in shared memory"
+            )
+            return services_pb2.Empty()
         deserialize_time = time.perf_counter() - start_deserialize
 
         self.logger.debug(f"Received observation #{timed_observation.get_timestep()}")
@@ -348,6 +411,12 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         )
         prepare_time = time.perf_counter() - start_prepare
 
+        # Images were read in place: make sure the client didn't overwrite them while they were being prepared
+        if observation_t.shared_memory_ref is not None and not self.shm_ring.is_valid(
+            observation_t.shared_memory_ref
+        ):
+            raise RuntimeError(f"Observation #{observation_t.get_timestep()} overwritten in shared memory")
+
         """2. Apply preprocessor"""
         start_preprocess = time.perf_counter()
         observation = self.preprocessor(observation)
@@ -402,11 +471,22 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
             f"Total time: {1000 * (postprocess_stops - start_prepare):.2f}ms"
         )
 
+        # Breakdown of the inference time, for the policies reporting it (e.g. SmolVLA)
+        inference_timings = getattr(getattr(self.policy, "model", None), "inference_timings", None)
+        if inference_timings:
+            stages = " | ".join(
+                f"{stage}: {1000 * duration:.2f}ms" for stage, duration in inference_timings.items()
+            )
+            self.logger.debug(f"Observation {observation_t.get_timestep()} | Inference stages: {stages}")
+
         return action_chunk
 
     def stop(self):
         """Stop the server"""
         self._reset_server()
+        if self.shm_ring is not None:
+            self.shm_ring.close()
+            self.shm_ring = None
         self.logger.info("Server stopping...")
 
 
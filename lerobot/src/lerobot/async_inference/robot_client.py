@@ -22,11 +22,14 @@ python src/lerobot/async_inference/robot_client.py \
     --robot.id=black \
     --task="dummy" \
     --server_address=127.0.0.1:8080 \
+    --transport=grpc \
     --policy_type=act \
     --pretrained_name_or_path=user/model \
     --policy_device=mps \
+    --policy_runtime=eager \
     --actions_per_chunk=50 \
     --chunk_size_threshold=0.5 \
+    --adaptive_chunk_scheduling=True \
     --aggregate_fn_name=weighted_average \
     --debug_visualize_queue_size=True
 ```
@@ -37,7 +40,7 @@ import pickle  # nosec
 import threading
 import time
 from collections.abc import Callable
-from dataclasses import asdict
+from dataclasses import asdict, replace
 from pprint import pformat
 from queue import Queue
 from typing import Any
@@ -61,12 +64,14 @@ from lerobot.transport import (
     services_pb2,  # type: ignore
     services_pb2_grpc,  # type: ignore
 )
+from lerobot.transport.shared_memory import SharedMemoryRingBuffer
 from lerobot.transport.utils import grpc_channel_options, send_bytes_in_chunks
 
 from .configs import RobotClientConfig
 from .constants import SUPPORTED_ROBOTS
 from .helpers import (
     Action,
+    AdaptiveChunkScheduler,
     FPSTracker,
     Observation,
     RawObservation,
@@ -75,6 +80,7 @@ from .helpers import (
     TimedObservation,
     get_logger,
     map_robot_keys_to_lerobot_features,
+    robot_observation_fields,
     visualize_action_queue_size,
 )
 
@@ -99,12 +105,22 @@ class RobotClient:
         # Use environment variable if server_address is not provided in config
         self.server_address = config.server_address
 
+        # Observations are written once in shared memory, the server reads them in place
+        self.shm_ring = None
+        if config.transport == "shared_memory":
+            self.shm_ring = SharedMemoryRingBuffer.create(
+                robot_observation_fields(self.robot), num_slots=config.shared_memory_slots
+            )
+            self.logger.info(f"Observations shared through shared memory block {self.shm_ring.spec.name}")
+
         self.policy_config = RemotePolicyConfig(
             config.policy_type,
             config.pretrained_name_or_path,
             lerobot_features,
             config.actions_per_chunk,
             config.policy_device,
+            shared_memory_spec=self.shm_ring.spec if self.shm_ring is not None else None,
+            runtime=config.policy_runtime,
         )
         self.channel = grpc.insecure_channel(
             self.server_address, grpc_channel_options(initial_backoff=f"{config.environment_dt:.4f}s")
@@ -121,6 +137,15 @@ class RobotClient:
 
         self._chunk_size_threshold = config.chunk_size_threshold
 
+        # Round-trip latency estimation, used to schedule observations when adaptive scheduling is enabled
+        self.chunk_scheduler = AdaptiveChunkScheduler(
+            environment_dt=config.environment_dt,
+            chunk_size_threshold=config.chunk_size_threshold,
+            ewma_alpha=config.latency_ewma_alpha,
+            percentile=config.latency_percentile,
+            safety_margin_steps=config.latency_safety_margin_steps,
+        )
+
         self.action_queue = Queue()
         self.action_queue_lock = threading.Lock()  # Protect queue operations
         self.action_queue_size = []
@@ -179,6 +204,19 @@ class RobotClient:
         self.channel.close()
         self.logger.debug("Client stopped, channel closed")
 
+        if self.shm_ring is not None:
+            self.shm_ring.close()
+            self.logger.debug("Shared memory released")
+
+    def _write_observation_to_shared_memory(self, obs: TimedObservation) -> TimedObservation:
+        """Writes the observation content in the shared-memory ring buffer. Returns a lightweight observation
+        referencing it, which only carries the non-array entries (e.g. the task)"""
+        raw_observation = obs.get_observation()
+        ref = self.shm_ring.write(raw_observation)
+        remaining = {k: v for k, v in raw_observation.items() if k not in self.shm_ring.spec.fields}
+
+        return replace(obs, observation=remaining, shared_memory_ref=ref)
+
     def send_observation(
         self,
         obs: TimedObservation,
@@ -192,6 +230,8 @@ class RobotClient:
             raise ValueError("Input observation needs to be a TimedObservation!")
 
         start_time = time.perf_counter()
+        if self.shm_ring is not None:
+            obs = self._write_observation_to_shared_memory(obs)
         observation_bytes = pickle.dumps(obs)
         serialize_time = time.perf_counter() - start_time
         self.logger.debug(f"Observation serialization time: {serialize_time:.6f}s")
@@ -287,6 +327,11 @@ class RobotClient:
 
                 self.action_chunk_size = max(self.action_chunk_size, len(timed_actions))
 
+                # Actions are timestamped with the client time of the observation they were predicted from,
+                # so this measures the full round-trip (network, server queueing and inference)
+                if len(timed_actions) > 0:
+                    self.chunk_scheduler.record_latency(receive_time - timed_actions[0].get_timestamp())
+
                 # Calculate network latency if we have matching observations
                 if len(timed_actions) > 0 and verbose:
                     with self.latest_action_lock:
@@ -387,7 +432,12 @@ class RobotClient:
     def _ready_to_send_observation(self):
         """Flags when the client is ready to send an observation"""
         with self.action_queue_lock:
-            return self.action_queue.qsize() / self.action_chunk_size <= self._chunk_size_threshold
+            queue_size = self.action_queue.qsize()
+
+        if self.config.adaptive_chunk_scheduling:
+            return self.chunk_scheduler.ready_to_send(queue_size, self.action_chunk_size)
+
+        return queue_size / self.action_chunk_size <= self._chunk_size_threshold
 
     def control_loop_observation(self, task: str, verbose: bool = False) -> RawObservation:
         try:
@@ -423,11 +473,15 @@ class RobotClient:
             if verbose:
                 # Calculate comprehensive FPS metrics
                 fps_metrics = self.fps_tracker.calculate_fps_metrics(observation.get_timestamp())
+                latency_estimate = self.chunk_scheduler.latency_estimate()
+                latency_str = f"{latency_estimate * 1000:.2f}ms" if latency_estimate is not None else "N/A"
 
                 self.logger.info(
                     f"Obs #{observation.get_timestep()} | "
                     f"Avg FPS: {fps_metrics['avg_fps']:.2f} | "
-                    f"Target: {fps_metrics['target_fps']:.2f}"
+                    f"Target: {fps_metrics['target_fps']:.2f} | "
+                    f"Round-trip estimate: {latency_str} | "
+                    f"Queue underruns: {self.chunk_scheduler.underrun_count}"
                 )
 
                 self.logger.debug(
@@ -451,8 +505,11 @@ class RobotClient:
         while self.running:
             control_loop_start = time.perf_counter()
             """Control loop: (1) Performing actions, when available"""
-            if self.actions_available():
+            actions_available = self.actions_available()
+            if actions_available:
                 _performed_action = self.control_loop_action(verbose)
+            # The robot stalls when the queue drained before the next chunk arrived
+            self.chunk_scheduler.update_underrun(stalled=not actions_available and self.action_chunk_size > 0)
 
             """Control loop: (2) Streaming observations to the remote policy server"""
             if self._ready_to_send_observation():
@@ -492,6 +549,7 @@ def async_client(cfg: RobotClientConfig):
             action_receiver_thread.join()
             if cfg.debug_visualize_queue_size:
                 visualize_action_queue_size(client.action_queue_size)
+            client.logger.info(f"Scheduling metrics: {client.chunk_scheduler.get_metrics()}")
             client.logger.info("Client stopped")
 
 
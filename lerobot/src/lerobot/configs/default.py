@@ -35,6 +35,9 @@ class DatasetConfig:
     use_imagenet_stats: bool = True
     video_backend: str = field(default_factory=get_safe_default_codec)
     streaming: bool = False
+    # Directory of the frozen vision features of the dataset, written by `lerobot-extract-vision-features`.
+    # The cached cameras are read from it instead of being decoded, and are not encoded by the policy.
+    vision_feature_cache: str | None = None
 
 
 @dataclass
@@ -49,6 +52,36 @@ class WandBConfig:
     mode: str | None = None  # Allowed values: 'online', 'offline' 'disabled'. Defaults to 'online'
 
 
+@dataclass
+class PrioritizedReplayConfig:
+    """Prioritized experience replay (Schaul et al., 2016) for the RL replay buffers"""
+
+    enable: bool = False
+    # How much the priorities are used: 0 is uniform sampling, 1 is sampling proportionally to the TD-errors
+    alpha: float = 0.6
+    # Initial exponent of the importance-sampling weights, linearly annealed to 1 over `beta_annealing_steps`
+    # optimization steps
+    beta: float = 0.4
+    beta_annealing_steps: int = 100_000
+    # Added to the absolute TD-errors so that every transition keeps a chance to be sampled
+    eps: float = 1e-6
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.alpha <= 1:
+            raise ValueError(f"alpha must be in [0, 1], got {self.alpha}")
+        if not 0 <= self.beta <= 1:
+            raise ValueError(f"beta must be in [0, 1], got {self.beta}")
+        if self.beta_annealing_steps < 0:
+            raise ValueError(f"beta_annealing_steps must be non-negative, got {self.beta_annealing_steps}")
+        if self.eps <= 0:
+            raise ValueError(f"eps must be positive, got {self.eps}")
+
+    def beta_at(self, step: int) -> float:
+        if self.beta_annealing_steps == 0:
+            return 1.0
+        return self.beta + (1.0 - self.beta) * min(1.0, step / self.beta_annealing_steps)
+
+
 @dataclass
 class EvalConfig:
     n_episodes: int = 50
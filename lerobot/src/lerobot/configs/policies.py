@@ -36,6 +36,8 @@ from lerobot.utils.utils import auto_select_torch_device, is_amp_available, is_t
 T = TypeVar("T", bound="PreTrainedConfig")
 logger = getLogger(__name__)
 
+POLICY_RUNTIMES = ("eager", "cpu_int8")
+
 
 @dataclass
 class PreTrainedConfig(draccus.ChoiceRegistry, HubMixin, abc.ABC):  # type: ignore[misc,name-defined] #TODO: draccus issue
@@ -62,6 +64,14 @@ class PreTrainedConfig(draccus.ChoiceRegistry, HubMixin, abc.ABC):  # type: igno
     # `use_amp` determines whether to use Automatic Mixed Precision (AMP) for training and evaluation. With AMP,
     # automatic gradient scaling is used.
     use_amp: bool = False
+    # Runtime used for inference. "eager" runs the float policy as is. "cpu_int8" runs it on CPU, with its
+    # linear layers dynamically quantized to int8 and the normalization steps folded into them where the policy
+    # allows it (see `lerobot.policies.runtime`).
+    runtime: str = "eager"
+    # Load pretrained weights with the fast path of `PreTrainedPolicy.from_pretrained`: the policy is built
+    # directly on `device` without initializing its weights, and the memory-mapped checkpoint is streamed
+    # into it one tensor at a time.
+    fast_load: bool = False
 
     push_to_hub: bool = True  # type: ignore[assignment] # TODO: use a different name to avoid override
     repo_id: str | None = None
@@ -89,6 +99,12 @@ class PreTrainedConfig(draccus.ChoiceRegistry, HubMixin, abc.ABC):  # type: igno
             )
             self.use_amp = False
 
+        if self.runtime not in POLICY_RUNTIMES:
+            raise ValueError(f"runtime must be one of {POLICY_RUNTIMES}, got {self.runtime}")
+        if self.runtime == "cpu_int8" and self.device != "cpu":
+            logger.warning(f"Runtime 'cpu_int8' runs on CPU. Switching from device '{self.device}' to 'cpu'.")
+            self.device = "cpu"
+
     @property
     def type(self) -> str:
         choice_name = self.get_choice_name(self.__class__)
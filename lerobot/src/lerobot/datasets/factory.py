@@ -20,6 +20,7 @@ import torch
 
 from lerobot.configs.policies import PreTrainedConfig
 from lerobot.configs.train import TrainPipelineConfig
+from lerobot.datasets.feature_cache import VisionFeatureCache
 from lerobot.datasets.lerobot_dataset import (
     LeRobotDataset,
     LeRobotDatasetMetadata,
@@ -68,6 +69,27 @@ def resolve_delta_timestamps(
     return delta_timestamps
 
 
+def make_vision_feature_cache(
+    cfg: TrainPipelineConfig, ds_meta: LeRobotDatasetMetadata
+) -> VisionFeatureCache | None:
+    """Opens the vision feature cache of the dataset, if any, after checking that it can be used to train the
+    policy on the selected episodes."""
+    if cfg.dataset.vision_feature_cache is None:
+        return None
+    if not hasattr(cfg.policy, "vision_features_signature"):
+        raise ValueError(f"The policy '{cfg.policy.type}' can't be trained on precomputed vision features.")
+
+    cache = VisionFeatureCache(cfg.dataset.vision_feature_cache)
+    cache.check_compatibility(cfg.policy.vision_features_signature(), ds_meta, cfg.dataset.episodes)
+    if cfg.dataset.image_transforms.enable:
+        logging.warning(
+            "The image transforms are not applied to the cameras with precomputed features: "
+            f"{cache.camera_keys}"
+        )
+    logging.info(f"Reading the vision features of {cache.camera_keys} from {cache.root}")
+    return cache
+
+
 def make_dataset(cfg: TrainPipelineConfig) -> LeRobotDataset | MultiLeRobotDataset:
     """Handles the logic of setting up delta timestamps and image transforms before creating a dataset.
 
@@ -98,8 +120,11 @@ def make_dataset(cfg: TrainPipelineConfig) -> LeRobotDataset | MultiLeRobotDatas
                 image_transforms=image_transforms,
                 revision=cfg.dataset.revision,
                 video_backend=cfg.dataset.video_backend,
+                vision_feature_cache=make_vision_feature_cache(cfg, ds_meta),
             )
         else:
+            if cfg.dataset.vision_feature_cache is not None:
+                raise NotImplementedError("Vision feature caches aren't supported for streaming datasets.")
             dataset = StreamingLeRobotDataset(
                 cfg.dataset.repo_id,
                 root=cfg.dataset.root,
@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A cache of the frozen vision features of the frames of a dataset, to fine-tune a policy whose vision
+encoder is frozen without decoding and encoding the camera frames at every training step.
+
+The features are extracted once with `lerobot-extract-vision-features` and stored in numpy memmaps, one per
+camera, indexed by the global frame index of the dataset (its "index" column), which identifies an (episode,
+frame) pair. A `LeRobotDataset` given the cache returns the features of the cached cameras under
+`vision_features_key(camera_key)` instead of their decoded frames.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from lerobot.datasets.lerobot_dataset import LeRobotDatasetMetadata
+from lerobot.datasets.online_buffer import make_memmap_safe
+from lerobot.utils.constants import OBS_IMAGES, OBS_VISION_FEATURES
+
+INFO_PATH = "info.json"
+WRITTEN_KEY = "_written"
+
+
+def vision_features_key(camera_key: str) -> str:
+    """Batch key of the vision features of a camera, e.g. "observation.vision_features.top" for the camera
+    "observation.images.top".
+
+    The features are not under the "observation.images" prefix, as the processors handle the keys with this
+    prefix as images.
+    """
+    return f"{OBS_VISION_FEATURES}.{camera_key.removeprefix(f'{OBS_IMAGES}.')}"
+
+
+def weights_hash(modules: list[torch.nn.Module]) -> str:
+    """Hash of the parameters and buffers of `modules`, to identify the weights the features were extracted
+    with, whatever the path they were loaded from."""
+    hasher = hashlib.sha256()
+    for module in modules:
+        for name, tensor in module.state_dict().items():
+            hasher.update(name.encode())
+            # Viewed as bytes, as numpy doesn't support all the torch dtypes (e.g. bfloat16)
+            hasher.update(tensor.detach().cpu().contiguous().reshape(-1).view(torch.uint8).numpy().tobytes())
+    return hasher.hexdigest()
+
+
+def _to_json(value):
+    # Tuples become lists, for the settings of a policy config to compare equal to the ones loaded from json
+    return json.loads(json.dumps(value))
+
+
+class VisionFeatureCache:
+    """Vision features of the frames of a dataset, for each cached camera.
+
+    The memmaps are opened on first access rather than at init, so that each DataLoader worker opens its own
+    instead of receiving a copy of their data.
+
+    Args:
+        root: The directory of the cache.
+        mode: "r" to read the features, "r+" to write them.
+    """
+
+    def __init__(self, root: str | Path, mode: str = "r"):
+        self.root = Path(root)
+        self.mode = mode
+        self.info = json.loads((self.root / INFO_PATH).read_text())
+        self._data: dict[str, np.memmap] | None = None
+
+    @classmethod
+    def create(
+        cls,
+        root: str | Path,
+        camera_keys: list[str],
+        num_frames: int,
+        shape: tuple[int, ...],
+        dtype: str,
+        signature: dict,
+        vision_weights_hash: str,
+        pretrained_path: str | None = None,
+        overwrite: bool = False,
+    ) -> "VisionFeatureCache":
+        """Creates an empty cache for the `num_frames` frames of a dataset, with features of `shape`.
+
+        `signature` holds the policy settings the features depend on and `vision_weights_hash` the hash of the
+        frozen weights computing them (see `weights_hash`): training with the cache requires a policy with the
+        same ones (see `check_compatibility` and `check_weights`). `pretrained_path` is only informative.
+
+        A cache already at `root` is reopened to complete it, keeping the frames written so far, after checking
+        that it was created with the same settings. With `overwrite`, it is replaced by an empty one instead.
+        """
+        root = Path(root)
+        if (root / INFO_PATH).exists() and not overwrite:
+            cache = cls(root, mode="r+")
+            expected = {
+                "camera_keys": camera_keys,
+                "num_frames": num_frames,
+                "shape": list(shape),
+                "dtype": dtype,
+                "signature": _to_json(signature),
+                "vision_weights_hash": vision_weights_hash,
+            }
+            mismatches = [key for key, value in expected.items() if cache.info[key] != value]
+            if mismatches:
+                raise ValueError(
+                    f"The vision feature cache at {root} was created with other {mismatches} than the ones "
+                    "requested, remove it or overwrite it."
+                )
+            return cache
+
+        root.mkdir(parents=True, exist_ok=True)
+        info = {
+            "camera_keys": camera_keys,
+            "num_frames": num_frames,
+            "shape": list(shape),
+            "dtype": dtype,
+            "signature": _to_json(signature),
+            "vision_weights_hash": vision_weights_hash,
+            "pretrained_path": pretrained_path,
+        }
+        for key in camera_keys:
+            make_memmap_safe(
+                filename=root / key, dtype=np.dtype(dtype), mode="w+", shape=(num_frames, *shape)
+            ).flush()
+        # Frames whose features have been written, an interrupted extraction leaves the others unset
+        make_memmap_safe(
+            filename=root / WRITTEN_KEY, dtype=np.dtype(bool), mode="w+", shape=(num_frames,)
+        ).flush()
+        (root / INFO_PATH).write_text(json.dumps(info, indent=4))
+        return cls(root, mode="r+")
+
+    @property
+    def camera_keys(self) -> list[str]:
+        return self.info["camera_keys"]
+
+    @property
+    def data(self) -> dict[str, np.memmap]:
+        if self._data is None:
+            num_frames = self.info["num_frames"]
+            self._data = {
+                key: np.memmap(
+                    self.root / key,
+                    dtype=np.dtype(self.info["dtype"]),
+                    mode=self.mode,
+                    shape=(num_frames, *self.info["shape"]),
+                )
+                for key in self.camera_keys
+            }
+            self._data[WRITTEN_KEY] = np.memmap(
+                self.root / WRITTEN_KEY, dtype=np.dtype(bool), mode=self.mode, shape=(num_frames,)
+            )
+        return self._data
+
+    def __getstate__(self) -> dict:
+        # The memmaps are reopened by the process which unpickles the cache (e.g. a DataLoader worker)
+        return {**self.__dict__, "_data": None}
+
+    def __getitem__(self, index: int) -> dict[str, torch.Tensor]:
+        """The features of the cameras for the frame of global `index`, keyed by `vision_features_key`."""
+        return {
+            vision_features_key(key): torch.from_numpy(np.array(self.data[key][index]))
+            for key in self.camera_keys
+        }
+
+    def is_written(self, indices: np.ndarray) -> bool:
+        """Whether the features of all the frames of global `indices` have been written."""
+        return bool(self.data[WRITTEN_KEY][indices].all())
+
+    def write(self, indices: np.ndarray, features: dict[str, np.ndarray]) -> None:
+        """Writes the features of all the cameras for the frames of global `indices`."""
+        for key in self.camera_keys:
+            self.data[key][indices] = features[key].astype(self.info["dtype"])
+        self.data[WRITTEN_KEY][indices] = True
+
+    def flush(self) -> None:
+        for memmap in self.data.values():
+            memmap.flush()
+
+    def check_compatibility(
+        self, policy_signature: dict, meta: LeRobotDatasetMetadata, episodes: list[int] | None = None
+    ) -> None:
+        """Raises a ValueError if the cache can't be used to train a policy with `policy_signature` on the
+        `episodes` (all of them by default) of the dataset of `meta`."""
+        if self.info["num_frames"] != meta.total_frames:
+            raise ValueError(
+                f"The vision feature cache at {self.root} holds {self.info['num_frames']} frames, while the "
+                f"dataset has {meta.total_frames}."
+            )
+        if _to_json(policy_signature) != self.info["signature"]:
+            raise ValueError(
+                f"The vision features at {self.root} were extracted with the policy settings "
+                f"{self.info['signature']}, which differ from the ones of the trained policy: "
+                f"{_to_json(policy_signature)}."
+            )
+        episodes = range(meta.total_episodes) if episodes is None else episodes
+        written = self.data[WRITTEN_KEY]
+        missing_episodes = [
+            ep_idx
+            for ep_idx in episodes
+            if not written[
+                meta.episodes[ep_idx]["dataset_from_index"] : meta.episodes[ep_idx]["dataset_to_index"]
+            ].all()
+        ]
+        if missing_episodes:
+            raise ValueError(
+                f"The vision feature cache at {self.root} misses frames of the episodes {missing_episodes}, "
+                "run `lerobot-extract-vision-features` on them."
+            )
+
+    def check_weights(self, vision_weights_hash: str) -> None:
+        """Raises a ValueError if the features were extracted with other frozen weights than the ones of hash
+        `vision_weights_hash`, e.g. from another pretrained policy."""
+        if vision_weights_hash != self.info["vision_weights_hash"]:
+            raise ValueError(
+                f"The vision features at {self.root} were extracted with other vision weights than the ones of "
+                f"the trained policy (extracted from {self.info['pretrained_path']}), extract them again with "
+                "`lerobot-extract-vision-features`."
+            )
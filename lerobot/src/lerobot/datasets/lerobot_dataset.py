@@ -19,6 +19,7 @@ import shutil
 import tempfile
 from collections.abc import Callable
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import datasets
 import numpy as np
@@ -76,6 +77,9 @@ from lerobot.datasets.video_utils import (
 )
 from lerobot.utils.constants import HF_LEROBOT_HOME
 
+if TYPE_CHECKING:
+    from lerobot.datasets.feature_cache import VisionFeatureCache
+
 CODEBASE_VERSION = "v3.0"
 
 
@@ -555,6 +559,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
         download_videos: bool = True,
         video_backend: str | None = None,
         batch_encoding_size: int = 1,
+        vision_feature_cache: "VisionFeatureCache | None" = None,
     ):
         """
         2 modes are available for instantiating this class, depending on 2 different use cases:
@@ -667,6 +672,9 @@ class LeRobotDataset(torch.utils.data.Dataset):
                 You can also use the 'pyav' decoder used by Torchvision, which used to be the default option, or 'video_reader' which is another decoder of Torchvision.
             batch_encoding_size (int, optional): Number of episodes to accumulate before batch encoding videos.
                 Set to 1 for immediate encoding (default), or higher for batched encoding. Defaults to 1.
+            vision_feature_cache (VisionFeatureCache | None, optional): Precomputed vision features of the
+                frames (see `lerobot.datasets.feature_cache`). The items hold the features of the cached
+                cameras instead of their frames, which are not decoded. Defaults to None.
         """
         super().__init__()
         self.repo_id = repo_id
@@ -680,6 +688,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
         self.delta_indices = None
         self.batch_encoding_size = batch_encoding_size
         self.episodes_since_last_encoding = 0
+        self.vision_feature_cache = vision_feature_cache
 
         # Unused attributes
         self.image_writer = None
@@ -996,14 +1005,23 @@ class LeRobotDataset(torch.utils.data.Dataset):
             for key, val in query_result.items():
                 item[key] = val
 
-        if len(self.meta.video_keys) > 0:
+        cached_keys = self.vision_feature_cache.camera_keys if self.vision_feature_cache is not None else []
+        # The frames of the cameras with cached vision features are not decoded
+        video_keys = [key for key in self.meta.video_keys if key not in cached_keys]
+        if len(video_keys) > 0:
             current_ts = item["timestamp"].item()
             query_timestamps = self._get_query_timestamps(current_ts, query_indices)
+            query_timestamps = {key: query_timestamps[key] for key in video_keys}
             video_frames = self._query_videos(query_timestamps, ep_idx)
             item = {**video_frames, **item}
 
+        if self.vision_feature_cache is not None:
+            for key in cached_keys:
+                item.pop(key, None)
+            item = {**self.vision_feature_cache[item["index"].item()], **item}
+
         if self.image_transforms is not None:
-            image_keys = self.meta.camera_keys
+            image_keys = [key for key in self.meta.camera_keys if key not in cached_keys]
             for cam in image_keys:
                 item[cam] = self.image_transforms(item[cam])
 
@@ -1485,6 +1503,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
         obj.image_transforms = None
         obj.delta_timestamps = None
         obj.delta_indices = None
+        obj.vision_feature_cache = None
         obj.video_backend = video_backend if video_backend is not None else get_safe_default_codec()
         obj.writer = None
         obj.latest_episode = None
@@ -31,7 +31,7 @@ import torch
 from lerobot.datasets.lerobot_dataset import LeRobotDataset
 
 
-def _make_memmap_safe(**kwargs) -> np.memmap:
+def make_memmap_safe(**kwargs) -> np.memmap:
     """Make a numpy memmap with checks on available disk space first.
 
     Expected kwargs are: "filename", "dtype" (must by np.dtype), "mode" and "shape"
@@ -109,7 +109,7 @@ class OnlineBuffer(torch.utils.data.Dataset):
         Path(write_dir).mkdir(parents=True, exist_ok=True)
         self._data = {}
         for k, v in data_spec.items():
-            self._data[k] = _make_memmap_safe(
+            self._data[k] = make_memmap_safe(
                 filename=Path(write_dir) / k,
                 dtype=v["dtype"] if v is not None else None,
                 mode="r+" if (Path(write_dir) / k).exists() else "w+",
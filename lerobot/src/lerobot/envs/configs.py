@@ -156,6 +156,10 @@ class RewardClassifierConfig:
     pretrained_path: str | None = None
     success_threshold: float = 0.5
     success_reward: float = 1.0
+    # Run the classifier on a worker thread, off the control loop, classifying up to `history_size` of the last
+    # frames in one batch. Rewards are then reported with the classifier latency.
+    async_inference: bool = False
+    history_size: int = 1
 
 
 @dataclass
@@ -219,6 +223,9 @@ class HILSerlRobotEnvConfig(EnvConfig):
     processor: HILSerlProcessorConfig = field(default_factory=HILSerlProcessorConfig)
 
     name: str = "real_robot"
+    # Number of copies of the environment stepped in parallel by the actor, each in its own process. Only
+    # supported in simulation (gym_hil), without human interventions.
+    num_envs: int = 1
 
     @property
     def gym_kwargs(self) -> dict:
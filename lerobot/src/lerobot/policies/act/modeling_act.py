@@ -203,52 +203,60 @@ class ACTTemporalEnsembler:
             avg /= exp_weights[: i + 1].sum()
         print("online", avg)
         ```
+
+        The running averages are kept in a preallocated (batch, chunk_size, action_dim) ring buffer, where the
+        average for the time step t is in the slot t % chunk_size. The slot of the consumed action is reused
+        for the last action of the next chunk, so an update is an in-place interpolation of the buffer towards
+        the new actions, without allocation. As wᵢ / Σⱼ₌₀ⁱwⱼ only depends on the number of actions already in
+        the average, which is itself set by the offset of the action in the chunk and by the number of updates
+        since the reset, these interpolation weights are precomputed in a (chunk_size, chunk_size) table.
         """
         self.chunk_size = chunk_size
-        self.ensemble_weights = torch.exp(-temporal_ensemble_coeff * torch.arange(chunk_size))
-        self.ensemble_weights_cumsum = torch.cumsum(self.ensemble_weights, dim=0)
+        ensemble_weights = torch.exp(-temporal_ensemble_coeff * torch.arange(chunk_size))
+        ensemble_weights_cumsum = torch.cumsum(ensemble_weights, dim=0)
+        # The action at offset i of the chunk predicted at the n-th update (from 0) is averaged with
+        # min(n, chunk_size - 1 - i) previous predictions, every update after the first chunk_size - 1 ones
+        # uses the last row.
+        offsets = torch.arange(chunk_size)
+        num_previous = torch.minimum(offsets[:, None], chunk_size - 1 - offsets[None, :])
+        # (chunk_size, chunk_size, 1) weights of the new actions, broadcast over the action dimension.
+        update_weights = ensemble_weights[num_previous] / ensemble_weights_cumsum[num_previous]
+        self.update_weights = update_weights.unsqueeze(-1)
+        self.ensembled_actions = None
         self.reset()
 
     def reset(self):
         """Resets the online computation variables."""
-        self.ensembled_actions = None
-        # (chunk_size,) count of how many actions are in the ensemble for each time step in the sequence.
-        self.ensembled_actions_count = None
+        # The buffer is kept: all its slots are overwritten by the first update after a reset.
+        self.num_updates = 0
+        self.head = 0
 
     def update(self, actions: Tensor) -> Tensor:
         """
         Takes a (batch, chunk_size, action_dim) sequence of actions, update the temporal ensemble for all
         time steps, and pop/return the next batch of actions in the sequence.
         """
-        self.ensemble_weights = self.ensemble_weights.to(device=actions.device)
-        self.ensemble_weights_cumsum = self.ensemble_weights_cumsum.to(device=actions.device)
-        if self.ensembled_actions is None:
-            # Initializes `self._ensembled_action` to the sequence of actions predicted during the first
-            # time step of the episode.
-            self.ensembled_actions = actions.clone()
-            # Note: The last dimension is unsqueeze to make sure we can broadcast properly for tensor
-            # operations later.
-            self.ensembled_actions_count = torch.ones(
-                (self.chunk_size, 1), dtype=torch.long, device=self.ensembled_actions.device
-            )
-        else:
-            # self.ensembled_actions will have shape (batch_size, chunk_size - 1, action_dim). Compute
-            # the online update for those entries.
-            self.ensembled_actions *= self.ensemble_weights_cumsum[self.ensembled_actions_count - 1]
-            self.ensembled_actions += actions[:, :-1] * self.ensemble_weights[self.ensembled_actions_count]
-            self.ensembled_actions /= self.ensemble_weights_cumsum[self.ensembled_actions_count]
-            self.ensembled_actions_count = torch.clamp(self.ensembled_actions_count + 1, max=self.chunk_size)
-            # The last action, which has no prior online average, needs to get concatenated onto the end.
-            self.ensembled_actions = torch.cat([self.ensembled_actions, actions[:, -1:]], dim=1)
-            self.ensembled_actions_count = torch.cat(
-                [self.ensembled_actions_count, torch.ones_like(self.ensembled_actions_count[-1:])]
-            )
-        # "Consume" the first action.
-        action, self.ensembled_actions, self.ensembled_actions_count = (
-            self.ensembled_actions[:, 0],
-            self.ensembled_actions[:, 1:],
-            self.ensembled_actions_count[1:],
-        )
+        if (
+            self.ensembled_actions is None
+            or self.ensembled_actions.shape != actions.shape
+            or self.ensembled_actions.device != actions.device
+            or self.ensembled_actions.dtype != actions.dtype
+        ):
+            # Zeros rather than uninitialized memory, which may hold NaNs that the interpolation would keep.
+            self.ensembled_actions = torch.zeros_like(actions)
+            self.update_weights = self.update_weights.to(device=actions.device, dtype=actions.dtype)
+
+        weights = self.update_weights[min(self.num_updates, self.chunk_size - 1)]
+        # The actions for the time steps t..t+chunk_size-1 are in the slots head..chunk_size-1 then 0..head-1.
+        num_tail = self.chunk_size - self.head
+        self.ensembled_actions[:, self.head :].lerp_(actions[:, :num_tail], weights[:num_tail])
+        if self.head > 0:
+            self.ensembled_actions[:, : self.head].lerp_(actions[:, num_tail:], weights[num_tail:])
+
+        # "Consume" the first action, its slot gets the last action of the next chunk.
+        action = self.ensembled_actions[:, self.head].clone()
+        self.head = (self.head + 1) % self.chunk_size
+        self.num_updates += 1
         return action
 
 
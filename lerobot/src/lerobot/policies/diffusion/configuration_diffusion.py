@@ -98,6 +98,14 @@ class DiffusionConfig(PreTrainedConfig):
         clip_sample_range: The magnitude of the clipping range as described above.
         num_inference_steps: Number of reverse diffusion steps to use at inference time (steps are evenly
             spaced). If not provided, this defaults to be the same as `num_train_timesteps`.
+        warm_start: Whether to start the sampling of each chunk of actions from the previous chunk, shifted by
+            the `n_action_steps` executed since, instead of pure noise. The previous chunk is noised to an
+            intermediate step of the schedule, and only the denoising steps from there are run. Only applies
+            to `select_action`, which predicts a chunk every `n_action_steps`.
+        warm_start_strength: Fraction, in (0, 1], of the `num_inference_steps` denoising steps run when warm
+            starting. Lower values run fewer steps and stay closer to the previous chunk.
+        cache_image_features: Whether to reuse, at inference time, the image features of the observation
+            frames already encoded for a previous chunk, instead of encoding the `n_obs_steps` frames again.
         do_mask_loss_for_padding: Whether to mask the loss when there are copy-padded actions. See
             `LeRobotDataset` and `load_previous_and_future_frames` for more information. Note, this defaults
             to False as the original Diffusion Policy implementation does the same.
@@ -147,6 +155,9 @@ class DiffusionConfig(PreTrainedConfig):
 
     # Inference
     num_inference_steps: int | None = None
+    warm_start: bool = False
+    warm_start_strength: float = 0.3
+    cache_image_features: bool = True
 
     # Loss computation
     do_mask_loss_for_padding: bool = False
@@ -180,6 +191,9 @@ class DiffusionConfig(PreTrainedConfig):
                 f"Got {self.noise_scheduler_type}."
             )
 
+        if not 0 < self.warm_start_strength <= 1:
+            raise ValueError(f"`warm_start_strength` must be in (0, 1]. Got {self.warm_start_strength}.")
+
         # Check that the horizon size and U-Net downsampling is compatible.
         # U-Net downsamples by 2 with each stage.
         downsampling_factor = 2 ** len(self.down_dims)
@@ -88,16 +88,66 @@ class DiffusionPolicy(PreTrainedPolicy):
             self._queues[OBS_IMAGES] = deque(maxlen=self.config.n_obs_steps)
         if self.config.env_state_feature:
             self._queues[OBS_ENV_STATE] = deque(maxlen=self.config.n_obs_steps)
+        # Full horizon (normalized) sample of the last chunk, to warm start the next one
+        self._prev_sample: Tensor | None = None
+        # Image features of the frames in the observation queue, keyed by the id of the frame tensor
+        self._img_features_cache: dict[int, tuple[Tensor, Tensor]] = {}
 
     @torch.no_grad()
-    def predict_action_chunk(self, batch: dict[str, Tensor], noise: Tensor | None = None) -> Tensor:
-        """Predict a chunk of actions given environment observations."""
+    def predict_action_chunk(
+        self, batch: dict[str, Tensor], noise: Tensor | None = None, warm_start: bool = False
+    ) -> Tensor:
+        """Predict a chunk of actions given environment observations.
+
+        With `warm_start`, the sampling starts from the previous chunk predicted by this method, assuming
+        `n_action_steps` steps were executed since (see `DiffusionConfig.warm_start`).
+        """
+        img_features = None
+        if self.config.image_features and self.config.cache_image_features and not self.training:
+            img_features = self._encode_queued_images()
+
         # stack n latest observations from the queue
         batch = {k: torch.stack(list(self._queues[k]), dim=1) for k in batch if k in self._queues}
-        actions = self.diffusion.generate_actions(batch, noise=noise)
+        init_sample = self._shifted_prev_sample(batch[OBS_STATE].shape[0]) if warm_start else None
+        actions, self._prev_sample = self.diffusion.generate_actions(
+            batch, noise=noise, init_sample=init_sample, img_features=img_features, return_sample=True
+        )
 
         return actions
 
+    def _shifted_prev_sample(self, batch_size: int) -> Tensor | None:
+        """The previous sample shifted by `n_action_steps`, the last action being repeated at the end."""
+        if self._prev_sample is None or self._prev_sample.shape[0] != batch_size:
+            return None
+        n_action_steps = self.config.n_action_steps
+        return torch.cat(
+            [self._prev_sample[:, n_action_steps:], self._prev_sample[:, -1:].expand(-1, n_action_steps, -1)],
+            dim=1,
+        )
+
+    def _encode_queued_images(self) -> Tensor:
+        """Image features of the frames in the observation queue, encoding only the frames not seen before.
+
+        The queue holds the frame tensors stacked in `select_action`: a frame keeps the same tensor while it
+        moves through the queue, and the first frame of an episode is repeated to fill it.
+
+        Returns:
+            (B, n_obs_steps, num_cameras * feature_dim) tensor of image features.
+        """
+        frames = list(self._queues[OBS_IMAGES])
+        cache = self._img_features_cache
+        new_frames = {
+            id(frame): frame for frame in frames if id(frame) not in cache or cache[id(frame)][0] is not frame
+        }
+        if new_frames:
+            new_features = self.diffusion.encode_images(torch.stack(list(new_frames.values()), dim=1))
+            for i, (key, frame) in enumerate(new_frames.items()):
+                cache[key] = (frame, new_features[:, i])
+
+        # Only keep the frames still in the queue
+        self._img_features_cache = {id(frame): cache[id(frame)] for frame in frames}
+        return torch.stack([cache[id(frame)][1] for frame in frames], dim=1)
+
     @torch.no_grad()
     def select_action(self, batch: dict[str, Tensor], noise: Tensor | None = None) -> Tensor:
         """Select a single action given environment observations.
@@ -131,7 +181,7 @@ class DiffusionPolicy(PreTrainedPolicy):
         self._queues = populate_queues(self._queues, batch)
 
         if len(self._queues[ACTION]) == 0:
-            actions = self.predict_action_chunk(batch, noise=noise)
+            actions = self.predict_action_chunk(batch, noise=noise, warm_start=self.config.warm_start)
             self._queues[ACTION].extend(actions.transpose(0, 1))
 
         action = self._queues[ACTION].popleft()
@@ -204,7 +254,13 @@ class DiffusionModel(nn.Module):
         global_cond: Tensor | None = None,
         generator: torch.Generator | None = None,
         noise: Tensor | None = None,
+        init_sample: Tensor | None = None,
     ) -> Tensor:
+        """Sample a (B, horizon, action_dim) trajectory of normalized actions.
+
+        With `init_sample`, the noise is added to it up to the step of the schedule from which the last
+        `warm_start_strength` fraction of the denoising steps start, and only these steps are run.
+        """
         device = get_device_from_parameters(self)
         dtype = get_dtype_from_parameters(self)
 
@@ -221,8 +277,13 @@ class DiffusionModel(nn.Module):
         )
 
         self.noise_scheduler.set_timesteps(self.num_inference_steps)
+        timesteps = self.noise_scheduler.timesteps
+        if init_sample is not None:
+            num_steps = max(1, round(len(timesteps) * self.config.warm_start_strength))
+            timesteps = timesteps[-num_steps:]
+            sample = self.noise_scheduler.add_noise(init_sample.to(dtype), sample, timesteps[:1])
 
-        for t in self.noise_scheduler.timesteps:
+        for t in timesteps:
             # Predict model output.
             model_output = self.unet(
                 sample,
@@ -234,36 +295,38 @@ class DiffusionModel(nn.Module):
 
         return sample
 
-    def _prepare_global_conditioning(self, batch: dict[str, Tensor]) -> Tensor:
-        """Encode image features and concatenate them all together along with the state vector."""
-        batch_size, n_obs_steps = batch[OBS_STATE].shape[:2]
+    def encode_images(self, images: Tensor) -> Tensor:
+        """Encode (B, S, num_cameras, C, H, W) images into (B, S, num_cameras * feature_dim) features."""
+        batch_size, n_obs_steps = images.shape[:2]
+        if self.config.use_separate_rgb_encoder_per_camera:
+            # Combine batch and sequence dims while rearranging to make the camera index dimension first.
+            images_per_camera = einops.rearrange(images, "b s n ... -> n (b s) ...")
+            img_features_list = torch.cat(
+                [encoder(x) for encoder, x in zip(self.rgb_encoder, images_per_camera, strict=True)]
+            )
+            # Separate batch and sequence dims back out. The camera index dim gets absorbed into the
+            # feature dim (effectively concatenating the camera features).
+            return einops.rearrange(
+                img_features_list, "(n b s) ... -> b s (n ...)", b=batch_size, s=n_obs_steps
+            )
+        # Combine batch, sequence, and "which camera" dims before passing to shared encoder.
+        img_features = self.rgb_encoder(einops.rearrange(images, "b s n ... -> (b s n) ..."))
+        # Separate batch dim and sequence dim back out. The camera index dim gets absorbed into the
+        # feature dim (effectively concatenating the camera features).
+        return einops.rearrange(img_features, "(b s n) ... -> b s (n ...)", b=batch_size, s=n_obs_steps)
+
+    def _prepare_global_conditioning(
+        self, batch: dict[str, Tensor], img_features: Tensor | None = None
+    ) -> Tensor:
+        """Encode image features and concatenate them all together along with the state vector.
+
+        `img_features`, if provided, are the already encoded features of `batch[OBS_IMAGES]`.
+        """
         global_cond_feats = [batch[OBS_STATE]]
         # Extract image features.
         if self.config.image_features:
-            if self.config.use_separate_rgb_encoder_per_camera:
-                # Combine batch and sequence dims while rearranging to make the camera index dimension first.
-                images_per_camera = einops.rearrange(batch[OBS_IMAGES], "b s n ... -> n (b s) ...")
-                img_features_list = torch.cat(
-                    [
-                        encoder(images)
-                        for encoder, images in zip(self.rgb_encoder, images_per_camera, strict=True)
-                    ]
-                )
-                # Separate batch and sequence dims back out. The camera index dim gets absorbed into the
-                # feature dim (effectively concatenating the camera features).
-                img_features = einops.rearrange(
-                    img_features_list, "(n b s) ... -> b s (n ...)", b=batch_size, s=n_obs_steps
-                )
-            else:
-                # Combine batch, sequence, and "which camera" dims before passing to shared encoder.
-                img_features = self.rgb_encoder(
-                    einops.rearrange(batch[OBS_IMAGES], "b s n ... -> (b s n) ...")
-                )
-                # Separate batch dim and sequence dim back out. The camera index dim gets absorbed into the
-                # feature dim (effectively concatenating the camera features).
-                img_features = einops.rearrange(
-                    img_features, "(b s n) ... -> b s (n ...)", b=batch_size, s=n_obs_steps
-                )
+            if img_features is None:
+                img_features = self.encode_images(batch[OBS_IMAGES])
             global_cond_feats.append(img_features)
 
         if self.config.env_state_feature:
@@ -272,7 +335,14 @@ class DiffusionModel(nn.Module):
         # Concatenate features then flatten to (B, global_cond_dim).
         return torch.cat(global_cond_feats, dim=-1).flatten(start_dim=1)
 
-    def generate_actions(self, batch: dict[str, Tensor], noise: Tensor | None = None) -> Tensor:
+    def generate_actions(
+        self,
+        batch: dict[str, Tensor],
+        noise: Tensor | None = None,
+        init_sample: Tensor | None = None,
+        img_features: Tensor | None = None,
+        return_sample: bool = False,
+    ) -> Tensor | tuple[Tensor, Tensor]:
         """
         This function expects `batch` to have:
         {
@@ -282,21 +352,27 @@ class DiffusionModel(nn.Module):
                 AND/OR
             "observation.environment_state": (B, n_obs_steps, environment_dim)
         }
+        `init_sample` is passed to `conditional_sample`, and `img_features` to `_prepare_global_conditioning`.
+        With `return_sample`, the full horizon sample is returned along with the actions.
         """
         batch_size, n_obs_steps = batch[OBS_STATE].shape[:2]
         assert n_obs_steps == self.config.n_obs_steps
 
         # Encode image features and concatenate them all together along with the state vector.
-        global_cond = self._prepare_global_conditioning(batch)  # (B, global_cond_dim)
+        global_cond = self._prepare_global_conditioning(batch, img_features)  # (B, global_cond_dim)
 
         # run sampling
-        actions = self.conditional_sample(batch_size, global_cond=global_cond, noise=noise)
+        sample = self.conditional_sample(
+            batch_size, global_cond=global_cond, noise=noise, init_sample=init_sample
+        )
 
         # Extract `n_action_steps` steps worth of actions (from the current observation).
         start = n_obs_steps - 1
         end = start + self.config.n_action_steps
-        actions = actions[:, start:end]
+        actions = sample[:, start:end]
 
+        if return_sample:
+            return actions, sample
         return actions
 
     def compute_loss(self, batch: dict[str, Tensor]) -> Tensor:
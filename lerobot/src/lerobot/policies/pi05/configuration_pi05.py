@@ -65,6 +65,10 @@ class PI05Config(PreTrainedConfig):
     gradient_checkpointing: bool = False  # Enable gradient checkpointing for memory optimization
     compile_model: bool = False  # Whether to use torch.compile for model optimization
     compile_mode: str = "max-autotune"  # Torch compile mode
+    # Run the denoising steps through `torch.compile` (CUDA graphs with "reduce-overhead"), checking the first
+    # compiled inference against the eager loop and falling back to it on a mismatch
+    compile_denoise: bool = False
+    compile_denoise_mode: str = "reduce-overhead"
     device: str | None = None  # Device to use for the model (None = auto-detect)
 
     # Optimizer settings: see openpi `AdamW`
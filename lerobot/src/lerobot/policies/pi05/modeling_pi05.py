@@ -42,6 +42,7 @@ else:
 from lerobot.configs.policies import PreTrainedConfig
 from lerobot.policies.pi05.configuration_pi05 import PI05Config
 from lerobot.policies.pretrained import PreTrainedPolicy, T
+from lerobot.policies.utils import FlowMatchingSampler, map_stacked
 from lerobot.utils.constants import (
     ACTION,
     OBS_LANGUAGE_ATTENTION_MASK,
@@ -524,6 +525,12 @@ class PI05Pytorch(nn.Module):  # see openpi `PI0Pytorch`
 
         # Initialize gradient checkpointing flag
         self.gradient_checkpointing_enabled = False
+        # Embedding of an empty camera reused across inference calls: (image, embedding)
+        self._empty_camera_cache: tuple[Tensor, Tensor] | None = None
+
+        self.sampler = FlowMatchingSampler(
+            self.denoise_step, compile=config.compile_denoise, compile_mode=config.compile_denoise_mode
+        )
 
         # Compile model if requested
         if config.compile_model:
@@ -540,6 +547,12 @@ class PI05Pytorch(nn.Module):  # see openpi `PI0Pytorch`
         except ImportError:
             raise ValueError(msg) from None
 
+    def train(self, mode: bool = True):
+        # The cached embedding is stale once the weights are trained
+        if mode:
+            self._empty_camera_cache = None
+        return super().train(mode)
+
     def gradient_checkpointing_enable(self):
         """Enable gradient checkpointing for memory optimization."""
         self.gradient_checkpointing_enabled = True
@@ -585,6 +598,28 @@ class PI05Pytorch(nn.Module):  # see openpi `PI0Pytorch`
         time = time_beta * self.config.time_sampling_scale + self.config.time_sampling_offset
         return time.to(dtype=torch.float32, device=device)
 
+    def embed_empty_camera(self, image: Tensor) -> Tensor:
+        """Embedding of an empty camera, a fully -1 image of the resolution of `image`, for a batch of 1.
+
+        It does not depend on the inputs and is masked out of the attention, so it is computed without
+        gradients and, at inference, cached.
+        """
+        if not self.training and self._empty_camera_cache is not None:
+            cached_image, cached_emb = self._empty_camera_cache
+            if (
+                cached_image.shape[1:] == image.shape[1:]
+                and cached_image.dtype == image.dtype
+                and cached_image.device == image.device
+            ):
+                return cached_emb
+
+        empty_image = torch.full((1, *image.shape[1:]), -1.0, dtype=image.dtype, device=image.device)
+        with torch.no_grad():
+            emb = self.paligemma_with_expert.embed_image(empty_image)
+        if not self.training:
+            self._empty_camera_cache = (empty_image, emb)
+        return emb
+
     def embed_prefix(
         self, images, img_masks, tokens, masks
     ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
@@ -593,13 +628,19 @@ class PI05Pytorch(nn.Module):  # see openpi `PI0Pytorch`
         pad_masks = []
         att_masks = []
 
-        # Process images
-        for img, img_mask in zip(images, img_masks, strict=True):
-
-            def image_embed_func(img):
-                return self.paligemma_with_expert.embed_image(img)
+        # Process images, the cameras of the same resolution in one batched call
+        def image_embed_func(img):
+            return self.paligemma_with_expert.embed_image(img)
 
-            img_emb = self._apply_checkpoint(image_embed_func, img)
+        present_images = [img for img in images if img is not None]
+        present_embs = iter(
+            map_stacked(lambda img: self._apply_checkpoint(image_embed_func, img), present_images)
+        )
+        for img, img_mask in zip(images, img_masks, strict=True):
+            if img is not None:
+                img_emb = next(present_embs)
+            else:
+                img_emb = self.embed_empty_camera(present_images[-1]).expand(img_mask.shape[0], -1, -1)
             bsize, num_img_embs = img_emb.shape[:2]
 
             embs.append(img_emb)
@@ -763,36 +804,32 @@ class PI05Pytorch(nn.Module):  # see openpi `PI0Pytorch`
             use_cache=True,
         )
 
-        dt = -1.0 / num_steps
-        dt = torch.tensor(dt, dtype=torch.float32, device=device)
-
-        x_t = noise
-        time = torch.tensor(1.0, dtype=torch.float32, device=device)
-        while time >= -dt / 2:
-            expanded_time = time.expand(bsize)
-            v_t = self.denoise_step(
-                prefix_pad_masks,
-                past_key_values,
-                x_t,
-                expanded_time,
-            )
-            x_t = x_t + dt * v_t
-            time += dt
+        # The suffix attention mask and position ids are the same for all the denoising steps
+        attention_mask, position_ids = self.denoise_attention(prefix_pad_masks)
+        return self.sampler.sample(
+            noise,
+            num_steps,
+            prefix_pad_masks,
+            past_key_values,
+            attention_mask=attention_mask,
+            position_ids=position_ids,
+        )
 
-        return x_t
+    def denoise_attention(self, prefix_pad_masks, suffix_pad_masks=None, suffix_att_masks=None):
+        """4D attention mask and position ids of the suffix tokens attending to the prefix KV cache.
 
-    def denoise_step(
-        self,
-        prefix_pad_masks,
-        past_key_values,
-        x_t,
-        timestep,
-    ):
-        """Apply one denoising step of the noise `x_t` at a given timestep."""
-        suffix_embs, suffix_pad_masks, suffix_att_masks, adarms_cond = self.embed_suffix(x_t, timestep)
+        They don't depend on the noisy actions: when the suffix masks are not given, they are built as in
+        `embed_suffix`.
+        """
+        batch_size = prefix_pad_masks.shape[0]
+        if suffix_pad_masks is None or suffix_att_masks is None:
+            device = prefix_pad_masks.device
+            suffix_len = self.config.chunk_size
+            suffix_pad_masks = torch.ones(batch_size, suffix_len, dtype=torch.bool, device=device)
+            suffix_att_masks = torch.tensor([1] + [0] * (self.config.chunk_size - 1), device=device)
+            suffix_att_masks = suffix_att_masks[None, :].expand(batch_size, -1)
 
         suffix_len = suffix_pad_masks.shape[1]
-        batch_size = prefix_pad_masks.shape[0]
         prefix_len = prefix_pad_masks.shape[1]
 
         prefix_pad_2d_masks = prefix_pad_masks[:, None, :].expand(batch_size, suffix_len, prefix_len)
@@ -802,11 +839,32 @@ class PI05Pytorch(nn.Module):  # see openpi `PI0Pytorch`
         prefix_offsets = torch.sum(prefix_pad_masks, dim=-1)[:, None]
         position_ids = prefix_offsets + torch.cumsum(suffix_pad_masks, dim=1) - 1
 
-        full_att_2d_masks_4d = self._prepare_attention_masks_4d(full_att_2d_masks)
+        return self._prepare_attention_masks_4d(full_att_2d_masks), position_ids
+
+    def denoise_step(
+        self,
+        prefix_pad_masks,
+        past_key_values,
+        x_t,
+        timestep,
+        attention_mask=None,
+        position_ids=None,
+    ):
+        """Apply one denoising step of the noise `x_t` at a given timestep.
+
+        The attention mask and position ids can be precomputed once for all steps with `denoise_attention`.
+        """
+        suffix_embs, suffix_pad_masks, suffix_att_masks, adarms_cond = self.embed_suffix(x_t, timestep)
+
+        if attention_mask is None or position_ids is None:
+            attention_mask, position_ids = self.denoise_attention(
+                prefix_pad_masks, suffix_pad_masks, suffix_att_masks
+            )
+
         self.paligemma_with_expert.gemma_expert.model.config._attn_implementation = "eager"  # noqa: SLF001
 
         outputs_embeds, _ = self.paligemma_with_expert.forward(
-            attention_mask=full_att_2d_masks_4d,
+            attention_mask=attention_mask,
             position_ids=position_ids,
             past_key_values=past_key_values,
             inputs_embeds=[None, suffix_embs],
@@ -888,6 +946,11 @@ class PI05Policy(PreTrainedPolicy):
                 **kwargs,
             )
 
+        if config.fast_load:
+            model = cls._fast_load_checkpoint(pretrained_name_or_path, config, strict, **kwargs)
+            if model is not None:
+                return model
+
         # Initialize model without loading weights
         # Check if dataset_stats were provided in kwargs
         model = cls(config, **kwargs)
@@ -971,6 +1034,45 @@ class PI05Policy(PreTrainedPolicy):
 
         return model
 
+    @classmethod
+    def _fast_load_checkpoint(
+        cls: builtins.type[T],
+        pretrained_name_or_path: str | Path,
+        config: PreTrainedConfig,
+        strict: bool,
+        **kwargs,
+    ) -> T | None:
+        """Fast path of `from_pretrained` (see `PreTrainedPolicy._fast_load`), None if it is not possible.
+
+        The keys of the checkpoint are remapped as in the regular path, once: the key map is cached on disk.
+        """
+        from transformers.utils import cached_file
+
+        try:
+            resolved_file = cached_file(
+                pretrained_name_or_path,
+                "model.safetensors",
+                cache_dir=kwargs.get("cache_dir"),
+                force_download=kwargs.get("force_download", False),
+                resume_download=kwargs.get("resume_download"),
+                proxies=kwargs.get("proxies"),
+                use_auth_token=kwargs.get("use_auth_token"),
+                revision=kwargs.get("revision"),
+                local_files_only=kwargs.get("local_files_only", False),
+            )
+        except Exception as e:
+            print(f"Could not fast load the model: {e}")
+            return None
+        return cls._fast_load(config, resolved_file, strict, make_key_map=cls._checkpoint_key_map, **kwargs)
+
+    def _checkpoint_key_map(self, file_keys: list[str]) -> dict[str, str | None]:
+        """Maps the keys of a checkpoint to the keys of the policy, as `from_pretrained` remaps them."""
+        fixed_keys = self._fix_pytorch_state_dict_keys({key: key for key in file_keys}, self.config)
+        key_map = dict.fromkeys(file_keys)
+        for new_key, file_key in fixed_keys.items():
+            key_map[file_key] = new_key if new_key.startswith("model.") else f"model.{new_key}"
+        return key_map
+
     def _fix_pytorch_state_dict_keys(
         self, state_dict, model_config
     ):  # see openpi `BaseModelConfig, _fix_pytorch_state_dict_keys`
@@ -1039,7 +1141,8 @@ class PI05Policy(PreTrainedPolicy):
         """Preprocess images for the model.
 
         Images from LeRobot are typically in [B, C, H, W] format and normalized to [0, 1].
-        PaliGemma expects images in [B, C, H, W] format and normalized to [-1, 1].
+        PaliGemma expects images in [B, C, H, W] format and normalized to [-1, 1]. The images of empty cameras
+        are None.
         """
         images = []
         img_masks = []
@@ -1056,18 +1159,7 @@ class PI05Policy(PreTrainedPolicy):
                 f"(batch: {batch.keys()}) (image_features: {self.config.image_features})"
             )
 
-        # Preprocess image features present in the batch
-        for key in present_img_keys:
-            img = batch[key]
-
-            # Ensure tensor is on the same device as the model
-            if img.device != device:
-                img = img.to(device)
-
-            # Ensure float32 dtype for consistency
-            if img.dtype != torch.float32:
-                img = img.to(torch.float32)
-
+        def preprocess_images(img):
             # from openpi preprocess_observation_pytorch: Handle both [B, C, H, W] and [B, H, W, C] formats
             is_channels_first = img.shape[1] == 3  # Check if channels are in dimension 1
 
@@ -1085,19 +1177,34 @@ class PI05Policy(PreTrainedPolicy):
             # from openpi preprocess_observation_pytorch: Convert back to [B, C, H, W] format if it was originally channels-first
             if is_channels_first:
                 img = img.permute(0, 3, 1, 2)  # [B, H, W, C] -> [B, C, H, W]
+            return img
 
+        imgs = []
+        for key in present_img_keys:
+            img = batch[key]
+
+            # Ensure tensor is on the same device as the model
+            if img.device != device:
+                img = img.to(device)
+
+            # Ensure float32 dtype for consistency
+            if img.dtype != torch.float32:
+                img = img.to(torch.float32)
+            imgs.append(img)
+
+        # Resize and normalize the cameras of the same resolution together
+        for img in map_stacked(preprocess_images, imgs):
             images.append(img)
             # Create mask (all ones for real images)
             bsize = img.shape[0]
             mask = torch.ones(bsize, dtype=torch.bool, device=device)
             img_masks.append(mask)
 
-        # Create image features not present in the batch as fully 0 padded images
+        # Image features not present in the batch are empty cameras, masked out. They are not encoded but get
+        # the embedding of a fully -1 image (see `embed_empty_camera`).
         for _num_empty_cameras in range(len(missing_img_keys)):
-            img = torch.ones_like(img) * -1  # Padded with -1 for SigLIP
-            mask = torch.zeros_like(mask)  # Mask is zero for empty cameras
-            images.append(img)
-            img_masks.append(mask)
+            images.append(None)
+            img_masks.append(torch.zeros(bsize, dtype=torch.bool, device=device))
 
         return images, img_masks
 
@@ -13,8 +13,12 @@
 # limitations under the License.
 import abc
 import builtins
+import hashlib
+import json
 import logging
 import os
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from importlib.resources import files
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -22,9 +26,11 @@ from typing import TypedDict, TypeVar
 
 import packaging
 import safetensors
+import torch
 from huggingface_hub import HfApi, ModelCard, ModelCardData, hf_hub_download
 from huggingface_hub.constants import SAFETENSORS_SINGLE_FILE
 from huggingface_hub.errors import HfHubHTTPError
+from safetensors import safe_open
 from safetensors.torch import load_model as load_model_as_safetensor, save_model as save_model_as_safetensor
 from torch import Tensor, nn
 from typing_extensions import Unpack
@@ -32,10 +38,115 @@ from typing_extensions import Unpack
 from lerobot.configs.policies import PreTrainedConfig
 from lerobot.configs.train import TrainPipelineConfig
 from lerobot.policies.utils import log_model_loading_keys
+from lerobot.utils.constants import HF_LEROBOT_HOME
 from lerobot.utils.hub import HubMixin
 
 T = TypeVar("T", bound="PreTrainedPolicy")
 
+# Initialization functions skipped by `fast_init`
+_INIT_FUNCTIONS = (
+    "uniform_",
+    "normal_",
+    "trunc_normal_",
+    "constant_",
+    "ones_",
+    "zeros_",
+    "eye_",
+    "dirac_",
+    "xavier_uniform_",
+    "xavier_normal_",
+    "kaiming_uniform_",
+    "kaiming_normal_",
+    "orthogonal_",
+    "sparse_",
+)
+
+
+@contextmanager
+def fast_init(device: str | torch.device) -> Iterator[None]:
+    """Builds modules directly on `device`, skipping the random initialization of their weights.
+
+    The weights are left uninitialized: they must all be loaded from a checkpoint afterwards. Buffers computed
+    at construction (e.g. rotary embeddings) are still computed, on `device`.
+    """
+    originals = {name: getattr(torch.nn.init, name) for name in _INIT_FUNCTIONS}
+    for name in _INIT_FUNCTIONS:
+        setattr(torch.nn.init, name, lambda tensor, *args, **kwargs: tensor)
+    try:
+        with torch.device(device):
+            yield
+    finally:
+        for name, function in originals.items():
+            setattr(torch.nn.init, name, function)
+
+
+def load_safetensors_into(
+    model: nn.Module,
+    model_file: str,
+    device: str | torch.device,
+    key_map: dict[str, str | None] | None = None,
+) -> tuple[list[str], list[str]]:
+    """Copies the tensors of a safetensors file into the parameters and buffers of `model`, one at a time.
+
+    The file is memory-mapped and each tensor is read directly on `device`, then cast to the dtype of the
+    tensor of the model it is copied into, so that the peak memory is the model plus its largest tensor.
+
+    Args:
+        model: The model, on `device`.
+        model_file: The safetensors file.
+        device: The device to read the tensors on.
+        key_map: Maps the keys of the file to the keys of the model. Keys mapped to None are skipped.
+
+    Returns:
+        The missing and unexpected keys, as `load_state_dict` does.
+    """
+    state_dict = model.state_dict()
+    loaded, unexpected_keys = set(), []
+    with safe_open(model_file, framework="pt", device=str(device)) as f:
+        for file_key in f.keys():  # noqa: SIM118
+            key = key_map.get(file_key, file_key) if key_map is not None else file_key
+            if key is None:
+                continue
+            if key not in state_dict:
+                unexpected_keys.append(key)
+                continue
+            state_dict[key].copy_(f.get_tensor(file_key))
+            loaded.add(key)
+
+    # Tied tensors are saved once, the others share their storage
+    loaded_ptrs = {state_dict[key].data_ptr() for key in loaded}
+    missing_keys = [
+        key for key in state_dict if key not in loaded and state_dict[key].data_ptr() not in loaded_ptrs
+    ]
+    return missing_keys, unexpected_keys
+
+
+def cached_key_map(
+    model_file: str, model: nn.Module, make_key_map: Callable[[list[str]], dict[str, str | None]]
+) -> dict[str, str | None]:
+    """Key map of `load_safetensors_into`, computed by `make_key_map` from the keys of the file on first use.
+
+    The map is cached in `HF_LEROBOT_HOME/key_maps`, for the file (path, size and modification time) and the
+    keys of the model, so that later loads skip the remapping of the keys.
+    """
+    stat = os.stat(model_file)
+    identity = [os.path.realpath(model_file), stat.st_size, stat.st_mtime_ns, sorted(model.state_dict())]
+    digest = hashlib.sha256(json.dumps(identity).encode()).hexdigest()
+    cache_file = HF_LEROBOT_HOME / "key_maps" / f"{digest}.json"
+    if cache_file.is_file():
+        with open(cache_file) as f:
+            return json.load(f)
+
+    with safe_open(model_file, framework="pt") as f:
+        key_map = make_key_map(list(f.keys()))
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_file, "w") as f:
+            json.dump(key_map, f)
+    except OSError as e:
+        logging.warning(f"Could not cache the key map of {model_file}: {e}")
+    return key_map
+
 
 class ActionSelectKwargs(TypedDict, total=False):
     noise: Tensor | None
@@ -104,11 +215,9 @@ class PreTrainedPolicy(nn.Module, HubMixin, abc.ABC):
                 **kwargs,
             )
         model_id = str(pretrained_name_or_path)
-        instance = cls(config, **kwargs)
         if os.path.isdir(model_id):
             print("Loading weights from local directory")
             model_file = os.path.join(model_id, SAFETENSORS_SINGLE_FILE)
-            policy = cls._load_as_safetensor(instance, model_file, config.device, strict)
         else:
             try:
                 model_file = hf_hub_download(
@@ -122,12 +231,16 @@ class PreTrainedPolicy(nn.Module, HubMixin, abc.ABC):
                     token=token,
                     local_files_only=local_files_only,
                 )
-                policy = cls._load_as_safetensor(instance, model_file, config.device, strict)
             except HfHubHTTPError as e:
                 raise FileNotFoundError(
                     f"{SAFETENSORS_SINGLE_FILE} not found on the HuggingFace Hub in {model_id}"
                 ) from e
 
+        policy = cls._fast_load(config, model_file, strict, **kwargs) if config.fast_load else None
+        if policy is None:
+            instance = cls(config, **kwargs)
+            policy = cls._load_as_safetensor(instance, model_file, config.device, strict)
+
         policy.to(config.device)
         policy.eval()
         return policy
@@ -156,6 +269,40 @@ class PreTrainedPolicy(nn.Module, HubMixin, abc.ABC):
             model.to(map_location)
         return model
 
+    @classmethod
+    def _fast_load(
+        cls,
+        config: PreTrainedConfig,
+        model_file: str,
+        strict: bool,
+        make_key_map: Callable[[T, list[str]], dict[str, str | None]] | None = None,
+        **kwargs,
+    ) -> T | None:
+        """Builds the policy on `config.device` with `fast_init` and streams `model_file` into it.
+
+        `make_key_map(policy, file_keys)`, if given, maps the keys of the checkpoint to the keys of the policy
+        (see `cached_key_map`).
+
+        Returns None if the checkpoint doesn't cover all the weights, which are then left uninitialized: the
+        policy must be built and loaded the regular way.
+        """
+        with fast_init(config.device):
+            policy = cls(config, **kwargs)
+        key_map = None
+        if make_key_map is not None:
+            key_map = cached_key_map(model_file, policy, lambda file_keys: make_key_map(policy, file_keys))
+        missing_keys, unexpected_keys = load_safetensors_into(policy, model_file, config.device, key_map)
+        if missing_keys:
+            logging.warning(
+                f"Fast loading is not possible, {len(missing_keys)} key(s) are missing from the checkpoint: "
+                "loading the policy the regular way"
+            )
+            return None
+        if strict and unexpected_keys:
+            raise RuntimeError(f"Unexpected key(s) when loading model: {unexpected_keys}")
+        log_model_loading_keys(missing_keys, unexpected_keys)
+        return policy
+
     @abc.abstractmethod
     def get_optim_params(self) -> dict:
         """
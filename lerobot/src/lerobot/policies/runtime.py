@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Inference runtimes of the policies, selected with `--policy.runtime`.
+
+- "eager": the float policy, as trained.
+- "cpu_int8": the policy on CPU, for robot stations without a GPU. The linear layers of ACT and Diffusion, and
+  of the action expert of SmolVLA, are dynamically quantized to int8 with `torch.ao`: their weights are stored
+  in int8 and their activations are quantized on the fly. Where the first or last layer of the policy is
+  linear, the affine (un)normalization of its input or output is folded into its weights, and removed from the
+  pre- and post-processors. These layers are kept in float, as the folded scales of the features can differ by
+  orders of magnitude:
+    - ACT: the state and environment state normalization, and the action unnormalization.
+    - SmolVLA: the state normalization.
+"""
+
+import logging
+
+import torch
+from torch import Tensor, nn
+from torch.ao.quantization import default_dynamic_qconfig, quantize_dynamic
+
+from lerobot.configs.types import FeatureType, NormalizationMode
+from lerobot.policies.pretrained import PreTrainedPolicy
+from lerobot.processor import NormalizerProcessorStep, PolicyProcessorPipeline, UnnormalizerProcessorStep
+from lerobot.utils.constants import ACTION, OBS_ENV_STATE, OBS_STATE
+
+# Stats of the lower and upper bounds of the range mapped to [-1, 1] by each range normalization mode
+_RANGE_STATS = {
+    NormalizationMode.MIN_MAX: ("min", "max"),
+    NormalizationMode.QUANTILES: ("q01", "q99"),
+    NormalizationMode.QUANTILE10: ("q10", "q90"),
+}
+
+
+def apply_policy_runtime(
+    policy: PreTrainedPolicy,
+    preprocessor: PolicyProcessorPipeline | None = None,
+    postprocessor: PolicyProcessorPipeline | None = None,
+) -> PreTrainedPolicy:
+    """Prepares a policy and its processors, in place, for the runtime selected by `policy.config.runtime`."""
+    if policy.config.runtime == "cpu_int8":
+        return export_cpu_int8(policy, preprocessor, postprocessor)
+    return policy
+
+
+def export_cpu_int8(
+    policy: PreTrainedPolicy,
+    preprocessor: PolicyProcessorPipeline | None = None,
+    postprocessor: PolicyProcessorPipeline | None = None,
+) -> PreTrainedPolicy:
+    """Moves a policy to CPU and quantizes its linear layers to int8, in place.
+
+    When the processors are given, the normalization of the inputs and outputs of the policy is folded into
+    its first and last linear layers where possible, and removed from the processors. The processors must then
+    be used with the returned policy only. The exported policy is for inference: it must not be trained or
+    saved.
+
+    Args:
+        policy: The float policy.
+        preprocessor: The pre-processor of the policy, with its normalizer step.
+        postprocessor: The post-processor of the policy, with its unnormalizer step.
+
+    Returns:
+        The quantized policy.
+    """
+    policy.to("cpu")
+    policy.eval()
+
+    if preprocessor is not None and postprocessor is not None:
+        _fold_normalization(policy, preprocessor, postprocessor)
+
+    if policy.name == "smolvla":
+        # The VLM runs once per chunk, the expert once per denoising step: only the expert is quantized
+        model = policy.model
+        modules = [
+            "vlm_with_expert.lm_expert",
+            "action_in_proj",
+            "action_out_proj",
+            "action_time_mlp_in",
+            "action_time_mlp_out",
+        ]
+        quantize_dynamic(
+            model, dict.fromkeys(modules, default_dynamic_qconfig), dtype=torch.qint8, inplace=True
+        )
+    elif policy.name == "act":
+        # Only `nn.Linear` is matched, the output projections of `nn.MultiheadAttention` stay in float
+        quantize_dynamic(policy.model, {nn.Linear}, dtype=torch.qint8, inplace=True)
+    elif policy.name == "diffusion":
+        quantize_dynamic(policy.diffusion, {nn.Linear}, dtype=torch.qint8, inplace=True)
+    else:
+        logging.warning(f"Int8 quantization is not supported for policy '{policy.name}', running it in float")
+
+    return policy
+
+
+def _fold_normalization(
+    policy: PreTrainedPolicy, preprocessor: PolicyProcessorPipeline, postprocessor: PolicyProcessorPipeline
+) -> None:
+    """Folds the affine (un)normalization of the inputs and outputs into the linear layers of the policy."""
+    input_layers: dict[str, nn.Linear] = {}
+    output_layer: nn.Linear | None = None
+    if policy.name == "act":
+        if policy.config.robot_state_feature:
+            input_layers[OBS_STATE] = policy.model.encoder_robot_state_input_proj
+        if policy.config.env_state_feature:
+            input_layers[OBS_ENV_STATE] = policy.model.encoder_env_state_input_proj
+        output_layer = policy.model.action_head
+    elif policy.name == "smolvla" and not policy.config.adapt_to_pi_aloha:
+        # The state is padded with zeros after normalization, the padded inputs are left as is
+        input_layers[OBS_STATE] = policy.model.state_proj
+
+    for step in preprocessor.steps:
+        if not isinstance(step, NormalizerProcessorStep):
+            continue
+        folded = set()
+        for key, layer in input_layers.items():
+            if key not in step.features or layer.bias is None:
+                continue
+            affine = _normalization_affine(step, key, step.features[key].type, inverse=False)
+            if affine is not None:
+                _fold_into_input(layer, *affine)
+                folded.add(key)
+        if folded:
+            keys = step.normalize_observation_keys
+            if keys is None:
+                keys = {key for key, ft in step.features.items() if ft.type is not FeatureType.ACTION}
+            step.normalize_observation_keys = set(keys) - folded
+            logging.info(f"Folded the normalization of {sorted(folded)} into the policy")
+        break
+
+    if output_layer is None or output_layer.bias is None:
+        return
+    for step in postprocessor.steps:
+        if not isinstance(step, UnnormalizerProcessorStep):
+            continue
+        affine = _normalization_affine(step, ACTION, FeatureType.ACTION, inverse=True)
+        if affine is not None:
+            _fold_into_output(output_layer, *affine)
+            # Without stats, the step leaves the actions as is
+            step.stats = {key: stats for key, stats in step.stats.items() if key != ACTION}
+            # Rebuilds the tensor stats of the step from `stats`
+            step.to()
+            logging.info(f"Folded the unnormalization of '{ACTION}' into the policy")
+        break
+
+
+def _normalization_affine(
+    step: NormalizerProcessorStep | UnnormalizerProcessorStep,
+    key: str,
+    feature_type: FeatureType,
+    inverse: bool,
+) -> tuple[Tensor, Tensor] | None:
+    """`(scale, shift)` such that the step maps `x` to `x * scale + shift`, None if it leaves `key` as is."""
+    norm_mode = step.norm_map.get(feature_type, NormalizationMode.IDENTITY)
+    stats = {}
+    for flat_key, stat in step.state_dict().items():
+        stat_key, name = flat_key.rsplit(".", 1)
+        if stat_key == key:
+            stats[name] = stat.to(torch.float32)
+
+    if norm_mode == NormalizationMode.MEAN_STD and "mean" in stats and "std" in stats:
+        if inverse:
+            return stats["std"], stats["mean"]
+        scale = 1 / (stats["std"] + step.eps)
+        return scale, -stats["mean"] * scale
+
+    if norm_mode in _RANGE_STATS and all(name in stats for name in _RANGE_STATS[norm_mode]):
+        low, high = (stats[name] for name in _RANGE_STATS[norm_mode])
+        denom = high - low
+        denom = torch.where(denom == 0, torch.full_like(denom, step.eps), denom)
+        if inverse:
+            return denom / 2, denom / 2 + low
+        return 2 / denom, -2 * low / denom - 1
+
+    return None
+
+
+@torch.no_grad()
+def _fold_into_input(layer: nn.Linear, scale: Tensor, shift: Tensor) -> None:
+    """Makes `layer(x)` compute the former `layer(x * scale + shift)` on the first `len(scale)` inputs."""
+    dim = scale.shape[-1]
+    weight = layer.weight[:, :dim].float()
+    layer.bias.add_((weight @ shift).to(layer.bias.dtype))
+    layer.weight[:, :dim] = (weight * scale).to(layer.weight.dtype)
+    layer.qconfig = None
+
+
+@torch.no_grad()
+def _fold_into_output(layer: nn.Linear, scale: Tensor, shift: Tensor) -> None:
+    """Makes the first `len(scale)` outputs of `layer(x)` compute the former `layer(x) * scale + shift`."""
+    dim = scale.shape[-1]
+    layer.weight[:dim] = (layer.weight[:dim].float() * scale[:, None]).to(layer.weight.dtype)
+    layer.bias[:dim] = (layer.bias[:dim].float() * scale + shift).to(layer.bias.dtype)
+    layer.qconfig = None
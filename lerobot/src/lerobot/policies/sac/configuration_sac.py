@@ -53,6 +53,23 @@ class ActorLearnerConfig:
     learner_port: int = 50051
     policy_parameters_push_frequency: int = 4
     queue_get_timeout: float = 2
+    # How parameters are pushed to the actors: "full" sends the whole state dicts on every push, "delta" only
+    # sends the tensors that changed since the last full push (keyframe), as deltas against it
+    parameter_sync_mode: str = "full"
+    # dtype of the deltas in "delta" mode: "float32" (lossless), "float16", "bfloat16" or "int8"
+    parameter_delta_dtype: str = "float32"
+    # In "delta" mode, number of pushes between two full pushes
+    full_sync_interval: int = 10
+    # Compression of the transition batches sent by the actors: None, "lz4" or "zstd". The compressors are
+    # installed with `pip install 'lerobot[compression]'`
+    transition_compression: str | None = None
+    # Transport of the transition batches from the actor's control loop to its gRPC sender: "queue" (a
+    # multiprocessing queue) or "shared_memory" (a lock-free ring of fixed-size slots in shared memory, larger
+    # batches going through an overflow queue). The ring takes slots * slot_size bytes of /dev/shm, which Docker
+    # limits to 64 MB by default (raise it with `docker run --shm-size`)
+    transitions_transport: str = "queue"
+    transitions_ring_slots: int = 16
+    transitions_ring_slot_size: int = 2 * 1024 * 1024
 
 
 @dataclass
@@ -143,8 +160,23 @@ class SACConfig(PreTrainedConfig):
     online_buffer_capacity: int = 100000
     # Capacity of the offline replay buffer
     offline_buffer_capacity: int = 100000
+    # Whether to store the replay buffers in memory-mapped files under `output_dir` rather than in RAM. Buffers
+    # can then exceed the RAM, checkpoints only flush them and resuming reopens them instantly. Requires
+    # storage_device="cpu".
+    memmap_replay_buffer: bool = False
+    # Whether to store the images of the replay buffers as uint8, 4x smaller than float32. Requires images in
+    # [0, 1]: storing other values raises an error
+    store_images_as_uint8: bool = False
     # Whether to use asynchronous prefetching for the buffers
     async_prefetch: bool = False
+    # Whether to gather the batches in pinned memory and copy them to the GPU on a side CUDA stream, overlapping
+    # the transfer of the next batch with the current update. Takes precedence over `async_prefetch`. Ignored
+    # when not training on CUDA.
+    cuda_prefetch: bool = False
+    # Whether the replay buffers cache the outputs of the frozen vision encoder, computed the first time each
+    # transition is sampled, so that training skips the vision backbone. Only used with a pretrained and frozen
+    # vision encoder. Images are then not augmented.
+    cache_image_features: bool = False
     # Number of steps before learning starts
     online_step_before_learning: int = 100
     # Frequency of policy updates
@@ -169,6 +201,9 @@ class SACConfig(PreTrainedConfig):
     critic_target_update_weight: float = 0.005
     # Update-to-data ratio for the UTD algorithm (If you want enable utd_ratio, you need to set it to >1)
     utd_ratio: int = 1
+    # Whether to sample the `utd_ratio` batches of an optimization step at once, as a single batch of
+    # `utd_ratio * batch_size` transitions that is sliced on device for each critic update
+    fused_utd: bool = False
     # Hidden dimension size for the state encoder
     state_encoder_hidden_dim: int = 256
     # Dimension of the latent space
@@ -196,6 +231,12 @@ class SACConfig(PreTrainedConfig):
 
     # Optimizations
     use_torch_compile: bool = True
+    # Whether to compute the critic heads with batched matmuls over their stacked parameters, rather than one
+    # after the other. Checkpoints load with both layouts.
+    vectorized_critics: bool = True
+    # Mode of `torch.compile` for the critics, e.g. "reduce-overhead" to replay the critic forward passes with
+    # CUDA graphs, which benefits from the fixed batch shapes of `fused_utd`
+    torch_compile_mode: str = "default"
 
     def __post_init__(self):
         super().__post_init__()
@@ -15,6 +15,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import math
 from collections.abc import Callable
 from dataclasses import asdict
@@ -152,6 +153,7 @@ class SACPolicy(
                 - done: Done mask tensor
                 - observation_feature: Optional pre-computed observation features
                 - next_observation_feature: Optional pre-computed next observation features
+                - weight: Optional importance-sampling weights of the critic loss (prioritized replay)
             model: Which model to compute the loss for ("actor", "critic", "discrete_critic", or "temperature")
 
         Returns:
@@ -169,7 +171,7 @@ class SACPolicy(
             done: Tensor = batch["done"]
             next_observation_features: Tensor = batch.get("next_observation_feature")
 
-            loss_critic = self.compute_loss_critic(
+            loss_critic, td_error = self.compute_loss_critic(
                 observations=observations,
                 actions=actions,
                 rewards=rewards,
@@ -177,9 +179,11 @@ class SACPolicy(
                 done=done,
                 observation_features=observation_features,
                 next_observation_features=next_observation_features,
+                weights=batch.get("weight"),
+                return_td_error=True,
             )
 
-            return {"loss_critic": loss_critic}
+            return {"loss_critic": loss_critic, "td_error": td_error}
 
         if model == "discrete_critic" and self.config.num_discrete_actions is not None:
             # Extract critic-specific components
@@ -251,7 +255,15 @@ class SACPolicy(
         done,
         observation_features: Tensor | None = None,
         next_observation_features: Tensor | None = None,
-    ) -> Tensor:
+        weights: Tensor | None = None,
+        return_td_error: bool = False,
+    ) -> Tensor | tuple[Tensor, Tensor]:
+        """Critic TD loss.
+
+        If `weights` (importance-sampling weights of the batch, for prioritized replay) are given, the per-sample
+        losses are weighted by them. If `return_td_error` is True, also returns the absolute TD-error of each
+        sample, averaged over the critics of the ensemble (detached), to update the replay priorities.
+        """
         with torch.no_grad():
             next_action_preds, next_log_probs, _ = self.actor(next_observations, next_observation_features)
 
@@ -294,13 +306,18 @@ class SACPolicy(
         # Compute state-action value loss (TD loss) for all of the Q functions in the ensemble.
         td_target_duplicate = einops.repeat(td_target, "b -> e b", e=q_preds.shape[0])
         # You compute the mean loss of the batch for each critic and then to compute the final loss you sum them up
-        critics_loss = (
-            F.mse_loss(
-                input=q_preds,
-                target=td_target_duplicate,
-                reduction="none",
-            ).mean(dim=1)
-        ).sum()
+        per_sample_loss = F.mse_loss(
+            input=q_preds,
+            target=td_target_duplicate,
+            reduction="none",
+        )
+        if weights is not None:
+            per_sample_loss = per_sample_loss * weights
+        critics_loss = per_sample_loss.mean(dim=1).sum()
+
+        if return_td_error:
+            td_error = (q_preds.detach() - td_target_duplicate).abs().mean(dim=0)
+            return critics_loss, td_error
         return critics_loss
 
     def compute_loss_discrete_critic(
@@ -405,7 +422,8 @@ class SACPolicy(
             )
             for _ in range(self.config.num_critics)
         ]
-        self.critic_ensemble = CriticEnsemble(encoder=self.encoder_critic, ensemble=heads)
+        ensemble_cls = VectorizedCriticEnsemble if self.config.vectorized_critics else CriticEnsemble
+        self.critic_ensemble = ensemble_cls(encoder=self.encoder_critic, ensemble=heads)
         target_heads = [
             CriticHead(
                 input_dim=self.encoder_critic.output_dim + continuous_action_dim,
@@ -413,12 +431,12 @@ class SACPolicy(
             )
             for _ in range(self.config.num_critics)
         ]
-        self.critic_target = CriticEnsemble(encoder=self.encoder_critic, ensemble=target_heads)
+        self.critic_target = ensemble_cls(encoder=self.encoder_critic, ensemble=target_heads)
         self.critic_target.load_state_dict(self.critic_ensemble.state_dict())
 
         if self.config.use_torch_compile:
-            self.critic_ensemble = torch.compile(self.critic_ensemble)
-            self.critic_target = torch.compile(self.critic_target)
+            self.critic_ensemble = torch.compile(self.critic_ensemble, mode=self.config.torch_compile_mode)
+            self.critic_target = torch.compile(self.critic_target, mode=self.config.torch_compile_mode)
 
         if self.config.num_discrete_actions is not None:
             self._init_discrete_critics()
@@ -728,6 +746,17 @@ class CriticEnsemble(nn.Module):
         self.encoder = encoder
         self.init_final = init_final
         self.critics = nn.ModuleList(ensemble)
+        # Loads the state dicts of `VectorizedCriticEnsemble`
+        self._register_load_state_dict_pre_hook(self._unstack_critics_state_dict)
+
+    def _unstack_critics_state_dict(self, state_dict: dict[str, Tensor], prefix: str, *args) -> None:
+        if f"{prefix}output_layer.weight" not in state_dict:
+            return
+        for head_name, ensemble_name, layer_cls in critic_head_layer_names(self.critics[0]):
+            for param_name in ("weight", "bias"):
+                stacked = state_dict.pop(f"{prefix}{ensemble_name}.{param_name}")
+                for i, value in enumerate(layer_cls.unstack_parameter(param_name, stacked)):
+                    state_dict[f"{prefix}critics.{i}.{head_name}.{param_name}"] = value
 
     def forward(
         self,
@@ -753,6 +782,168 @@ class CriticEnsemble(nn.Module):
         return q_values
 
 
+class EnsembleLinear(nn.Module):
+    """`num_members` independent linear layers, computed with a single batched matmul.
+
+    The weight has shape (num_members, in_features, out_features) and the bias (num_members, 1, out_features).
+    Inputs and outputs have shape (num_members, batch_size, features).
+    """
+
+    def __init__(self, num_members: int, in_features: int, out_features: int):
+        super().__init__()
+        self.in_features = in_features
+        self.out_features = out_features
+        self.weight = nn.Parameter(torch.empty(num_members, in_features, out_features))
+        self.bias = nn.Parameter(torch.zeros(num_members, 1, out_features))
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return torch.baddbmm(self.bias, x, self.weight)
+
+    @staticmethod
+    def stack_parameter(name: str, values: list[Tensor]) -> Tensor:
+        """Stacks the parameter `name` of `nn.Linear` layers"""
+        if name == "weight":
+            return torch.stack([value.T for value in values])
+        return torch.stack(values).unsqueeze(1)
+
+    @staticmethod
+    def unstack_parameter(name: str, value: Tensor) -> list[Tensor]:
+        if name == "weight":
+            return [member.T.contiguous() for member in value]
+        return [member.squeeze(0) for member in value]
+
+
+class EnsembleLayerNorm(nn.Module):
+    """`num_members` independent LayerNorms over the last dimension, with parameters of shape
+    (num_members, 1, normalized_shape)."""
+
+    def __init__(self, num_members: int, normalized_shape: int, eps: float = 1e-5):
+        super().__init__()
+        self.normalized_shape = (normalized_shape,)
+        self.eps = eps
+        self.weight = nn.Parameter(torch.ones(num_members, 1, normalized_shape))
+        self.bias = nn.Parameter(torch.zeros(num_members, 1, normalized_shape))
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return torch.addcmul(self.bias, F.layer_norm(x, self.normalized_shape, eps=self.eps), self.weight)
+
+    @staticmethod
+    def stack_parameter(name: str, values: list[Tensor]) -> Tensor:
+        """Stacks the parameter `name` of `nn.LayerNorm` layers"""
+        return torch.stack(values).unsqueeze(1)
+
+    @staticmethod
+    def unstack_parameter(name: str, value: Tensor) -> list[Tensor]:
+        return [member.squeeze(0) for member in value]
+
+
+def critic_head_layer_names(head: CriticHead) -> list[tuple[str, str, type[nn.Module]]]:
+    """Maps the parametrized layers of a `CriticHead` to their stacked counterparts.
+
+    Returns:
+        A list of (name in `CriticHead`, name in `VectorizedCriticEnsemble`, ensemble layer class).
+    """
+    names = []
+    for i, layer in enumerate(head.net.net):
+        if isinstance(layer, nn.Linear):
+            names.append((f"net.net.{i}", f"net.{i}", EnsembleLinear))
+        elif isinstance(layer, nn.LayerNorm):
+            names.append((f"net.net.{i}", f"net.{i}", EnsembleLayerNorm))
+    names.append(("output_layer", "output_layer", EnsembleLinear))
+    return names
+
+
+class VectorizedCriticEnsemble(nn.Module):
+    """
+    Drop-in replacement of `CriticEnsemble` that computes all the critic heads at once.
+
+    The parameters of the heads are stacked along a leading `num_critics` dimension, so that each layer of the
+    ensemble runs as a single batched matmul instead of one small matmul per critic. The ensemble is built from
+    `CriticHead`s, whose initialization it keeps, and loads the state dicts of `CriticEnsemble` (and
+    conversely).
+
+    Args:
+        encoder (SACObservationEncoder): encoder for observations.
+        ensemble (List[CriticHead]): list of critic heads.
+        init_final (float | None): optional initializer scale for final layers.
+
+    Forward returns a tensor of shape (num_critics, batch_size) containing Q-values.
+    """
+
+    def __init__(
+        self,
+        encoder: SACObservationEncoder,
+        ensemble: list[CriticHead],
+        init_final: float | None = None,
+    ):
+        super().__init__()
+        self.encoder = encoder
+        self.init_final = init_final
+        self.num_critics = len(ensemble)
+        self.layer_names = critic_head_layer_names(ensemble[0])
+
+        layers = []
+        for layer in ensemble[0].net.net:
+            if isinstance(layer, nn.Linear):
+                layers.append(EnsembleLinear(self.num_critics, layer.in_features, layer.out_features))
+            elif isinstance(layer, nn.LayerNorm):
+                layers.append(EnsembleLayerNorm(self.num_critics, layer.normalized_shape[-1], eps=layer.eps))
+            else:
+                # Parameter-free layers (dropout, activations) apply element-wise to all the critics
+                layers.append(copy.deepcopy(layer))
+        self.net = nn.Sequential(*layers)
+        output_layer = ensemble[0].output_layer
+        self.output_layer = EnsembleLinear(
+            self.num_critics, output_layer.in_features, output_layer.out_features
+        )
+
+        # Loads the state dicts of `CriticEnsemble`
+        self._register_load_state_dict_pre_hook(self._stack_critics_state_dict)
+
+        # Start from the parameters of the heads
+        heads_state_dict = {
+            f"critics.{i}.{key}": value
+            for i, head in enumerate(ensemble)
+            for key, value in head.state_dict().items()
+        }
+        self._stack_critics_state_dict(heads_state_dict, "")
+        with torch.no_grad():
+            for name, param in self.named_parameters():
+                if name in heads_state_dict:
+                    param.copy_(heads_state_dict[name])
+
+    def _stack_critics_state_dict(self, state_dict: dict[str, Tensor], prefix: str, *args) -> None:
+        if f"{prefix}critics.0.output_layer.weight" not in state_dict:
+            return
+        for head_name, ensemble_name, layer_cls in self.layer_names:
+            for param_name in ("weight", "bias"):
+                values = [
+                    state_dict.pop(f"{prefix}critics.{i}.{head_name}.{param_name}")
+                    for i in range(self.num_critics)
+                ]
+                state_dict[f"{prefix}{ensemble_name}.{param_name}"] = layer_cls.stack_parameter(
+                    param_name, values
+                )
+
+    def forward(
+        self,
+        observations: dict[str, torch.Tensor],
+        actions: torch.Tensor,
+        observation_features: torch.Tensor | None = None,
+    ) -> torch.Tensor:
+        device = get_device_from_parameters(self)
+        # Move each tensor in observations to device
+        observations = {k: v.to(device) for k, v in observations.items()}
+
+        obs_enc = self.encoder(observations, cache=observation_features)
+
+        inputs = torch.cat([obs_enc, actions], dim=-1)
+        inputs = inputs.unsqueeze(0).expand(self.num_critics, -1, -1)
+
+        # [num_critics, batch_size, 1] -> [num_critics, batch_size]
+        return self.output_layer(self.net(inputs)).squeeze(-1)
+
+
 class DiscreteCritic(nn.Module):
     def __init__(
         self,
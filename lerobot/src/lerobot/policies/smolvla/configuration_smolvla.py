@@ -63,9 +63,16 @@ class SmolVLAConfig(PreTrainedConfig):
 
     # Decoding
     num_steps: int = 10
+    # Run the denoising steps through `torch.compile` (CUDA graphs with "reduce-overhead"). The first compiled
+    # inference is checked against the eager loop, falling back to it on a mismatch.
+    compile_denoise: bool = False
+    compile_denoise_mode: str = "reduce-overhead"
 
     # Attention utils
     use_cache: bool = True
+    # Reuse the language embeddings of the previous inference call when the task tokens did not change.
+    # The language KV states can't be reused: in the prefix, language tokens attend to the image tokens.
+    cache_language_embeddings: bool = True
 
     # Finetuning settings
     freeze_vision_encoder: bool = True
@@ -125,6 +132,19 @@ class SmolVLAConfig(PreTrainedConfig):
             )
             self.input_features[key] = empty_camera
 
+    def vision_features_signature(self) -> dict:
+        """The settings the precomputed vision features depend on (see `lerobot.datasets.feature_cache`).
+        They are the output of the whole frozen VLM image embedding with `train_expert_only`, else of the
+        frozen vision encoder only, before the trained connector."""
+        if not (self.freeze_vision_encoder or self.train_expert_only):
+            raise ValueError("Vision features can only be precomputed for a frozen vision encoder.")
+        return {
+            "type": self.type,
+            "vlm_model_name": self.vlm_model_name,
+            "resize_imgs_with_padding": self.resize_imgs_with_padding,
+            "train_expert_only": self.train_expert_only,
+        }
+
     def get_optimizer_preset(self) -> AdamWConfig:
         return AdamWConfig(
             lr=self.optimizer_lr,
@@ -54,15 +54,19 @@ policy = SmolVLAPolicy.from_pretrained("lerobot/smolvla_base")
 
 import math
 from collections import deque
+from time import perf_counter
 
 import torch
 import torch.nn.functional as F  # noqa: N812
 from torch import Tensor, nn
 
+from lerobot.datasets.feature_cache import vision_features_key, weights_hash
 from lerobot.policies.pretrained import PreTrainedPolicy
 from lerobot.policies.smolvla.configuration_smolvla import SmolVLAConfig
 from lerobot.policies.smolvla.smolvlm_with_expert import SmolVLMWithExpertModel
 from lerobot.policies.utils import (
+    FlowMatchingSampler,
+    map_stacked,
     populate_queues,
 )
 from lerobot.utils.constants import ACTION, OBS_LANGUAGE_ATTENTION_MASK, OBS_LANGUAGE_TOKENS, OBS_STATE
@@ -343,26 +347,38 @@ class SmolVLAPolicy(PreTrainedPolicy):
 
     def prepare_images(self, batch):
         """Apply SmolVLA preprocessing to the images, like resizing to 224x224 and padding to keep aspect ratio, and
-        convert pixel range from [0.0, 1.0] to [-1.0, 1.0] as requested by SigLIP.
+        convert pixel range from [0.0, 1.0] to [-1.0, 1.0] as requested by SigLIP. The images of empty cameras
+        are None, the cameras with precomputed vision features (see `lerobot.datasets.feature_cache`) are
+        given as their (B, num_tokens, dim) features.
         """
         images = []
         img_masks = []
-        present_img_keys = [key for key in self.config.image_features if key in batch]
-        missing_img_keys = [key for key in self.config.image_features if key not in batch]
+        present_img_keys = [
+            key for key in self.config.image_features if key in batch or vision_features_key(key) in batch
+        ]
+        missing_img_keys = [key for key in self.config.image_features if key not in present_img_keys]
 
         if len(present_img_keys) == 0:
             raise ValueError(
                 f"All image features are missing from the batch. At least one expected. (batch: {batch.keys()}) (image_features:{self.config.image_features})"
             )
-        # Preprocess image features present in the batch
-        for key in present_img_keys:
-            img = batch[key][:, -1, :, :, :] if batch[key].ndim == 5 else batch[key]
+
+        def preprocess_images(img):
             if self.config.resize_imgs_with_padding is not None:
                 img = resize_with_pad(img, *self.config.resize_imgs_with_padding, pad_value=0)
 
             # Normalize from range [0,1] to [-1,1] as expacted by siglip
-            img = img * 2.0 - 1.0
-
+            return img * 2.0 - 1.0
+
+        # Preprocess image features present in the batch, the cameras of the same resolution together
+        imgs = [
+            batch[key][:, -1] if batch[key].ndim == 5 else batch[key]
+            for key in present_img_keys
+            if key in batch
+        ]
+        preprocessed_imgs = iter(map_stacked(preprocess_images, imgs))
+        for key in present_img_keys:
+            img = next(preprocessed_imgs) if key in batch else batch[vision_features_key(key)]
             bsize = img.shape[0]
             device = img.device
             if f"{key}_padding_mask" in batch:
@@ -372,17 +388,36 @@ class SmolVLAPolicy(PreTrainedPolicy):
             images.append(img)
             img_masks.append(mask)
 
-        # Create image features not present in the batch
-        # as fully 0 padded images.
+        # Image features not present in the batch are empty cameras, masked out. They are not encoded but get
+        # the embedding of a fully -1 image (see `VLAFlowMatching.embed_images`).
         for num_empty_cameras in range(len(missing_img_keys)):
             if num_empty_cameras >= self.config.empty_cameras:
                 break
-            img = torch.ones_like(img) * -1
-            mask = torch.zeros_like(mask)
-            images.append(img)
-            img_masks.append(mask)
+            images.append(None)
+            img_masks.append(torch.zeros(bsize, dtype=torch.bool, device=device))
         return images, img_masks
 
+    @torch.no_grad()
+    def encode_vision_features(self, batch: dict[str, Tensor]) -> dict[str, Tensor]:
+        """The frozen vision features of the cameras of `batch`, to precompute them (see
+        `SmolVLAConfig.vision_features_signature`)."""
+        self.config.vision_features_signature()
+        images, _ = self.prepare_images(batch)
+        present_img_keys = [key for key in self.config.image_features if key in batch]
+        vlm_with_expert = self.model.vlm_with_expert
+        if self.config.train_expert_only:
+            encode = vlm_with_expert.embed_image
+        else:
+            encode = vlm_with_expert.encode_image
+        features = map_stacked(encode, images[: len(present_img_keys)])
+        return dict(zip(present_img_keys, features, strict=True))
+
+    def vision_weights_hash(self) -> str:
+        """Hash of the frozen weights computing the features of `encode_vision_features`."""
+        vlm = self.model.vlm_with_expert.get_vlm_model()
+        modules = [vlm.vision_model, vlm.connector] if self.config.train_expert_only else [vlm.vision_model]
+        return weights_hash(modules)
+
     def _pi_aloha_decode_state(self, state):
         # Flip the joints.
         for motor_idx in [1, 2, 8, 9]:
@@ -511,6 +546,102 @@ class VLAFlowMatching(nn.Module):
         self.image_end_token = torch.tensor([self.fake_image_token], dtype=torch.long)
         self.prefix_length = self.config.prefix_length
 
+        self.sampler = FlowMatchingSampler(
+            self.denoise_step, compile=config.compile_denoise, compile_mode=config.compile_denoise_mode
+        )
+
+        # Embeddings reused across inference calls: name -> (tokens or image, embeddings)
+        self._embeddings_cache: dict[str, tuple[Tensor, Tensor]] = {}
+        # Host-side duration of the stages of the last `sample_actions` call, in seconds
+        self.inference_timings: dict[str, float] = {}
+
+    def train(self, mode: bool = True):
+        # The cached embeddings are stale once the weights are trained
+        if mode:
+            self.clear_embeddings_cache()
+        return super().train(mode)
+
+    def clear_embeddings_cache(self):
+        self._embeddings_cache = {}
+
+    def embed_tokens(self, tokens: Tensor, cache_key: str | None = None) -> Tensor:
+        """Embed language tokens. With a `cache_key`, at inference, the embeddings of the previous call under
+        the same key are reused if the tokens did not change, e.g. for the task of an episode."""
+        use_cache = (
+            cache_key is not None
+            and self.config.cache_language_embeddings
+            and not self.training
+            and not torch.is_grad_enabled()
+        )
+        if use_cache and cache_key in self._embeddings_cache:
+            cached_tokens, cached_embs = self._embeddings_cache[cache_key]
+            # The tokenizer step caches its outputs, so unchanged tokens are usually the same tensor
+            if cached_tokens is tokens or (
+                cached_tokens.shape == tokens.shape
+                and cached_tokens.device == tokens.device
+                and torch.equal(cached_tokens, tokens)
+            ):
+                return cached_embs
+
+        embs = self.vlm_with_expert.embed_language_tokens(tokens)
+        if use_cache:
+            self._embeddings_cache[cache_key] = (tokens, embs)
+        return embs
+
+    def embed_images(self, images: list[Tensor | None]) -> list[Tensor]:
+        """Embed the images of the cameras with SigLIP, in one batched call for the cameras of the same
+        resolution. Empty cameras (None) are not encoded, see `embed_empty_camera`. Cameras given as
+        precomputed (B, num_tokens, dim) vision features skip the frozen part of the embedding."""
+        present_images = [img for img in images if img is not None]
+        present_embs = iter(map_stacked(self._embed_image_or_features, present_images))
+        bsize = present_images[0].shape[0]
+        return [
+            next(present_embs)
+            if img is not None
+            else self.embed_empty_camera(self._reference_image(present_images)).expand(bsize, -1, -1)
+            for img in images
+        ]
+
+    def _embed_image_or_features(self, image: Tensor) -> Tensor:
+        if image.ndim == 4:
+            return self.vlm_with_expert.embed_image(image)
+        return self.vlm_with_expert.embed_image_features(image, projected=self.config.train_expert_only)
+
+    def _reference_image(self, present_images: list[Tensor]) -> Tensor:
+        """An image of the resolution of the encoded images, for `embed_empty_camera`."""
+        pixel_images = [img for img in present_images if img.ndim == 4]
+        if pixel_images:
+            return pixel_images[-1]
+        # Only precomputed features, extracted from images resized by `SmolVLAPolicy.prepare_images`
+        if self.config.resize_imgs_with_padding is not None:
+            width, height = self.config.resize_imgs_with_padding
+            shape = (3, height, width)
+        else:
+            shape = next(iter(self.config.image_features.values())).shape
+        return torch.empty(1, *shape, device=present_images[-1].device)
+
+    def embed_empty_camera(self, image: Tensor) -> Tensor:
+        """Embedding of an empty camera, a fully -1 image of the resolution of `image`, for a batch of 1.
+
+        It does not depend on the inputs and is masked out of the attention, so it is computed without
+        gradients and, at inference, cached.
+        """
+        if not self.training and "empty_camera" in self._embeddings_cache:
+            cached_image, cached_emb = self._embeddings_cache["empty_camera"]
+            if (
+                cached_image.shape[1:] == image.shape[1:]
+                and cached_image.dtype == image.dtype
+                and cached_image.device == image.device
+            ):
+                return cached_emb
+
+        empty_image = torch.full((1, *image.shape[1:]), -1.0, dtype=image.dtype, device=image.device)
+        with torch.no_grad():
+            emb = self.vlm_with_expert.embed_image(empty_image)
+        if not self.training:
+            self._embeddings_cache["empty_camera"] = (empty_image, emb)
+        return emb
+
     def set_requires_grad(self):
         for params in self.state_proj.parameters():
             params.requires_grad = self.config.train_state_proj
@@ -540,17 +671,19 @@ class VLAFlowMatching(nn.Module):
         embs = []
         pad_masks = []
         att_masks = []
+        img_embs = self.embed_images(images)
         for _img_idx, (
-            img,
+            img_emb,
             img_mask,
-        ) in enumerate(zip(images, img_masks, strict=False)):
+        ) in enumerate(zip(img_embs, img_masks, strict=False)):
             if self.add_image_special_tokens:
                 image_start_token = (
-                    self.vlm_with_expert.embed_language_tokens(
-                        self.global_image_start_token.to(device=self.vlm_with_expert.vlm.device)
+                    self.embed_tokens(
+                        self.global_image_start_token.to(device=self.vlm_with_expert.vlm.device),
+                        cache_key="image_start",
                     )
                     .unsqueeze(0)
-                    .expand(img.shape[0], -1, -1)
+                    .expand(img_emb.shape[0], -1, -1)
                 )
                 image_start_mask = torch.ones_like(
                     image_start_token[:, :, 0], dtype=torch.bool, device=image_start_token.device
@@ -559,9 +692,6 @@ class VLAFlowMatching(nn.Module):
                 embs.append(image_start_token)
                 pad_masks.append(image_start_mask)
 
-            img_emb = self.vlm_with_expert.embed_image(img)
-            img_emb = img_emb
-
             # Normalize image embeddings
             img_emb_dim = img_emb.shape[-1]
             img_emb = img_emb * torch.tensor(img_emb_dim**0.5, dtype=img_emb.dtype, device=img_emb.device)
@@ -575,11 +705,12 @@ class VLAFlowMatching(nn.Module):
             att_masks += [0] * (num_img_embs)
             if self.add_image_special_tokens:
                 image_end_token = (
-                    self.vlm_with_expert.embed_language_tokens(
-                        self.image_end_token.to(device=self.vlm_with_expert.vlm.device)
+                    self.embed_tokens(
+                        self.image_end_token.to(device=self.vlm_with_expert.vlm.device),
+                        cache_key="image_end",
                     )
                     .unsqueeze(0)
-                    .expand(img.shape[0], -1, -1)
+                    .expand(img_emb.shape[0], -1, -1)
                 )
                 image_end_mask = torch.ones_like(
                     image_end_token[:, :, 0], dtype=torch.bool, device=image_end_token.device
@@ -587,7 +718,7 @@ class VLAFlowMatching(nn.Module):
                 embs.append(image_end_token)
                 pad_masks.append(image_end_mask)
                 att_masks += [0] * (image_end_mask.shape[1])
-        lang_emb = self.vlm_with_expert.embed_language_tokens(lang_tokens)
+        lang_emb = self.embed_tokens(lang_tokens, cache_key="language")
         # Normalize language embeddings
         lang_emb_dim = lang_emb.shape[-1]
         lang_emb = lang_emb * math.sqrt(lang_emb_dim)
@@ -715,9 +846,11 @@ class VLAFlowMatching(nn.Module):
             actions_shape = (bsize, self.config.chunk_size, self.config.max_action_dim)
             noise = self.sample_noise(actions_shape, device)
 
+        start_embed_prefix = perf_counter()
         prefix_embs, prefix_pad_masks, prefix_att_masks = self.embed_prefix(
             images, img_masks, lang_tokens, lang_masks, state=state
         )
+        start_prefix_forward = perf_counter()
         prefix_att_2d_masks = make_att_2d_masks(prefix_pad_masks, prefix_att_masks)
         prefix_position_ids = torch.cumsum(prefix_pad_masks, dim=1) - 1
         # Compute image and language key value cache
@@ -729,36 +862,43 @@ class VLAFlowMatching(nn.Module):
             use_cache=self.config.use_cache,
             fill_kv_cache=True,
         )
-        dt = -1.0 / self.config.num_steps
-        dt = torch.tensor(dt, dtype=torch.float32, device=device)
-
-        x_t = noise
-        time = torch.tensor(1.0, dtype=torch.float32, device=device)
-        while time >= -dt / 2:
-            expanded_time = time.expand(bsize)
-            v_t = self.denoise_step(
-                prefix_pad_masks,
-                past_key_values,
-                x_t,
-                expanded_time,
-            )
-            # Euler step
-            x_t += dt * v_t
-            time += dt
+        start_denoise = perf_counter()
+        # The suffix attention mask and position ids are the same for all the denoising steps
+        attention_mask, position_ids = self.denoise_attention(prefix_pad_masks)
+        x_t = self.sampler.sample(
+            noise,
+            self.config.num_steps,
+            prefix_pad_masks,
+            past_key_values,
+            attention_mask=attention_mask,
+            position_ids=position_ids,
+        )
+
+        # Kernels are launched asynchronously on GPU: their duration may be accounted in a later stage
+        end_denoise = perf_counter()
+        self.inference_timings = {
+            "embed_prefix": start_prefix_forward - start_embed_prefix,
+            "prefix_forward": start_denoise - start_prefix_forward,
+            "denoise": end_denoise - start_denoise,
+        }
         return x_t
 
-    def denoise_step(
-        self,
-        prefix_pad_masks,
-        past_key_values,
-        x_t,
-        timestep,
-    ):
-        """Apply one denoising step of the noise `x_t` at a given timestep."""
-        suffix_embs, suffix_pad_masks, suffix_att_masks = self.embed_suffix(x_t, timestep)
+    def denoise_attention(self, prefix_pad_masks, suffix_pad_masks=None, suffix_att_masks=None):
+        """Attention mask and position ids of the suffix tokens attending to the prefix KV cache.
 
-        suffix_len = suffix_pad_masks.shape[1]
+        They don't depend on the noisy actions: when the suffix masks are not given, they are built as in
+        `embed_suffix`.
+        """
         batch_size = prefix_pad_masks.shape[0]
+        if suffix_pad_masks is None or suffix_att_masks is None:
+            suffix_pad_masks = torch.ones(
+                batch_size, self.config.chunk_size, dtype=torch.bool, device=prefix_pad_masks.device
+            )
+            suffix_att_masks = torch.ones(
+                batch_size, self.config.chunk_size, dtype=torch.float32, device=prefix_pad_masks.device
+            )
+
+        suffix_len = suffix_pad_masks.shape[1]
         prefix_len = prefix_pad_masks.shape[1]
         prefix_pad_2d_masks = prefix_pad_masks[:, None, :].expand(batch_size, suffix_len, prefix_len)
 
@@ -767,9 +907,30 @@ class VLAFlowMatching(nn.Module):
         full_att_2d_masks = torch.cat([prefix_pad_2d_masks, suffix_att_2d_masks], dim=2)
         prefix_offsets = torch.sum(prefix_pad_masks, dim=-1)[:, None]
         position_ids = prefix_offsets + torch.cumsum(suffix_pad_masks, dim=1) - 1
+        return full_att_2d_masks, position_ids
+
+    def denoise_step(
+        self,
+        prefix_pad_masks,
+        past_key_values,
+        x_t,
+        timestep,
+        attention_mask=None,
+        position_ids=None,
+    ):
+        """Apply one denoising step of the noise `x_t` at a given timestep.
+
+        The attention mask and position ids can be precomputed once for all steps with `denoise_attention`.
+        """
+        suffix_embs, suffix_pad_masks, suffix_att_masks = self.embed_suffix(x_t, timestep)
+
+        if attention_mask is None or position_ids is None:
+            attention_mask, position_ids = self.denoise_attention(
+                prefix_pad_masks, suffix_pad_masks, suffix_att_masks
+            )
 
         outputs_embeds, _ = self.vlm_with_expert.forward(
-            attention_mask=full_att_2d_masks,
+            attention_mask=attention_mask,
             position_ids=position_ids,
             past_key_values=past_key_values,
             inputs_embeds=[None, suffix_embs],
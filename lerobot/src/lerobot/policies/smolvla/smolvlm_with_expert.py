@@ -58,6 +58,12 @@ def get_intermediate_size(hidden_dim, ffn_dim_multiplier=4, multiple_of=256):
     return hidden_dim
 
 
+def get_input_dtype(linear: nn.Module) -> torch.dtype:
+    """Dtype of the inputs of a linear layer. Dynamically quantized layers take float32 inputs."""
+    weight = linear.weight
+    return weight.dtype if isinstance(weight, torch.Tensor) else torch.float32
+
+
 class SmolVLMWithExpertModel(nn.Module):
     def __init__(
         self,
@@ -178,9 +184,12 @@ class SmolVLMWithExpertModel(nn.Module):
             self.vlm.eval()
 
     def embed_image(self, image: torch.Tensor):
+        return self.embed_image_features(self.encode_image(image))
+
+    def encode_image(self, image: torch.Tensor):
         patch_attention_mask = None
         # Get sequence from the vision encoder
-        image_hidden_states = (
+        return (
             self.get_vlm_model()
             .vision_model(
                 pixel_values=image.to(dtype=self.get_vlm_model().vision_model.dtype),
@@ -188,9 +197,16 @@ class SmolVLMWithExpertModel(nn.Module):
             )
             .last_hidden_state
         )
+
+    def embed_image_features(self, image_hidden_states: torch.Tensor, projected: bool = False):
+        """Embeds the output of the vision encoder, or returns it as is when `projected`, i.e. when it is
+        already the output of the connector."""
+        connector = self.get_vlm_model().connector
+        image_hidden_states = image_hidden_states.to(dtype=next(connector.parameters()).dtype)
+        if projected:
+            return image_hidden_states
         # Modality projection & resampling
-        image_hidden_states = self.get_vlm_model().connector(image_hidden_states)
-        return image_hidden_states
+        return connector(image_hidden_states)
 
     def embed_language_tokens(self, tokens: torch.Tensor):
         return self.get_vlm_model().text_model.get_input_embeddings()(tokens)
@@ -220,7 +236,7 @@ class SmolVLMWithExpertModel(nn.Module):
             input_shape = hidden_states.shape[:-1]
             hidden_shape = (*input_shape, -1, layer.self_attn.head_dim)
 
-            hidden_states = hidden_states.to(dtype=layer.self_attn.q_proj.weight.dtype)
+            hidden_states = hidden_states.to(dtype=get_input_dtype(layer.self_attn.q_proj))
             query_state = layer.self_attn.q_proj(hidden_states).view(hidden_shape)
             key_state = layer.self_attn.k_proj(hidden_states).view(hidden_shape)
             value_state = layer.self_attn.v_proj(hidden_states).view(hidden_shape)
@@ -346,17 +362,19 @@ class SmolVLMWithExpertModel(nn.Module):
             expert_input_shape = expert_hidden_states.shape[:-1]
             expert_hidden_shape = (*expert_input_shape, -1, expert_layer.self_attn.head_dim)
 
-            expert_hidden_states = expert_hidden_states.to(dtype=expert_layer.self_attn.q_proj.weight.dtype)
+            expert_hidden_states = expert_hidden_states.to(
+                dtype=get_input_dtype(expert_layer.self_attn.q_proj)
+            )
             expert_query_state = expert_layer.self_attn.q_proj(expert_hidden_states).view(expert_hidden_shape)
 
-            _key_states = key_states.to(dtype=expert_layer.self_attn.k_proj.weight.dtype).view(
+            _key_states = key_states.to(dtype=get_input_dtype(expert_layer.self_attn.k_proj)).view(
                 *key_states.shape[:2], -1
             )
             expert_key_states = expert_layer.self_attn.k_proj(_key_states).view(
                 *_key_states.shape[:-1], -1, expert_layer.self_attn.head_dim
             )  # k_proj should have same dim as kv
 
-            _value_states = value_states.to(dtype=expert_layer.self_attn.v_proj.weight.dtype).view(
+            _value_states = value_states.to(dtype=get_input_dtype(expert_layer.self_attn.v_proj)).view(
                 *value_states.shape[:2], -1
             )
             expert_value_states = expert_layer.self_attn.v_proj(_value_states).view(
@@ -467,8 +485,8 @@ class SmolVLMWithExpertModel(nn.Module):
                         continue
                     end = start + hidden_states.shape[1]
 
-                    if att_output.dtype != layer.self_attn.o_proj.weight.dtype:
-                        att_output = att_output.to(layer.self_attn.o_proj.weight.dtype)
+                    if att_output.dtype != get_input_dtype(layer.self_attn.o_proj):
+                        att_output = att_output.to(get_input_dtype(layer.self_attn.o_proj))
                     att_out = att_output[:, start:end]
                     out_emb = layer.self_attn.o_proj(att_out)
 
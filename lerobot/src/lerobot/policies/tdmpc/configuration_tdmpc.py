@@ -82,6 +82,9 @@ class TDMPCConfig(PreTrainedConfig):
             elites, when updating the gaussian parameters for CEM.
         gaussian_mean_momentum: Momentum (α) used for EMA updates of the mean parameter μ of the gaussian
             parameters optimized in CEM. Updates are calculated as μ⁻ ← αμ⁻ + (1-α)μ.
+        compile_planner: Whether to run the value estimation of the candidate trajectories in MPC (the
+            latent rollouts over the horizon) through `torch.compile`.
+        compile_planner_mode: The `torch.compile` mode used with `compile_planner`.
         max_random_shift_ratio: Maximum random shift (as a proportion of the image size) to apply to the
             image(s) (in units of pixels) for training-time augmentation. If set to 0, no such augmentation
             is applied. Note that the input images are assumed to be square for this augmentation.
@@ -142,6 +145,8 @@ class TDMPCConfig(PreTrainedConfig):
     n_elites: int = 50
     elite_weighting_temperature: float = 0.5
     gaussian_mean_momentum: float = 0.1
+    compile_planner: bool = False
+    compile_planner_mode: str = "default"
 
     # Training and loss computation.
     max_random_shift_ratio: float = 0.0476
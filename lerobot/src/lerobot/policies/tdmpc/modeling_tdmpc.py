@@ -80,6 +80,13 @@ class TDMPCPolicy(PreTrainedPolicy):
         for param in self.model_target.parameters():
             param.requires_grad = False
 
+        # Value estimation of the candidate trajectories used by the planner.
+        self._estimate_value = (
+            torch.compile(self.estimate_value, mode=config.compile_planner_mode, dynamic=False)
+            if config.compile_planner
+            else self.estimate_value
+        )
+
         self.reset()
 
     def get_optim_params(self) -> dict:
@@ -193,6 +200,16 @@ class TDMPCPolicy(PreTrainedPolicy):
         # In the CEM loop we will need this for a call to estimate_value with the gaussian sampled
         # trajectories.
         z = einops.repeat(z, "b d -> n b d", n=self.config.n_gaussian_samples + self.config.n_pi_samples)
+        # Candidate trajectories of all CEM iterations: the gaussian samples are rewritten in place at every
+        # iteration, the policy samples stay the same.
+        actions = torch.empty(
+            self.config.horizon,
+            self.config.n_gaussian_samples + self.config.n_pi_samples,
+            batch_size,
+            self.config.action_feature.shape[0],
+            device=device,
+        )
+        actions[:, self.config.n_gaussian_samples :] = pi_actions
 
         # Model Predictive Path Integral (MPPI) with the cross-entropy method (CEM) as the optimization
         # algorithm.
@@ -205,41 +222,35 @@ class TDMPCPolicy(PreTrainedPolicy):
             mean[:-1] = self._prev_mean[1:]
         std = self.config.max_std * torch.ones_like(mean)
 
-        for _ in range(self.config.cem_iterations):
+        # Standard normal noise of the gaussian samples of all the CEM iterations, drawn at once.
+        std_normal_noise = torch.randn(
+            self.config.cem_iterations,
+            self.config.horizon,
+            self.config.n_gaussian_samples,
+            batch_size,
+            self.config.action_feature.shape[0],
+            device=std.device,
+        )
+        for i in range(self.config.cem_iterations):
             # Randomly sample action trajectories for the gaussian distribution.
-            std_normal_noise = torch.randn(
-                self.config.horizon,
-                self.config.n_gaussian_samples,
-                batch_size,
-                self.config.action_feature.shape[0],
-                device=std.device,
+            actions[:, : self.config.n_gaussian_samples] = torch.clamp(
+                mean.unsqueeze(1) + std.unsqueeze(1) * std_normal_noise[i], -1, 1
             )
-            gaussian_actions = torch.clamp(mean.unsqueeze(1) + std.unsqueeze(1) * std_normal_noise, -1, 1)
 
             # Compute elite actions.
-            actions = torch.cat([gaussian_actions, pi_actions], dim=1)
-            value = self.estimate_value(z, actions).nan_to_num_(0)
-            elite_idxs = torch.topk(value, self.config.n_elites, dim=0).indices  # (n_elites, batch)
-            elite_value = value.take_along_dim(elite_idxs, dim=0)  # (n_elites, batch)
+            value = self._estimate_value(z, actions).nan_to_num_(0)
+            elite_value, elite_idxs = torch.topk(value, self.config.n_elites, dim=0)  # (n_elites, batch)
             # (horizon, n_elites, batch, action_dim)
             elite_actions = actions.take_along_dim(einops.rearrange(elite_idxs, "n b -> 1 n b 1"), dim=1)
 
             # Update gaussian PDF parameters to be the (weighted) mean and standard deviation of the elites.
-            max_value = elite_value.max(0, keepdim=True)[0]  # (1, batch)
             # The weighting is a softmax over trajectory values. Note that this is not the same as the usage
             # of Ω in eqn 4 of the TD-MPC paper. Instead it is the normalized version of it: s = Ω/ΣΩ. This
             # makes the equations: μ = Σ(s⋅Γ), σ = Σ(s⋅(Γ-μ)²).
-            score = torch.exp(self.config.elite_weighting_temperature * (elite_value - max_value))
-            score /= score.sum(axis=0, keepdim=True)
+            score = torch.softmax(self.config.elite_weighting_temperature * elite_value, dim=0)
             # (horizon, batch, action_dim)
-            _mean = torch.sum(einops.rearrange(score, "n b -> n b 1") * elite_actions, dim=1)
-            _std = torch.sqrt(
-                torch.sum(
-                    einops.rearrange(score, "n b -> n b 1")
-                    * (elite_actions - einops.rearrange(_mean, "h b d -> h 1 b d")) ** 2,
-                    dim=1,
-                )
-            )
+            _mean = torch.einsum("nb,hnbd->hbd", score, elite_actions)
+            _std = torch.einsum("nb,hnbd->hbd", score, (elite_actions - _mean.unsqueeze(1)) ** 2).sqrt()
             # Update mean with an exponential moving average, and std with a direct replacement.
             mean = (
                 self.config.gaussian_mean_momentum * mean + (1 - self.config.gaussian_mean_momentum) * _mean
@@ -265,24 +276,23 @@ class TDMPCPolicy(PreTrainedPolicy):
         Returns:
             (batch,) tensor of values.
         """
-        # Initialize return and running discount factor.
-        G, running_discount = 0, 1
-        # Iterate over the actions in the trajectory to simulate the trajectory using the latent dynamics
-        # model. Keep track of return.
-        for t in range(actions.shape[0]):
-            # We will compute the reward in a moment. First compute the uncertainty regularizer from eqn 4
-            # of the FOWM paper.
-            if self.config.uncertainty_regularizer_coeff > 0:
-                regularization = -(
-                    self.config.uncertainty_regularizer_coeff * self.model.Qs(z, actions[t]).std(0)
-                )
-            else:
-                regularization = 0
-            # Estimate the next state (latent) and reward.
-            z, reward = self.model.latent_dynamics_and_reward(z, actions[t])
-            # Update the return and running discount.
-            G += running_discount * (reward + regularization)
-            running_discount *= self.config.discount
+        horizon = actions.shape[0]
+        # Simulate the trajectory using the latent dynamics model. Only the dynamics are sequential: the
+        # rewards and the uncertainty regularizer of all the steps are then computed at once.
+        zs = [z]
+        for t in range(horizon):
+            zs.append(self.model.latent_dynamics(zs[-1], actions[t]))
+        z = zs[-1]
+        zs = torch.stack(zs[:-1])  # (horizon, batch, latent_dim)
+
+        rewards = self.model.reward(zs, actions)  # (horizon, batch)
+        # Uncertainty regularizer from eqn 4 of the FOWM paper.
+        if self.config.uncertainty_regularizer_coeff > 0:
+            rewards = rewards - self.config.uncertainty_regularizer_coeff * self.model.Qs(zs, actions).std(0)
+        # Discounted return.
+        discounts = self.config.discount ** torch.arange(horizon, device=rewards.device, dtype=rewards.dtype)
+        G = torch.einsum("h,h...->...", discounts, rewards)
+        running_discount = self.config.discount**horizon
         # Add the estimated value of the final state (using the minimum for a conservative estimate).
         # Do so by predicting the next action, then taking a minimum over the ensemble of state-action value
         # estimators.
@@ -350,9 +360,10 @@ class TDMPCPolicy(PreTrainedPolicy):
         batch_size = batch["index"].shape[0]
         z_preds = torch.empty(horizon + 1, batch_size, self.config.latent_dim, device=device)
         z_preds[0] = self.model.encode(current_observation)
-        reward_preds = torch.empty_like(reward, device=device)
         for t in range(horizon):
-            z_preds[t + 1], reward_preds[t] = self.model.latent_dynamics_and_reward(z_preds[t], action[t])
+            z_preds[t + 1] = self.model.latent_dynamics(z_preds[t], action[t])
+        # The rewards of all the steps are predicted at once.
+        reward_preds = self.model.reward(z_preds[:-1], action)
 
         # Compute Q and V value predictions based on the latent rollout.
         q_preds_ensemble = self.model.Qs(z_preds[:-1], action)  # (ensemble, horizon, batch)
@@ -605,31 +616,29 @@ class TDMPCTOLD(nn.Module):
         """Encodes an observation into its latent representation."""
         return self._encoder(obs)
 
-    def latent_dynamics_and_reward(self, z: Tensor, a: Tensor) -> tuple[Tensor, Tensor]:
-        """Predict the next state's latent representation and the reward given a current latent and action.
+    def latent_dynamics(self, z: Tensor, a: Tensor) -> Tensor:
+        """Predict the next state's latent representation given a current latent and action.
 
         Args:
             z: (*, latent_dim) tensor for the current state's latent representation.
             a: (*, action_dim) tensor for the action to be applied.
         Returns:
-            A tuple containing:
-                - (*, latent_dim) tensor for the next state's latent representation.
-                - (*,) tensor for the estimated reward.
+            (*, latent_dim) tensor for the next state's latent representation.
         """
         x = torch.cat([z, a], dim=-1)
-        return self._dynamics(x), self._reward(x).squeeze(-1)
+        return self._dynamics(x)
 
-    def latent_dynamics(self, z: Tensor, a: Tensor) -> Tensor:
-        """Predict the next state's latent representation given a current latent and action.
+    def reward(self, z: Tensor, a: Tensor) -> Tensor:
+        """Predict the reward given a current latent and action.
 
         Args:
             z: (*, latent_dim) tensor for the current state's latent representation.
             a: (*, action_dim) tensor for the action to be applied.
         Returns:
-            (*, latent_dim) tensor for the next state's latent representation.
+            (*,) tensor for the estimated reward.
         """
         x = torch.cat([z, a], dim=-1)
-        return self._dynamics(x)
+        return self._reward(x).squeeze(-1)
 
     def pi(self, z: Tensor, std: float = 0.0) -> Tensor:
         """Samples an action from the learned policy.
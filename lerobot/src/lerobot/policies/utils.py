@@ -16,6 +16,7 @@
 
 import logging
 from collections import deque
+from collections.abc import Callable
 from typing import Any
 
 import numpy as np
@@ -198,3 +199,125 @@ def make_robot_action(action_tensor: PolicyAction, ds_features: dict[str, dict])
         f"{name}": float(action_tensor[i]) for i, name in enumerate(action_names)
     }
     return act_processed_policy
+
+
+def map_stacked(
+    fn: Callable[[torch.Tensor], torch.Tensor], tensors: list[torch.Tensor]
+) -> list[torch.Tensor]:
+    """Applies `fn` to each of `tensors`, in one call for the tensors of the same shape, dtype and device.
+
+    The tensors of a group are concatenated along their first (batch) dimension, and the output of `fn` is
+    split back in the same way, so `fn` must process the samples of a batch independently, e.g. a vision
+    encoder applied to the images of several cameras.
+    """
+    outputs: list[torch.Tensor | None] = [None] * len(tensors)
+    groups: dict[tuple, list[int]] = {}
+    for i, tensor in enumerate(tensors):
+        groups.setdefault((tuple(tensor.shape), tensor.dtype, tensor.device), []).append(i)
+
+    for indices in groups.values():
+        if len(indices) == 1:
+            outputs[indices[0]] = fn(tensors[indices[0]])
+            continue
+        stacked_outputs = fn(torch.cat([tensors[i] for i in indices]))
+        for i, output in zip(indices, stacked_outputs.split(tensors[indices[0]].shape[0]), strict=True):
+            outputs[i] = output
+    return outputs
+
+
+class FlowMatchingSampler:
+    """Euler integration of a flow-matching velocity field, from t=1 (noise) to t=0 (actions).
+
+    `denoise_step(*args, x_t, timestep, **kwargs)` returns the velocity at `x_t`. The loop runs a fixed number
+    of steps over timesteps precomputed once per (`num_steps`, device), without synchronizing with the device
+    to evaluate a stopping condition. The timesteps are accumulated in float32 as the reference
+    `while` loop does, for the results to match it exactly.
+
+    With `compile=True`, the denoise step is compiled with `torch.compile` (by default in "reduce-overhead"
+    mode, which captures it in a CUDA graph) and `x_t` is updated in place in a static buffer. The first
+    compiled sampling is checked against the eager loop on the same noise: on a mismatch beyond `atol`/`rtol`,
+    a warning is logged and the eager loop is used from then on.
+
+    Args:
+        denoise_step: The denoise step of the policy.
+        compile: Whether to run the compiled denoise step.
+        compile_mode: The `torch.compile` mode.
+        check_parity: Whether to check the first compiled sampling against the eager loop.
+        atol: Absolute tolerance of the parity check.
+        rtol: Relative tolerance of the parity check.
+    """
+
+    def __init__(
+        self,
+        denoise_step,
+        compile: bool = False,
+        compile_mode: str = "reduce-overhead",
+        check_parity: bool = True,
+        atol: float = 1e-3,
+        rtol: float = 1e-3,
+    ):
+        self.denoise_step = denoise_step
+        self.compiled_denoise_step = (
+            torch.compile(denoise_step, mode=compile_mode, dynamic=False) if compile else None
+        )
+        self.check_parity = check_parity
+        self.atol = atol
+        self.rtol = rtol
+        self._timesteps: dict[tuple[int, torch.device], torch.Tensor] = {}
+
+    def timesteps(self, num_steps: int, device: torch.device) -> torch.Tensor:
+        """The `num_steps` timesteps of the integration, on `device`."""
+        key = (num_steps, device)
+        if key not in self._timesteps:
+            dt = torch.tensor(-1.0 / num_steps, dtype=torch.float32)
+            time = torch.tensor(1.0, dtype=torch.float32)
+            timesteps = []
+            while time >= -dt / 2:
+                timesteps.append(time.clone())
+                time += dt
+            self._timesteps[key] = torch.stack(timesteps).to(device)
+        return self._timesteps[key]
+
+    def sample(self, noise: torch.Tensor, num_steps: int, *args, **kwargs) -> torch.Tensor:
+        """Integrates the velocity field from `noise`, passing `args` and `kwargs` to the denoise step."""
+        if self.compiled_denoise_step is None:
+            return self._sample_eager(noise, num_steps, *args, **kwargs)
+
+        x_t = self._sample_compiled(noise, num_steps, *args, **kwargs)
+        if self.check_parity:
+            self.check_parity = False
+            x_t_eager = self._sample_eager(noise, num_steps, *args, **kwargs)
+            if not torch.allclose(x_t, x_t_eager, atol=self.atol, rtol=self.rtol):
+                max_error = (x_t - x_t_eager).abs().max().item()
+                logging.warning(
+                    f"Compiled denoising loop differs from the eager one (max abs error {max_error:.2e}), "
+                    "falling back to the eager loop"
+                )
+                self.compiled_denoise_step = None
+                return x_t_eager
+        return x_t
+
+    def _sample_eager(self, noise: torch.Tensor, num_steps: int, *args, **kwargs) -> torch.Tensor:
+        bsize = noise.shape[0]
+        dt = torch.tensor(-1.0 / num_steps, dtype=torch.float32, device=noise.device)
+
+        x_t = noise
+        for time in self.timesteps(num_steps, noise.device):
+            v_t = self.denoise_step(*args, x_t, time.expand(bsize), **kwargs)
+            # Euler step
+            x_t = x_t + dt * v_t
+        return x_t
+
+    def _sample_compiled(self, noise: torch.Tensor, num_steps: int, *args, **kwargs) -> torch.Tensor:
+        bsize = noise.shape[0]
+        dt = torch.tensor(-1.0 / num_steps, dtype=torch.float32, device=noise.device)
+
+        # Static buffer updated in place, the graph inputs keep the same storage across steps
+        x_t = noise.clone()
+        for time in self.timesteps(num_steps, noise.device):
+            if hasattr(torch.compiler, "cudagraph_mark_step_begin"):
+                # The outputs of the previous replay are consumed: the graph may overwrite them
+                torch.compiler.cudagraph_mark_step_begin()
+            v_t = self.compiled_denoise_step(*args, x_t, time.expand(bsize), **kwargs)
+            x_t.add_(dt * v_t)
+        return x_t
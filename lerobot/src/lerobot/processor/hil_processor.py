@@ -15,8 +15,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import math
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass
 from typing import Any, Protocol, TypeVar, runtime_checkable
 
@@ -43,6 +44,11 @@ DISCRETE_PENALTY_KEY = "discrete_penalty"
 TELEOP_ACTION_KEY = "teleop_action"
 
 
+def _is_batched(value: Any) -> bool:
+    """Whether a reward, done or event flag holds one value per environment rather than a scalar"""
+    return isinstance(value, (torch.Tensor, np.ndarray)) and value.ndim >= 1
+
+
 @runtime_checkable
 class HasTeleopEvents(Protocol):
     """
@@ -265,30 +271,48 @@ class TimeLimitProcessorStep(TruncatedProcessorStep):
     """
     Tracks episode steps and enforces a time limit by truncating the episode.
 
+    With batched transitions (one truncated flag per environment), a step counter is kept per environment. As
+    vectorized environments reset their finished episodes automatically, the counters of the environments
+    whose episode ends are restarted.
+
     Attributes:
         max_episode_steps: The maximum number of steps allowed per episode.
-        current_step: The current step count for the active episode.
+        current_step: The current step count for the active episode, a tensor with batched transitions.
     """
 
     max_episode_steps: int
-    current_step: int = 0
+    current_step: int | torch.Tensor = 0
 
-    def truncated(self, truncated: bool) -> bool:
+    def truncated(self, truncated: bool | torch.Tensor) -> bool | torch.Tensor:
         """
         Increments the step counter and sets the truncated flag if the time limit is reached.
 
         Args:
-            truncated: The incoming truncated flag.
+            truncated: The incoming truncated flag, or a tensor of flags for batched transitions.
 
         Returns:
             True if the episode step limit is reached, otherwise the incoming value.
         """
+        if _is_batched(truncated):
+            return self._batched_truncated(torch.as_tensor(truncated, dtype=torch.bool))
+
         self.current_step += 1
         if self.current_step >= self.max_episode_steps:
             truncated = True
         # TODO (steven): missing an else truncated = False?
         return truncated
 
+    def _batched_truncated(self, truncated: torch.Tensor) -> torch.Tensor:
+        if not isinstance(self.current_step, torch.Tensor) or self.current_step.shape != truncated.shape:
+            self.current_step = torch.zeros(truncated.shape, dtype=torch.long, device=truncated.device)
+
+        self.current_step += 1
+        truncated = truncated | (self.current_step >= self.max_episode_steps)
+
+        done = torch.as_tensor(self.transition.get(TransitionKey.DONE, False), device=truncated.device)
+        self.current_step[truncated | done.bool()] = 0
+        return truncated
+
     def get_config(self) -> dict[str, Any]:
         """
         Returns the configuration of the step for serialization.
@@ -348,19 +372,23 @@ class GripperPenaltyProcessorStep(ComplementaryDataProcessorStep):
         if current_gripper_pos is None:
             return complementary_data
 
-        # Gripper action is a PolicyAction at this stage
-        gripper_action = action[-1].item()
+        # Gripper action is a PolicyAction at this stage, of shape (action_dim,) or (batch_size, action_dim)
+        gripper_action = action[..., -1].detach().cpu().float()
         gripper_action_normalized = gripper_action / self.max_gripper_pos
 
         # Normalize gripper state and action
-        gripper_state_normalized = current_gripper_pos / self.max_gripper_pos
+        gripper_state_normalized = (
+            torch.as_tensor(current_gripper_pos, dtype=torch.float32) / self.max_gripper_pos
+        )
 
         # Calculate penalty boolean as in original
-        gripper_penalty_bool = (gripper_state_normalized < 0.5 and gripper_action_normalized > 0.5) or (
-            gripper_state_normalized > 0.75 and gripper_action_normalized < 0.5
+        gripper_penalty_bool = ((gripper_state_normalized < 0.5) & (gripper_action_normalized > 0.5)) | (
+            (gripper_state_normalized > 0.75) & (gripper_action_normalized < 0.5)
         )
 
-        gripper_penalty = self.penalty * int(gripper_penalty_bool)
+        gripper_penalty = self.penalty * gripper_penalty_bool.float()
+        if gripper_penalty.ndim == 0:
+            gripper_penalty = gripper_penalty.item()
 
         # Create new complementary data with penalty info
         new_complementary_data = dict(complementary_data)
@@ -400,6 +428,9 @@ class InterventionActionProcessorStep(ProcessorStep):
     this step replaces the policy's action with the human's teleoperated action.
     It also processes signals to terminate the episode or flag success.
 
+    Batched transitions carry one event flag per environment (tensors or arrays of shape (batch_size,)) and a
+    (batch_size, action_dim) action, the teleoperated action then being an array or tensor of the same shape.
+
     Attributes:
         use_gripper: Whether to include the gripper in the teleoperated action.
         terminate_on_success: If True, automatically sets the `done` flag when a
@@ -433,6 +464,9 @@ class InterventionActionProcessorStep(ProcessorStep):
         success = info.get(TeleopEvents.SUCCESS, False)
         rerecord_episode = info.get(TeleopEvents.RERECORD_EPISODE, False)
 
+        if any(_is_batched(event) for event in (is_intervention, terminate_episode, success)):
+            return self._process_batched(transition, action, teleop_action, info)
+
         new_transition = transition.copy()
 
         # Override action if intervention is active
@@ -474,6 +508,49 @@ class InterventionActionProcessorStep(ProcessorStep):
 
         return new_transition
 
+    def _process_batched(
+        self, transition: EnvTransition, action: PolicyAction, teleop_action: Any, info: dict
+    ) -> EnvTransition:
+        """Processes a batched transition, with one event flag per environment"""
+        batch_size = action.shape[0]
+
+        def flags(key: str) -> torch.Tensor:
+            value = torch.as_tensor(info.get(key, False), dtype=torch.bool, device=action.device)
+            return value.expand(batch_size)
+
+        is_intervention = flags(TeleopEvents.IS_INTERVENTION)
+        terminate_episode = flags(TeleopEvents.TERMINATE_EPISODE)
+        success = flags(TeleopEvents.SUCCESS)
+
+        new_transition = transition.copy()
+
+        # Override the actions of the environments under intervention
+        if teleop_action is not None and not isinstance(teleop_action, dict) and is_intervention.any():
+            teleop_action_tensor = torch.as_tensor(teleop_action, dtype=action.dtype, device=action.device)
+            action = torch.where(
+                is_intervention.unsqueeze(-1), teleop_action_tensor.reshape(action.shape), action
+            )
+            new_transition[TransitionKey.ACTION] = action
+
+        # Handle episode termination
+        done = terminate_episode | success if self.terminate_on_success else terminate_episode
+        new_transition[TransitionKey.DONE] = done
+        new_transition[TransitionKey.REWARD] = success.float()
+
+        # Update info with intervention metadata
+        new_info = dict(info)
+        new_info[TeleopEvents.IS_INTERVENTION] = is_intervention
+        new_info[TeleopEvents.RERECORD_EPISODE] = flags(TeleopEvents.RERECORD_EPISODE)
+        new_info[TeleopEvents.SUCCESS] = success
+        new_transition[TransitionKey.INFO] = new_info
+
+        # Update complementary data with teleop action
+        complementary_data = dict(new_transition.get(TransitionKey.COMPLEMENTARY_DATA, {}))
+        complementary_data[TELEOP_ACTION_KEY] = new_transition.get(TransitionKey.ACTION)
+        new_transition[TransitionKey.COMPLEMENTARY_DATA] = complementary_data
+
+        return new_transition
+
     def get_config(self) -> dict[str, Any]:
         """
         Returns the configuration of the step for serialization.
@@ -499,7 +576,13 @@ class RewardClassifierProcessorStep(ProcessorStep):
     Applies a pretrained reward classifier to image observations to predict success.
 
     This step uses a model to determine if the current state is successful, updating
-    the reward and potentially terminating the episode.
+    the reward and potentially terminating the episode. Batched observations are classified in a single
+    forward pass, the reward and done flag then holding one value per environment.
+
+    With `async_inference`, the classifier runs on a worker thread so that its latency is off the control
+    loop: each call queues the current frame and returns immediately, the worker classifying the last
+    `history_size` queued frames in one batch. A success predicted for any of these frames is reported at the
+    next call, i.e. the reward lags the frame it was predicted from by the classifier latency.
 
     Attributes:
         pretrained_path: Path to the pretrained reward classifier model.
@@ -507,6 +590,8 @@ class RewardClassifierProcessorStep(ProcessorStep):
         success_threshold: The probability threshold to consider a prediction as successful.
         success_reward: The reward value to assign on success.
         terminate_on_success: If True, terminates the episode upon successful classification.
+        async_inference: If True, runs the classifier on a worker thread instead of the calling thread.
+        history_size: The maximum number of queued frames classified together by the worker.
         reward_classifier: The loaded classifier model instance.
     """
 
@@ -515,11 +600,16 @@ class RewardClassifierProcessorStep(ProcessorStep):
     success_threshold: float = 0.5
     success_reward: float = 1.0
     terminate_on_success: bool = True
+    async_inference: bool = False
+    history_size: int = 1
 
     reward_classifier: Any = None
 
     def __post_init__(self):
         """Initializes the reward classifier model after the dataclass is created."""
+        if self.history_size < 1:
+            raise ValueError(f"history_size must be at least 1, got {self.history_size}")
+
         if self.pretrained_path is not None:
             from lerobot.policies.sac.reward_model.modeling_classifier import Classifier
 
@@ -527,6 +617,20 @@ class RewardClassifierProcessorStep(ProcessorStep):
             self.reward_classifier.to(self.device)
             self.reward_classifier.eval()
 
+        # State shared with the worker thread, guarded by `_condition`
+        self._condition = threading.Condition()
+        self._pending_frames: deque[dict[str, torch.Tensor]] = deque(maxlen=self.history_size)
+        self._pending_success: torch.Tensor | None = None
+        self._classifier_frequency: float | None = None
+        # Incremented on reset so that predictions made for a previous episode are dropped
+        self._episode_index = 0
+        self._closed = False
+        self._worker: threading.Thread | None = None
+
+        if self.async_inference and self.reward_classifier is not None:
+            self._worker = threading.Thread(target=self._classify_worker, daemon=True)
+            self._worker.start()
+
     def __call__(self, transition: EnvTransition) -> EnvTransition:
         """
         Processes a transition, applying the reward classifier to its image observations.
@@ -549,18 +653,30 @@ class RewardClassifierProcessorStep(ProcessorStep):
         if not images:
             return new_transition
 
-        # Run reward classifier
-        start_time = time.perf_counter()
-        with torch.inference_mode():
-            success = self.reward_classifier.predict_reward(images, threshold=self.success_threshold)
+        if self.async_inference:
+            success, classifier_frequency = self._submit(images)
+            if success is None:
+                return new_transition
+        else:
+            # Run reward classifier
+            start_time = time.perf_counter()
+            with torch.inference_mode():
+                success = self.reward_classifier.predict_reward(images, threshold=self.success_threshold)
 
-        classifier_frequency = 1 / (time.perf_counter() - start_time)
+            classifier_frequency = 1 / (time.perf_counter() - start_time)
 
         # Calculate reward and termination
         reward = new_transition.get(TransitionKey.REWARD, 0.0)
         terminated = new_transition.get(TransitionKey.DONE, False)
+        is_success = torch.isclose(success.float().cpu(), torch.tensor(1.0), atol=1e-2)
 
-        if math.isclose(success, 1, abs_tol=1e-2):
+        if _is_batched(reward) or _is_batched(terminated) or is_success.numel() > 1:
+            reward = torch.where(
+                is_success, self.success_reward, torch.as_tensor(reward, dtype=torch.float32)
+            )
+            if self.terminate_on_success:
+                terminated = torch.as_tensor(terminated, dtype=torch.bool) | is_success
+        elif is_success.item():
             reward = self.success_reward
             if self.terminate_on_success:
                 terminated = True
@@ -571,11 +687,63 @@ class RewardClassifierProcessorStep(ProcessorStep):
 
         # Update info with classifier frequency
         info = new_transition.get(TransitionKey.INFO, {})
-        info["reward_classifier_frequency"] = classifier_frequency
+        if classifier_frequency is not None:
+            info["reward_classifier_frequency"] = classifier_frequency
         new_transition[TransitionKey.INFO] = info
 
         return new_transition
 
+    def _submit(self, images: dict[str, torch.Tensor]) -> tuple[torch.Tensor | None, float | None]:
+        """
+        Queues a frame for the worker and collects the predictions made since the previous call.
+
+        Returns:
+            The predicted success flags (one per environment), or None if no prediction completed since the
+            previous call, and the frequency of the last classifier forward pass.
+        """
+        # Copy the images, the observation tensors may be modified in place by later steps
+        frame = {key: value.detach().clone() for key, value in images.items()}
+        with self._condition:
+            self._pending_frames.append(frame)
+            self._condition.notify()
+
+            success = self._pending_success
+            self._pending_success = None
+            return success, self._classifier_frequency
+
+    def _classify_worker(self) -> None:
+        """Classifies the queued frames in batches, until the step is closed."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: len(self._pending_frames) > 0 or self._closed)
+                if self._closed:
+                    return
+                frames = list(self._pending_frames)
+                self._pending_frames.clear()
+                episode_index = self._episode_index
+
+            # Stack the frames along the batch dimension: (num_frames * batch_size, C, H, W)
+            batch = {
+                key: torch.cat([frame[key] for frame in frames]).to(self.device, non_blocking=True)
+                for key in frames[0]
+            }
+
+            start_time = time.perf_counter()
+            with torch.inference_mode():
+                success = self.reward_classifier.predict_reward(batch, threshold=self.success_threshold)
+            classifier_frequency = 1 / (time.perf_counter() - start_time)
+
+            # A success in any of the frames counts for its environment
+            success = success.float().cpu().reshape(len(frames), -1).amax(dim=0)
+
+            with self._condition:
+                if episode_index != self._episode_index:
+                    continue
+                if self._pending_success is not None:
+                    success = torch.maximum(self._pending_success, success)
+                self._pending_success = success
+                self._classifier_frequency = classifier_frequency
+
     def get_config(self) -> dict[str, Any]:
         """
         Returns the configuration of the step for serialization.
@@ -588,8 +756,26 @@ class RewardClassifierProcessorStep(ProcessorStep):
             "success_threshold": self.success_threshold,
             "success_reward": self.success_reward,
             "terminate_on_success": self.terminate_on_success,
+            "async_inference": self.async_inference,
+            "history_size": self.history_size,
         }
 
+    def reset(self) -> None:
+        """Drops the queued frames and the predictions not yet reported, at the start of a new episode."""
+        with self._condition:
+            self._pending_frames.clear()
+            self._pending_success = None
+            self._episode_index += 1
+
+    def close(self) -> None:
+        """Stops the worker thread of `async_inference`, after the classification it is running if any."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
     def transform_features(
         self, features: dict[PipelineFeatureType, dict[str, PolicyFeature]]
     ) -> dict[PipelineFeatureType, dict[str, PolicyFeature]]:
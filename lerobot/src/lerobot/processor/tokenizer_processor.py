@@ -23,6 +23,7 @@ token IDs and attention masks, which are then added to the observation dictionar
 
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
@@ -52,6 +53,9 @@ class TokenizerProcessorStep(ObservationProcessorStep):
     tokenizes it using a Hugging Face `transformers` tokenizer, and adds the resulting
     token IDs and attention mask to the `observation` dictionary.
 
+    The tokenized tasks are cached, per task list and device: during a rollout the task does not change, so
+    only the first call of an episode runs the tokenizer and copies the tokens to the device.
+
     Requires the `transformers` library to be installed.
 
     Attributes:
@@ -62,6 +66,7 @@ class TokenizerProcessorStep(ObservationProcessorStep):
         padding_side: The side to pad on ('left' or 'right').
         padding: The padding strategy ('max_length', 'longest', etc.).
         truncation: Whether to truncate sequences longer than `max_length`.
+        cache_size: The maximum number of tokenized task lists kept in the cache. 0 disables the cache.
         input_tokenizer: The internal tokenizer instance, loaded during initialization.
     """
 
@@ -72,9 +77,12 @@ class TokenizerProcessorStep(ObservationProcessorStep):
     padding_side: str = "right"
     padding: str = "max_length"
     truncation: bool = True
+    cache_size: int = 128
 
     # Internal tokenizer instance (not part of the config)
     input_tokenizer: Any = field(default=None, init=False, repr=False)
+    # Tokenized tasks by (tasks, device), least recently used first
+    _tokens_cache: OrderedDict = field(default_factory=OrderedDict, init=False, repr=False)
 
     def __post_init__(self):
         """
@@ -149,18 +157,28 @@ class TokenizerProcessorStep(ObservationProcessorStep):
         if task is None:
             raise ValueError("Task cannot be None")
 
-        # Tokenize the task (this will create CPU tensors)
-        tokenized_prompt = self._tokenize_text(task)
-
         # Detect the device from existing tensors in the transition to ensure consistency
         target_device = self._detect_device(self.transition)
 
-        # Move new tokenized tensors to the detected device
-        if target_device is not None:
-            tokenized_prompt = {
-                k: v.to(target_device) if isinstance(v, torch.Tensor) else v
-                for k, v in tokenized_prompt.items()
-            }
+        cache_key = (tuple(task), target_device)
+        tokenized_prompt = self._tokens_cache.get(cache_key)
+        if tokenized_prompt is not None:
+            self._tokens_cache.move_to_end(cache_key)
+        else:
+            # Tokenize the task (this will create CPU tensors)
+            tokenized_prompt = self._tokenize_text(task)
+
+            # Move new tokenized tensors to the detected device
+            if target_device is not None:
+                tokenized_prompt = {
+                    k: v.to(target_device) if isinstance(v, torch.Tensor) else v
+                    for k, v in tokenized_prompt.items()
+                }
+
+            if self.cache_size > 0:
+                self._tokens_cache[cache_key] = tokenized_prompt
+                if len(self._tokens_cache) > self.cache_size:
+                    self._tokens_cache.popitem(last=False)
 
         # Create a new observation dict to avoid modifying the original in place
         new_observation = dict(observation)
@@ -232,6 +250,7 @@ class TokenizerProcessorStep(ObservationProcessorStep):
             "padding_side": self.padding_side,
             "padding": self.padding,
             "truncation": self.truncation,
+            "cache_size": self.cache_size,
         }
 
         # Only save tokenizer_name if it was used to create the tokenizer
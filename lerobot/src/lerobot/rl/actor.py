@@ -50,7 +50,7 @@ import logging
 import os
 import time
 from functools import lru_cache
-from queue import Empty
+from queue import Empty, Full
 
 import grpc
 import torch
@@ -63,25 +63,24 @@ from lerobot.configs.train import TrainRLServerPipelineConfig
 from lerobot.policies.factory import make_policy
 from lerobot.policies.sac.modeling_sac import SACPolicy
 from lerobot.processor import TransitionKey
+from lerobot.rl.parameter_sync import ParameterSyncDecoder, get_last_parameter_updates
 from lerobot.rl.process import ProcessSignalHandler
-from lerobot.rl.queue import get_last_item_from_queue
 from lerobot.robots import so100_follower  # noqa: F401
 from lerobot.teleoperators import gamepad, so101_leader  # noqa: F401
 from lerobot.teleoperators.utils import TeleopEvents
 from lerobot.transport import services_pb2, services_pb2_grpc
+from lerobot.transport.shared_memory import SharedMemoryMessageQueue
 from lerobot.transport.utils import (
-    bytes_to_state_dict,
     grpc_channel_options,
     python_object_to_bytes,
     receive_bytes_in_chunks,
     send_bytes_in_chunks,
-    transitions_to_bytes,
+    transitions_to_batch_bytes,
 )
 from lerobot.utils.random_utils import set_seed
 from lerobot.utils.robot_utils import busy_wait
 from lerobot.utils.transition import (
     Transition,
-    move_state_dict_to_device,
     move_transition_to_device,
 )
 from lerobot.utils.utils import (
@@ -91,9 +90,11 @@ from lerobot.utils.utils import (
 )
 
 from .gym_manipulator import (
+    close_processors,
     create_transition,
     make_processors,
     make_robot_env,
+    make_vector_robot_env,
     step_env_and_process_transition,
 )
 
@@ -140,7 +141,7 @@ def actor_cli(cfg: TrainRLServerPipelineConfig):
     logging.info("[ACTOR] Connection with Learner established")
 
     parameters_queue = Queue()
-    transitions_queue = Queue()
+    transitions_queue = make_transitions_queue(cfg)
     interactions_queue = Queue()
 
     concurrency_entity = None
@@ -185,12 +186,13 @@ def actor_cli(cfg: TrainRLServerPipelineConfig):
     logging.info("[ACTOR] Policy process joined")
 
     logging.info("[ACTOR] Closing queues")
-    transitions_queue.close()
     interactions_queue.close()
     parameters_queue.close()
 
     transitions_process.join()
     logging.info("[ACTOR] Transitions process joined")
+    # Closed once its consumer stopped: the shared-memory transport unmaps its slots on close
+    transitions_queue.close()
     interactions_process.join()
     logging.info("[ACTOR] Interactions process joined")
     receive_policy_process.join()
@@ -235,6 +237,16 @@ def act_with_policy(
         init_logging(log_file=log_file, display_pid=True)
         logging.info("Actor policy process logging initialized")
 
+    if cfg.env.num_envs > 1:
+        act_with_policy_in_vector_env(
+            cfg=cfg,
+            shutdown_event=shutdown_event,
+            parameters_queue=parameters_queue,
+            transitions_queue=transitions_queue,
+            interactions_queue=interactions_queue,
+        )
+        return
+
     logging.info("make_env online")
 
     online_env, teleop_device = make_robot_env(cfg=cfg.env)
@@ -257,6 +269,7 @@ def act_with_policy(
     )
     policy = policy.eval()
     assert isinstance(policy, nn.Module)
+    parameter_sync = ParameterSyncDecoder()
 
     obs, info = online_env.reset()
     env_processor.reset()
@@ -280,6 +293,7 @@ def act_with_policy(
         start_time = time.perf_counter()
         if shutdown_event.is_set():
             logging.info("[ACTOR] Shutting down act_with_policy")
+            close_processors(env_processor, action_processor)
             return
 
         observation = {
@@ -351,12 +365,16 @@ def act_with_policy(
         if done or truncated:
             logging.info(f"[ACTOR] Global step {interaction_step}: Episode reward: {sum_reward_episode}")
 
-            update_policy_parameters(policy=policy, parameters_queue=parameters_queue, device=device)
+            update_policy_parameters(
+                policy=policy, parameters_queue=parameters_queue, device=device, parameter_sync=parameter_sync
+            )
 
             if len(list_transition_to_send_to_learner) > 0:
                 push_transitions_to_transport_queue(
                     transitions=list_transition_to_send_to_learner,
                     transitions_queue=transitions_queue,
+                    compression=cfg.policy.actor_learner_config.transition_compression,
+                    shutdown_event=shutdown_event,
                 )
                 list_transition_to_send_to_learner = []
 
@@ -400,6 +418,189 @@ def act_with_policy(
             dt_time = time.perf_counter() - start_time
             busy_wait(1 / cfg.env.fps - dt_time)
 
+    close_processors(env_processor, action_processor)
+
+
+def act_with_policy_in_vector_env(
+    cfg: TrainRLServerPipelineConfig,
+    shutdown_event: any,  # Event,
+    parameters_queue: Queue,
+    transitions_queue: Queue,
+    interactions_queue: Queue,
+):
+    """
+    Executes policy interaction within `cfg.env.num_envs` simulation environments stepped in parallel.
+
+    The observations of all the environments are processed and fed to the policy as one batch. The transitions of
+    each environment are kept contiguous per episode, as the replay buffer expects, and the episodes that end
+    at the same step are sent to the learner in one batched message. Human interventions are not supported.
+
+    Args:
+        cfg: Configuration settings for the interaction process.
+        shutdown_event: Event to check if the process should shutdown.
+        parameters_queue: Queue to receive updated network parameters from the learner.
+        transitions_queue: Queue to send transitions to the learner.
+        interactions_queue: Queue to send interactions to the learner.
+    """
+    logging.info(f"make_env online: {cfg.env.num_envs} environments")
+
+    online_env = make_vector_robot_env(cfg=cfg.env)
+    env_processor, action_processor = make_processors(online_env, None, cfg.env, cfg.policy.device)
+    num_envs = online_env.num_envs
+
+    set_seed(cfg.seed)
+    device = get_safe_torch_device(cfg.policy.device, log=True)
+
+    torch.backends.cudnn.benchmark = True
+    torch.backends.cuda.matmul.allow_tf32 = True
+
+    logging.info("make_policy")
+
+    policy: SACPolicy = make_policy(
+        cfg=cfg.policy,
+        env_cfg=cfg.env,
+    )
+    policy = policy.eval()
+    assert isinstance(policy, nn.Module)
+    parameter_sync = ParameterSyncDecoder()
+
+    obs, _ = online_env.reset(seed=cfg.seed)
+    env_processor.reset()
+    action_processor.reset()
+    transition = env_processor(create_transition(observation=obs))
+
+    sum_reward_episode = [0.0] * num_envs
+    # Transitions of the ongoing episode of each environment
+    episode_transitions: list[list[Transition]] = [[] for _ in range(num_envs)]
+
+    policy_timer = TimerManager("Policy inference", log=False)
+
+    for interaction_step in range(0, cfg.policy.online_steps, num_envs):
+        start_time = time.perf_counter()
+        if shutdown_event.is_set():
+            logging.info("[ACTOR] Shutting down act_with_policy_in_vector_env")
+            close_processors(env_processor, action_processor)
+            online_env.close()
+            return
+
+        observation = {
+            k: v for k, v in transition[TransitionKey.OBSERVATION].items() if k in cfg.policy.input_features
+        }
+
+        with policy_timer:
+            action = policy.select_action(batch=observation)
+        policy_fps = policy_timer.fps_last
+
+        log_policy_frequency_issue(policy_fps=policy_fps, cfg=cfg, interaction_step=interaction_step)
+
+        env_action = action_processor(create_transition(action=action))[TransitionKey.ACTION]
+        obs, reward, terminated, truncated, info = online_env.step(env_action)
+        episode_ends = terminated | truncated
+
+        # Finished environments are already reset, their next observations are in `info["final_obs"]`
+        if episode_ends.any():
+            next_transition = env_processor(
+                create_transition(observation=replace_final_observations(obs, info))
+            )
+            # Continue from the first observations of the new episodes
+            transition = env_processor(create_transition(observation=obs))
+        else:
+            next_transition = env_processor(create_transition(observation=obs))
+            transition = next_transition
+
+        next_observation = {
+            k: v
+            for k, v in next_transition[TransitionKey.OBSERVATION].items()
+            if k in cfg.policy.input_features
+        }
+
+        # Split the batch per environment, on cpu to avoid a device transfer per environment
+        observation = {k: v.cpu() for k, v in observation.items()}
+        next_observation = {k: v.cpu() for k, v in next_observation.items()}
+        action = action.cpu()
+        for i in range(num_envs):
+            sum_reward_episode[i] += float(reward[i])
+            episode_transitions[i].append(
+                Transition(
+                    state={k: v[i : i + 1] for k, v in observation.items()},
+                    action=action[i : i + 1],
+                    reward=float(reward[i]),
+                    next_state={k: v[i : i + 1] for k, v in next_observation.items()},
+                    done=bool(terminated[i]),
+                    truncated=bool(truncated[i]),
+                    complementary_info={"discrete_penalty": torch.tensor([0.0])},
+                )
+            )
+
+        if episode_ends.any():
+            finished_envs = episode_ends.nonzero()[0].tolist()
+            update_policy_parameters(
+                policy=policy, parameters_queue=parameters_queue, device=device, parameter_sync=parameter_sync
+            )
+
+            # The episodes stay contiguous in the batch
+            push_transitions_to_transport_queue(
+                transitions=[tr for i in finished_envs for tr in episode_transitions[i]],
+                transitions_queue=transitions_queue,
+                compression=cfg.policy.actor_learner_config.transition_compression,
+                shutdown_event=shutdown_event,
+            )
+
+            stats = get_frequency_stats(policy_timer)
+            policy_timer.reset()
+
+            for i in finished_envs:
+                logging.info(
+                    f"[ACTOR] Global step {interaction_step}: Episode reward of env {i}: {sum_reward_episode[i]}"
+                )
+                interactions_queue.put(
+                    python_object_to_bytes(
+                        {
+                            "Episodic reward": sum_reward_episode[i],
+                            "Interaction step": interaction_step,
+                            "Episode intervention": 0,
+                            "Intervention rate": 0.0,
+                            **stats,
+                        }
+                    )
+                )
+                sum_reward_episode[i] = 0.0
+                episode_transitions[i] = []
+
+        if cfg.env.fps is not None:
+            dt_time = time.perf_counter() - start_time
+            busy_wait(1 / cfg.env.fps - dt_time)
+
+    close_processors(env_processor, action_processor)
+    online_env.close()
+
+
+def replace_final_observations(observation: dict, info: dict) -> dict:
+    """Replaces the observations of the environments reset by a vectorized environment with their final ones.
+
+    Args:
+        observation: Batched (possibly nested) observation dict returned by `step`.
+        info: Info dict returned by `step`, with the final observations in `info["final_obs"]`.
+
+    Returns:
+        A copy of `observation` holding the final observations of the finished environments.
+    """
+    final_indices = info["_final_obs"].nonzero()[0]
+
+    def replace(batched, key_path):
+        if isinstance(batched, dict):
+            return {key: replace(value, (*key_path, key)) for key, value in batched.items()}
+
+        batched = batched.copy()
+        for i in final_indices:
+            final = info["final_obs"][i]
+            for key in key_path:
+                final = final[key]
+            batched[i] = final
+        return batched
+
+    return replace(observation, ())
+
 
 #  Communication Functions - Group all gRPC/messaging functions
 
@@ -554,6 +755,7 @@ def send_transitions(
 
     if not use_threads(cfg):
         grpc_channel.close()
+        transitions_queue.close()
     logging.info("[ACTOR] Transitions process stopped")
 
 
@@ -649,45 +851,57 @@ def interactions_stream(
 #  Policy functions
 
 
-def update_policy_parameters(policy: SACPolicy, parameters_queue: Queue, device):
-    bytes_state_dict = get_last_item_from_queue(parameters_queue, block=False)
-    if bytes_state_dict is not None:
+def update_policy_parameters(
+    policy: SACPolicy, parameters_queue: Queue, device, parameter_sync: ParameterSyncDecoder | None = None
+):
+    # The last keyframe is kept along with the most recent push, which may be a delta based on it
+    bytes_state_dicts = get_last_parameter_updates(parameters_queue, block=False)
+    if bytes_state_dicts:
         logging.info("[ACTOR] Load new parameters from Learner.")
-        state_dicts = bytes_to_state_dict(bytes_state_dict)
 
         # TODO: check encoder parameter synchronization possible issues:
         # 1. When shared_encoder=True, we're loading stale encoder params from actor's state_dict
         #    instead of the updated encoder params from critic (which is optimized separately)
         # 2. When freeze_vision_encoder=True, we waste bandwidth sending/loading frozen params
+        #    (only in "full" parameter sync mode, "delta" mode skips unchanged tensors)
         # 3. Need to handle encoder params correctly for both actor and discrete_critic
         # Potential fixes:
         # - Send critic's encoder state when shared_encoder=True
         # - Skip encoder params entirely when freeze_vision_encoder=True
         # - Ensure discrete_critic gets correct encoder state (currently uses encoder_critic)
 
-        # Load actor state dict
-        actor_state_dict = move_state_dict_to_device(state_dicts["policy"], device=device)
-        policy.actor.load_state_dict(actor_state_dict)
+        modules = {"policy": policy.actor}
+        if hasattr(policy, "discrete_critic") and policy.discrete_critic is not None:
+            modules["discrete_critic"] = policy.discrete_critic
 
-        # Load discrete critic if present
-        if hasattr(policy, "discrete_critic") and "discrete_critic" in state_dicts:
-            discrete_critic_state_dict = move_state_dict_to_device(
-                state_dicts["discrete_critic"], device=device
-            )
-            policy.discrete_critic.load_state_dict(discrete_critic_state_dict)
-            logging.info("[ACTOR] Loaded discrete critic parameters from Learner.")
+        if parameter_sync is None:
+            parameter_sync = ParameterSyncDecoder()
+
+        # Parameters are copied in place into the existing tensors on `device`, without reallocating them
+        for bytes_state_dict in bytes_state_dicts:
+            if parameter_sync.apply(bytes_state_dict, modules):
+                logging.info(f"[ACTOR] Loaded parameters v{parameter_sync.version} from Learner.")
 
 
 #  Utilities functions
 
 
-def push_transitions_to_transport_queue(transitions: list, transitions_queue):
-    """Send transitions to learner in smaller chunks to avoid network issues.
+def push_transitions_to_transport_queue(
+    transitions: list,
+    transitions_queue,
+    compression: str | None = None,
+    shutdown_event: any = None,  # Event
+):
+    """Send transitions to learner as a single columnar batch.
+
+    A bounded queue (the "shared_memory" transport) may be full while the sender is stalled: the batch is then
+    retried until it fits, or dropped once `shutdown_event` is set.
 
     Args:
         transitions: List of transitions to send
-        message_queue: Queue to send messages to learner
-        chunk_size: Size of each chunk to send
+        transitions_queue: Queue to send messages to learner
+        compression: Compression of the batch: None, "lz4" or "zstd"
+        shutdown_event: Event to check if the process should shutdown
     """
     transition_to_send_to_learner = []
     for transition in transitions:
@@ -698,7 +912,18 @@ def push_transitions_to_transport_queue(transitions: list, transitions_queue):
 
         transition_to_send_to_learner.append(tr)
 
-    transitions_queue.put(transitions_to_bytes(transition_to_send_to_learner))
+    message = transitions_to_batch_bytes(transition_to_send_to_learner, compression=compression)
+    while True:
+        try:
+            transitions_queue.put(message, timeout=1.0)
+            return
+        except Full:
+            if shutdown_event is not None and shutdown_event.is_set():
+                logging.warning(
+                    f"[ACTOR] Dropping {len(transitions)} transitions, the transitions queue is full"
+                )
+                return
+            logging.warning("[ACTOR] The transitions queue is full, waiting for the transitions sender")
 
 
 def get_frequency_stats(timer: TimerManager) -> dict[str, float]:
@@ -730,6 +955,29 @@ def log_policy_frequency_issue(policy_fps: float, cfg: TrainRLServerPipelineConf
         )
 
 
+def make_transitions_queue(cfg: TrainRLServerPipelineConfig) -> Queue | SharedMemoryMessageQueue:
+    """Create the queue carrying the transition batches from the control loop to the transitions sender.
+
+    Args:
+        cfg: Training configuration, `cfg.policy.actor_learner_config.transitions_transport` selects the queue.
+
+    Returns:
+        A `torch.multiprocessing.Queue` ("queue"), or a `SharedMemoryMessageQueue` ("shared_memory").
+    """
+    actor_learner_config = cfg.policy.actor_learner_config
+    if actor_learner_config.transitions_transport == "queue":
+        return Queue()
+    if actor_learner_config.transitions_transport == "shared_memory":
+        return SharedMemoryMessageQueue(
+            num_slots=actor_learner_config.transitions_ring_slots,
+            slot_nbytes=actor_learner_config.transitions_ring_slot_size,
+        )
+    raise ValueError(
+        f"Unknown transitions transport '{actor_learner_config.transitions_transport}', "
+        "expected 'queue' or 'shared_memory'"
+    )
+
+
 def use_threads(cfg: TrainRLServerPipelineConfig) -> bool:
     return cfg.policy.concurrency.actor == "threads"
 
@@ -15,18 +15,29 @@
 # limitations under the License.
 
 import functools
+import json
+import os
+import threading
 from collections.abc import Callable, Sequence
 from contextlib import suppress
+from pathlib import Path
 from typing import TypedDict
 
+import numpy as np
 import torch
 import torch.nn.functional as F  # noqa: N812
 from tqdm import tqdm
 
 from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.online_buffer import make_memmap_safe
+from lerobot.rl.sum_tree import SumTree
 from lerobot.utils.constants import ACTION, DONE, OBS_IMAGE, REWARD
 from lerobot.utils.transition import Transition
 
+# Files of a disk-backed replay buffer, next to the memmaps
+REPLAY_BUFFER_HEADER = "header.json"
+REPLAY_BUFFER_EXTRA_STATE = "extra_state.pt"
+
 
 class BatchTransition(TypedDict):
     state: dict[str, torch.Tensor]
@@ -36,6 +47,12 @@ class BatchTransition(TypedDict):
     done: torch.Tensor
     truncated: torch.Tensor
     complementary_info: dict[str, torch.Tensor | float | int] | None = None
+    # Only with prioritized replay: storage indices of the transitions and importance-sampling weights
+    index: torch.Tensor
+    weight: torch.Tensor
+    # Only with a feature encoder: cached features of the encoded state keys
+    observation_feature: dict[str, torch.Tensor]
+    next_observation_feature: dict[str, torch.Tensor]
 
 
 def random_crop_vectorized(images: torch.Tensor, output_size: tuple) -> torch.Tensor:
@@ -87,6 +104,12 @@ class ReplayBuffer:
         use_drq: bool = True,
         storage_device: str = "cpu",
         optimize_memory: bool = False,
+        store_images_as_uint8: bool = False,
+        prioritized: bool = False,
+        priority_alpha: float = 0.6,
+        priority_beta: float = 0.4,
+        priority_eps: float = 1e-6,
+        storage_dir: str | Path | None = None,
     ):
         """
         Replay buffer for storing transitions.
@@ -104,6 +127,22 @@ class ReplayBuffer:
                 Using "cpu" can help save GPU memory.
             optimize_memory (bool): If True, optimizes memory by not storing duplicate next_states when
                 they can be derived from states. This is useful for large datasets where next_state[i] = state[i+1].
+                The next_states of the last transition of each episode (done or truncated) are still stored,
+                in a small separate storage.
+            store_images_as_uint8 (bool): If True, images (keys starting with `observation.image`, in [0, 1]) are
+                stored as uint8, 4x smaller than float32. They are converted back to float on the sampled batch,
+                once on `device`. Storing images outside of [0, 1] raises a ValueError.
+            prioritized (bool): If True, transitions are sampled proportionally to their priority (the TD-error
+                reported with `update_priorities`, to the power `priority_alpha`) with a sum-tree, and the
+                batches include the importance-sampling weights (`weight`, with exponent `priority_beta`) and
+                the storage indices (`index`). New transitions get the maximum priority seen so far.
+            priority_alpha (float): Exponent applied to the priorities (0 is uniform sampling).
+            priority_beta (float): Exponent of the importance-sampling weights, can be updated during training.
+            priority_eps (float): Added to the absolute TD-errors, so that no transition has a zero priority.
+            storage_dir (str | Path | None): If given, the storage tensors are memory-mapped files in this
+                directory (one per key, see `datasets/online_buffer.py`) instead of living in RAM, so that the
+                buffer can exceed the RAM. Call `flush` to persist the buffer state (ring position, size, ...)
+                in a small header: a buffer created later with the same `storage_dir` resumes from it instantly.
         """
         if capacity <= 0:
             raise ValueError("Capacity must be greater than 0.")
@@ -115,9 +154,45 @@ class ReplayBuffer:
         self.size = 0
         self.initialized = False
         self.optimize_memory = optimize_memory
+        self.store_images_as_uint8 = store_images_as_uint8
+
+        self.storage_dir = Path(storage_dir) if storage_dir is not None else None
+        self._memmaps: dict[str, np.memmap] = {}
+        if self.storage_dir is not None:
+            if torch.device(storage_device).type != "cpu":
+                raise ValueError("A disk-backed replay buffer (storage_dir) requires storage_device='cpu'.")
+            self.storage_dir.mkdir(parents=True, exist_ok=True)
+        header = None
+        if self.storage_dir is not None and (self.storage_dir / REPLAY_BUFFER_HEADER).exists():
+            header = self._read_header()
 
         # Track episode boundaries for memory optimization
-        self.episode_ends = torch.zeros(capacity, dtype=torch.bool, device=storage_device)
+        self.episode_ends = self._allocate("episode_ends", (capacity,), torch.bool)
+        # With optimize_memory, the next_states of episode ends are stored in `final_next_states`, at the slot
+        # given by `final_next_state_slots` (-1 for the other transitions). Slots are recycled once their
+        # transition is overwritten, and the storage grows when all of them are in use.
+        self.final_next_state_slots = self._allocate("final_next_state_slots", (capacity,), torch.long)
+        self._free_final_next_state_slots: list[int] = []
+        # Number of transitions ever added, counted before they are written: on resume, the difference with
+        # the count of the last flush gives the transitions written after it
+        self._num_added = self._allocate("num_added", (1,), torch.long)
+        if header is None:
+            self.episode_ends.zero_()
+            self.final_next_state_slots.fill_(-1)
+            self._num_added.zero_()
+
+        self.prioritized = prioritized
+        self.priority_alpha = priority_alpha
+        self.priority_beta = priority_beta
+        self.priority_eps = priority_eps
+        self.max_priority = 1.0
+        self.sum_tree = SumTree(capacity, device=storage_device) if prioritized else None
+        # The async prefetch thread samples the tree while the learner updates the priorities
+        self._sum_tree_lock = threading.Lock()
+
+        # Cache of frozen encoder features, see `set_feature_encoder`
+        self.feature_encoder: Callable[[dict[str, torch.Tensor]], dict[str, torch.Tensor]] | None = None
+        self.feature_keys: list[str] = []
 
         # If no state_keys provided, default to an empty list
         self.state_keys = state_keys if state_keys is not None else []
@@ -129,6 +204,9 @@ class ReplayBuffer:
             self.image_augmentation_function = torch.compile(base_function)
         self.use_drq = use_drq
 
+        if header is not None:
+            self._load_storage(header)
+
     def _initialize_storage(
         self,
         state: dict[str, torch.Tensor],
@@ -137,53 +215,356 @@ class ReplayBuffer:
     ):
         """Initialize the storage tensors based on the first transition."""
         # Determine shapes from the first transition
-        state_shapes = {key: val.squeeze(0).shape for key, val in state.items()}
-        action_shape = action.squeeze(0).shape
+        state_shapes = {key: tuple(val.squeeze(0).shape) for key, val in state.items()}
+        action_shape = tuple(action.squeeze(0).shape)
+
+        complementary_info_shapes = None
+        if complementary_info is not None:
+            complementary_info_shapes = {}
+            for key, value in complementary_info.items():
+                if isinstance(value, torch.Tensor):
+                    complementary_info_shapes[key] = tuple(value.squeeze(0).shape)
+                elif isinstance(value, (int | float)):
+                    # Handle scalar values similar to reward
+                    complementary_info_shapes[key] = ()
+                else:
+                    raise ValueError(f"Unsupported type {type(value)} for complementary_info[{key}]")
+
+        self._allocate_storage(state_shapes, action_shape, complementary_info_shapes)
+
+    def _allocate_storage(
+        self,
+        state_shapes: dict[str, tuple[int, ...]],
+        action_shape: tuple[int, ...],
+        complementary_info_shapes: dict[str, tuple[int, ...]] | None,
+    ):
+        """Pre-allocate the storage tensors for the given (per transition) shapes."""
+        self._storage_shapes = {
+            "state": state_shapes,
+            "action": action_shape,
+            "complementary_info": complementary_info_shapes,
+        }
 
         # Pre-allocate tensors for storage
         self.states = {
-            key: torch.empty((self.capacity, *shape), device=self.storage_device)
+            key: self._allocate(f"states.{key}", (self.capacity, *shape), self._storage_dtype(key))
             for key, shape in state_shapes.items()
         }
-        self.actions = torch.empty((self.capacity, *action_shape), device=self.storage_device)
-        self.rewards = torch.empty((self.capacity,), device=self.storage_device)
+        self.actions = self._allocate("actions", (self.capacity, *action_shape), torch.get_default_dtype())
+        self.rewards = self._allocate("rewards", (self.capacity,), torch.get_default_dtype())
 
         if not self.optimize_memory:
             # Standard approach: store states and next_states separately
             self.next_states = {
-                key: torch.empty((self.capacity, *shape), device=self.storage_device)
+                key: self._allocate(f"next_states.{key}", (self.capacity, *shape), self._storage_dtype(key))
                 for key, shape in state_shapes.items()
             }
         else:
             # Memory-optimized approach: don't allocate next_states buffer
             # Just create a reference to states for consistent API
             self.next_states = self.states  # Just a reference for API consistency
+            self.final_next_states = {
+                key: torch.empty((0, *shape), dtype=self._storage_dtype(key), device=self.storage_device)
+                for key, shape in state_shapes.items()
+            }
 
-        self.dones = torch.empty((self.capacity,), dtype=torch.bool, device=self.storage_device)
-        self.truncateds = torch.empty((self.capacity,), dtype=torch.bool, device=self.storage_device)
+        self.dones = self._allocate("dones", (self.capacity,), torch.bool)
+        self.truncateds = self._allocate("truncateds", (self.capacity,), torch.bool)
 
         # Initialize storage for complementary_info
-        self.has_complementary_info = complementary_info is not None
+        self.has_complementary_info = complementary_info_shapes is not None
         self.complementary_info_keys = []
         self.complementary_info = {}
 
         if self.has_complementary_info:
-            self.complementary_info_keys = list(complementary_info.keys())
+            self.complementary_info_keys = list(complementary_info_shapes.keys())
             # Pre-allocate tensors for each key in complementary_info
-            for key, value in complementary_info.items():
-                if isinstance(value, torch.Tensor):
-                    value_shape = value.squeeze(0).shape
-                    self.complementary_info[key] = torch.empty(
-                        (self.capacity, *value_shape), device=self.storage_device
-                    )
-                elif isinstance(value, (int | float)):
-                    # Handle scalar values similar to reward
-                    self.complementary_info[key] = torch.empty((self.capacity,), device=self.storage_device)
-                else:
-                    raise ValueError(f"Unsupported type {type(value)} for complementary_info[{key}]")
+            for key, shape in complementary_info_shapes.items():
+                self.complementary_info[key] = self._allocate(
+                    f"complementary_info.{key}", (self.capacity, *shape), torch.get_default_dtype()
+                )
 
         self.initialized = True
 
+    def _allocate(self, name: str, shape: tuple[int, ...], dtype: torch.dtype) -> torch.Tensor:
+        """Allocates a storage tensor, backed by the memmap file `name` in `storage_dir` if any"""
+        if self.storage_dir is None:
+            return torch.empty(shape, dtype=dtype, device=self.storage_device)
+
+        path = self.storage_dir / name
+        self._memmaps[name] = make_memmap_safe(
+            filename=path,
+            dtype=torch.empty((), dtype=dtype).numpy().dtype,
+            mode="r+" if path.exists() else "w+",
+            shape=shape,
+        )
+        return torch.from_numpy(self._memmaps[name])
+
+    def flush(self) -> None:
+        """Writes the memory-mapped storage to disk along with the header needed to resume the buffer.
+
+        A resumed buffer holds the transitions of the last flush, minus the ones overwritten since then.
+        """
+        if self.storage_dir is None:
+            raise RuntimeError("Only a disk-backed replay buffer (storage_dir) can be flushed.")
+
+        for memmap in self._memmaps.values():
+            memmap.flush()
+
+        # Snapshot of the state describing the storage content. The storage memmaps keep changing after the
+        # flush, so the episode boundaries and the final next_state slots are snapshotted along with the
+        # in-memory state rather than read back from their memmaps on resume.
+        extra_state = {
+            "position": self.position,
+            "size": self.size,
+            "num_added": int(self._num_added.item()),
+            "episode_ends": self.episode_ends.clone(),
+            "final_next_state_slots": self.final_next_state_slots.clone(),
+            "free_final_next_state_slots": list(self._free_final_next_state_slots),
+            "final_next_states": getattr(self, "final_next_states", None),
+            "max_priority": self.max_priority,
+        }
+        if self.sum_tree is not None:
+            with self._sum_tree_lock:
+                extra_state["sum_tree"] = self.sum_tree.tree.clone()
+        else:
+            extra_state["sum_tree"] = None
+        tmp_path = self.storage_dir / f"{REPLAY_BUFFER_EXTRA_STATE}.tmp"
+        torch.save(extra_state, tmp_path)
+        os.replace(tmp_path, self.storage_dir / REPLAY_BUFFER_EXTRA_STATE)
+
+        header = {
+            "capacity": self.capacity,
+            "optimize_memory": self.optimize_memory,
+            "store_images_as_uint8": self.store_images_as_uint8,
+            "storage_shapes": self._storage_shapes if self.initialized else None,
+        }
+        # Written last and atomically: a header always comes with a complete snapshot
+        tmp_path = self.storage_dir / f"{REPLAY_BUFFER_HEADER}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(header, f, indent=4)
+        os.replace(tmp_path, self.storage_dir / REPLAY_BUFFER_HEADER)
+
+    def _read_header(self) -> dict:
+        with open(self.storage_dir / REPLAY_BUFFER_HEADER) as f:
+            header = json.load(f)
+
+        for key in ("capacity", "optimize_memory", "store_images_as_uint8"):
+            if header[key] != getattr(self, key):
+                raise ValueError(
+                    f"The replay buffer in {self.storage_dir} was created with {key}={header[key]}, "
+                    f"got {key}={getattr(self, key)}."
+                )
+        return header
+
+    def _load_storage(self, header: dict) -> None:
+        """Resumes a disk-backed buffer from the header written by `flush`"""
+        if header["storage_shapes"] is None:
+            return
+
+        shapes = header["storage_shapes"]
+        self._allocate_storage(
+            state_shapes={key: tuple(shape) for key, shape in shapes["state"].items()},
+            action_shape=tuple(shapes["action"]),
+            complementary_info_shapes=(
+                {key: tuple(shape) for key, shape in shapes["complementary_info"].items()}
+                if shapes["complementary_info"] is not None
+                else None
+            ),
+        )
+        self.initialized = True
+
+        extra_state = torch.load(self.storage_dir / REPLAY_BUFFER_EXTRA_STATE, weights_only=True)
+        self.position = extra_state["position"]
+        self.size = extra_state["size"]
+        self.episode_ends.copy_(extra_state["episode_ends"])
+        self.final_next_state_slots.copy_(extra_state["final_next_state_slots"])
+        self._free_final_next_state_slots = extra_state["free_final_next_state_slots"]
+        if extra_state["final_next_states"] is not None:
+            self.final_next_states = extra_state["final_next_states"]
+        self.max_priority = extra_state["max_priority"]
+
+        # The transitions added after the flush were written at the positions following `position`, over the
+        # oldest transitions of the snapshot: these are dropped, their storage no longer matches the snapshot
+        num_overwritten = min(int(self._num_added.item()) - extra_state["num_added"], self.capacity)
+        self._num_added.fill_(extra_state["num_added"])
+        overwritten = (self.position + torch.arange(num_overwritten)) % self.capacity
+        self.size = max(0, min(self.size, self.capacity - num_overwritten))
+
+        if self.sum_tree is not None:
+            if extra_state["sum_tree"] is not None:
+                self.sum_tree.tree.copy_(extra_state["sum_tree"])
+                self.sum_tree.update(overwritten, torch.zeros(num_overwritten))
+            else:
+                # The buffer wasn't prioritized: start from uniform priorities
+                positions = (self.position - self.size + torch.arange(self.size)) % self.capacity
+                self.sum_tree.update(positions, torch.ones(self.size))
+                last = (self.position - 1) % self.capacity
+                if self.optimize_memory and self.size > 0 and not self.episode_ends[last]:
+                    self.sum_tree.update(torch.tensor([last]), torch.zeros(1))
+
+    def _storage_dtype(self, key: str) -> torch.dtype:
+        if self.store_images_as_uint8 and key.startswith(OBS_IMAGE):
+            return torch.uint8
+        return torch.get_default_dtype()
+
+    def _to_storage(self, key: str, value: torch.Tensor) -> torch.Tensor:
+        """Converts a state value to the storage dtype of `key`"""
+        if self._storage_dtype(key) == torch.uint8 and value.is_floating_point():
+            if value.numel() > 0 and (value.min() < 0 or value.max() > 1):
+                raise ValueError(
+                    f"'{key}' has values outside of [0, 1], which can't be stored as uint8 without loss. "
+                    "Create the replay buffer with store_images_as_uint8=False."
+                )
+            return value.mul(255).round_().to(torch.uint8)
+        return value
+
+    def _from_storage(self, key: str, value: torch.Tensor) -> torch.Tensor:
+        """Converts a stored state value back to float"""
+        if value.dtype == torch.uint8 and self._storage_dtype(key) == torch.uint8:
+            return value.to(torch.get_default_dtype()).div_(255)
+        return value
+
+    def _release_final_next_states(self, positions: torch.Tensor | int) -> None:
+        """Frees the final next_state slots of the transitions about to be overwritten at `positions`"""
+        slots = self.final_next_state_slots[positions]
+        if (slots >= 0).any():
+            self._free_final_next_state_slots.extend(slots[slots >= 0].flatten().tolist())
+            self.final_next_state_slots[positions] = -1
+
+    def _store_final_next_state(self, position: int, next_state: dict[str, torch.Tensor]) -> None:
+        """Stores the next_state of the episode end at `position` (optimize_memory only)"""
+        if not self._free_final_next_state_slots:
+            num_slots = next(iter(self.final_next_states.values())).shape[0]
+            num_new_slots = min(max(num_slots, 64), self.capacity - num_slots)
+            for key, storage in self.final_next_states.items():
+                self.final_next_states[key] = torch.cat(
+                    [storage, storage.new_empty((num_new_slots, *storage.shape[1:]))]
+                )
+            self._free_final_next_state_slots.extend(range(num_slots, num_slots + num_new_slots))
+
+        slot = self._free_final_next_state_slots.pop()
+        for key, storage in self.final_next_states.items():
+            storage[slot].copy_(self._to_storage(key, next_state[key]).reshape(storage.shape[1:]))
+        self.final_next_state_slots[position] = slot
+
+    def set_feature_encoder(
+        self,
+        encoder: Callable[[dict[str, torch.Tensor]], dict[str, torch.Tensor]],
+        keys: Sequence[str],
+        dtype: torch.dtype | None = None,
+        encoder_batch_size: int = 256,
+    ) -> None:
+        """Caches the outputs of a frozen `encoder` for the state keys `keys` (typically the images).
+
+        The features of a transition are computed on `device` the first time it is sampled, and stored on the
+        storage device until the transition is overwritten. The sampled batches then carry them in
+        `observation_feature` and `next_observation_feature` (dicts mapping each key to its features), while
+        `keys` are dropped from `state` and `next_state`: they are neither transferred nor augmented.
+
+        Args:
+            encoder: Maps a dict of (B, ...) float observations on `device` to a dict of (B, ...) features. It is
+                called under `torch.no_grad`.
+            keys: State keys to encode.
+            dtype: Storage dtype of the features (e.g. torch.float16 to halve the cache). Defaults to the dtype
+                of the encoder outputs.
+            encoder_batch_size: Maximum number of observations encoded at once.
+        """
+        self.feature_encoder = encoder
+        self.feature_keys = list(keys)
+        self.feature_dtype = dtype
+        self.feature_encoder_batch_size = encoder_batch_size
+        self.feature_cache: dict[str, torch.Tensor] = {}
+        self.feature_cached = torch.zeros(self.capacity, dtype=torch.bool, device=self.storage_device)
+        # Incremented when a transition is overwritten: features encoded from its previous content (e.g. on the
+        # async prefetch thread) are then not marked as cached. The lock makes the check and the marking atomic
+        # with respect to the invalidation.
+        self._feature_generations = torch.zeros(self.capacity, dtype=torch.long, device=self.storage_device)
+        self._feature_lock = threading.Lock()
+        if not self.optimize_memory:
+            self.next_feature_cache: dict[str, torch.Tensor] = {}
+            self.next_feature_cached = torch.zeros(
+                self.capacity, dtype=torch.bool, device=self.storage_device
+            )
+
+    @torch.no_grad()
+    def _encode_features(self, states: dict[str, torch.Tensor]) -> dict[str, torch.Tensor]:
+        """Runs the feature encoder on stored states, returns the features on the storage device"""
+        observations = {
+            key: self._from_storage(key, states[key].to(self.device)) for key in self.feature_keys
+        }
+        return {
+            key: value.to(device=self.storage_device, dtype=self.feature_dtype or value.dtype)
+            for key, value in self.feature_encoder(observations).items()
+        }
+
+    def _fill_feature_cache(self, positions: torch.Tensor, next_states: bool = False) -> None:
+        """Encodes the (next) states at `positions` that are not cached yet"""
+        cache = self.next_feature_cache if next_states else self.feature_cache
+        cached = self.next_feature_cached if next_states else self.feature_cached
+        source = self.next_states if next_states else self.states
+
+        positions = torch.unique(positions)
+        missing = positions[~cached[positions]]
+        for chunk in missing.split(self.feature_encoder_batch_size):
+            generations = self._feature_generations[chunk].clone()
+            features = self._encode_features({key: source[key][chunk] for key in self.feature_keys})
+            with self._feature_lock:
+                unchanged = self._feature_generations[chunk] == generations
+                chunk = chunk[unchanged]
+                for key, value in features.items():
+                    if key not in cache:
+                        cache[key] = torch.empty(
+                            (self.capacity, *value.shape[1:]), dtype=value.dtype, device=self.storage_device
+                        )
+                    cache[key][chunk] = value[unchanged]
+                cached[chunk] = True
+
+    def _invalidate_features(self, positions: torch.Tensor | int) -> None:
+        if self.feature_encoder is None:
+            return
+        with self._feature_lock:
+            self._feature_generations[positions] += 1
+            self.feature_cached[positions] = False
+            if not self.optimize_memory:
+                self.next_feature_cached[positions] = False
+
+    def _set_new_priorities(self, positions: torch.Tensor) -> None:
+        """Gives the maximum priority to the transitions just written at `positions` (before `position` moves)"""
+        if self.sum_tree is None:
+            return
+
+        positions = positions.to(self.storage_device)
+        priorities = torch.full((positions.shape[0],), self.max_priority**self.priority_alpha)
+        if self.optimize_memory:
+            # The next_state of the most recent transition is only known if it ended its episode: it can't be
+            # sampled until the next transition is added
+            if not self.episode_ends[positions[-1]]:
+                priorities[-1] = 0
+            previous = (self.position - 1) % self.capacity
+            with self._sum_tree_lock:
+                previous_priority = self.sum_tree.get(previous)
+            if self.size > 0 and positions.shape[0] < self.capacity and previous_priority == 0:
+                positions = torch.cat([positions.new_tensor([previous]), positions])
+                priorities = torch.cat(
+                    [priorities.new_tensor([self.max_priority**self.priority_alpha]), priorities]
+                )
+
+        with self._sum_tree_lock:
+            self.sum_tree.update(positions, priorities)
+
+    def update_priorities(self, indices: torch.Tensor, td_errors: torch.Tensor) -> None:
+        """Sets the priorities of the transitions at the storage `indices` (as given in the sampled batches)"""
+        if self.sum_tree is None:
+            raise RuntimeError("Priorities can only be updated on a prioritized replay buffer.")
+
+        priorities = (
+            td_errors.detach().abs().to(device=self.storage_device, dtype=torch.float64) + self.priority_eps
+        )
+        self.max_priority = max(self.max_priority, priorities.max().item())
+        with self._sum_tree_lock:
+            self.sum_tree.update(indices, priorities**self.priority_alpha)
+
     def __len__(self):
         return self.size
 
@@ -202,18 +583,28 @@ class ReplayBuffer:
         if not self.initialized:
             self._initialize_storage(state=state, action=action, complementary_info=complementary_info)
 
+        self._num_added += 1
         # Store the transition in pre-allocated tensors
         for key in self.states:
-            self.states[key][self.position].copy_(state[key].squeeze(dim=0))
+            self.states[key][self.position].copy_(self._to_storage(key, state[key].squeeze(dim=0)))
 
             if not self.optimize_memory:
                 # Only store next_states if not optimizing memory
-                self.next_states[key][self.position].copy_(next_state[key].squeeze(dim=0))
+                self.next_states[key][self.position].copy_(
+                    self._to_storage(key, next_state[key].squeeze(dim=0))
+                )
 
         self.actions[self.position].copy_(action.squeeze(dim=0))
         self.rewards[self.position] = reward
         self.dones[self.position] = done
         self.truncateds[self.position] = truncated
+        self.episode_ends[self.position] = bool(done) or bool(truncated)
+
+        if self.optimize_memory:
+            # The next_state of an episode end is not the state of the next transition
+            self._release_final_next_states(self.position)
+            if self.episode_ends[self.position]:
+                self._store_final_next_state(self.position, next_state)
 
         # Handle complementary_info if provided and storage is initialized
         if complementary_info is not None and self.has_complementary_info:
@@ -226,38 +617,224 @@ class ReplayBuffer:
                     elif isinstance(value, (int | float)):
                         self.complementary_info[key][self.position] = value
 
+        self._set_new_priorities(torch.tensor([self.position]))
+        self._invalidate_features(self.position)
+
         self.position = (self.position + 1) % self.capacity
         self.size = min(self.size + 1, self.capacity)
 
+    def add_batch(
+        self,
+        state: dict[str, torch.Tensor],
+        action: torch.Tensor,
+        reward: torch.Tensor,
+        next_state: dict[str, torch.Tensor],
+        done: torch.Tensor,
+        truncated: torch.Tensor,
+        complementary_info: dict[str, torch.Tensor] | None = None,
+    ):
+        """Saves a batch of N transitions given as stacked (N, ...) tensors.
+
+        Equivalent to calling `add` on each transition in order, but writes each storage tensor with at most
+        two slice copies (one on each side of the ring's wrap-around).
+        """
+        num_transitions = action.shape[0]
+        if num_transitions == 0:
+            return
+
+        if not self.initialized:
+            self._initialize_storage(
+                state={key: value[:1] for key, value in state.items()},
+                action=action[:1],
+                complementary_info=(
+                    {key: value[:1] for key, value in complementary_info.items()}
+                    if complementary_info is not None
+                    else None
+                ),
+            )
+
+        # Only the last `capacity` transitions would survive the insertion
+        skip = max(0, num_transitions - self.capacity)
+        num_written = num_transitions - skip
+        start = (self.position + skip) % self.capacity
+        first = min(num_written, self.capacity - start)
+
+        self._num_added += num_transitions
+
+        def write(storage: torch.Tensor, values: torch.Tensor | float | bool):
+            if not isinstance(values, torch.Tensor):
+                values = torch.as_tensor(values)
+            values = values.reshape(num_transitions, *storage.shape[1:])[skip:]
+            storage[start : start + first].copy_(values[:first])
+            if first < num_written:
+                storage[: num_written - first].copy_(values[first:])
+
+        for key in self.states:
+            write(self.states[key], self._to_storage(key, state[key]))
+            if not self.optimize_memory:
+                write(self.next_states[key], self._to_storage(key, next_state[key]))
+
+        write(self.actions, action)
+        write(self.rewards, reward)
+        write(self.dones, done)
+        write(self.truncateds, truncated)
+        episode_ends = torch.as_tensor(done).reshape(-1) | torch.as_tensor(truncated).reshape(-1)
+        write(self.episode_ends, episode_ends)
+
+        positions = (start + torch.arange(num_written)) % self.capacity
+        if self.optimize_memory:
+            self._release_final_next_states(positions.to(self.storage_device))
+            for row in torch.nonzero(episode_ends[skip:]).flatten().tolist():
+                self._store_final_next_state(
+                    int(positions[row]), {key: value[skip + row] for key, value in next_state.items()}
+                )
+
+        if complementary_info is not None and self.has_complementary_info:
+            for key in self.complementary_info_keys:
+                if key in complementary_info:
+                    write(self.complementary_info[key], complementary_info[key])
+
+        self._set_new_priorities(positions)
+        self._invalidate_features(positions.to(self.storage_device))
+
+        self.position = (self.position + num_transitions) % self.capacity
+        self.size = min(self.size + num_transitions, self.capacity)
+
     def sample(self, batch_size: int) -> BatchTransition:
         """Sample a random batch of transitions and collate them into batched tensors."""
         if not self.initialized:
             raise RuntimeError("Cannot sample from an empty buffer. Add transitions first.")
 
         batch_size = min(batch_size, self.size)
-        high = max(0, self.size - 1) if self.optimize_memory and self.size < self.capacity else self.size
+        idx, weights = self._sample_indices(batch_size)
+        return self._to_batch_transition(self._gather(idx, weights=weights))
 
-        # Random indices for sampling - create on the same device as storage
-        idx = torch.randint(low=0, high=high, size=(batch_size,), device=self.storage_device)
+    def _sample_indices(self, batch_size: int) -> tuple[torch.Tensor, torch.Tensor | None]:
+        """Draws `batch_size` storage indices among the samplable transitions.
 
-        # Identify image keys that need augmentation
-        image_keys = [k for k in self.states if k.startswith(OBS_IMAGE)] if self.use_drq else []
+        Returns:
+            The indices, and their importance-sampling weights with prioritized replay (None otherwise).
+        """
+        if self.sum_tree is None:
+            return self._sample_uniform_indices(batch_size), None
 
-        # Create batched state and next_state
-        batch_state = {}
-        batch_next_state = {}
+        with self._sum_tree_lock:
+            total = self.sum_tree.total
+            if total == 0:
+                return self._sample_uniform_indices(batch_size), torch.ones(batch_size)
+            idx, priorities = self.sum_tree.sample(batch_size)
 
-        # First pass: load all state tensors to target device
+        probabilities = priorities / total
+        weights = (self.size * probabilities) ** -self.priority_beta
+        return idx, (weights / weights.max()).float()
+
+    def _sample_uniform_indices(self, batch_size: int) -> torch.Tensor:
+        if not self.optimize_memory:
+            # Random indices for sampling - create on the same device as storage
+            return torch.randint(low=0, high=self.size, size=(batch_size,), device=self.storage_device)
+
+        # The next_state of the most recent transition is only known if it ended its episode
+        last = (self.position - 1) % self.capacity
+        high = self.size if self.episode_ends[last] else max(1, self.size - 1)
+        oldest = (self.position - self.size) % self.capacity
+        offsets = torch.randint(low=0, high=high, size=(batch_size,), device=self.storage_device)
+        return (oldest + offsets) % self.capacity
+
+    def _gather(
+        self, idx: torch.Tensor, weights: torch.Tensor | None = None, out: dict | None = None
+    ) -> dict:
+        """Gathers the transitions at `idx`, in storage dtypes and on the storage device.
+
+        If `out` is given (a dict with the same structure as the output, e.g. pinned staging buffers), the
+        transitions are written in it with `torch.index_select(out=...)` instead of allocating new tensors.
+        """
+
+        def select(storage: torch.Tensor, index: torch.Tensor, *keys: str) -> torch.Tensor:
+            if out is None:
+                return storage[index]
+            target = out
+            for key in keys:
+                target = target[key]
+            return torch.index_select(storage, 0, index, out=target[: index.shape[0]])
+
+        if self.optimize_memory:
+            next_idx = (idx + 1) % self.capacity
+            final_slots = self.final_next_state_slots[idx]
+            is_final = final_slots >= 0
+            has_final = bool(is_final.any())
+
+        batch = {"state": {}, "next_state": {}}
         for key in self.states:
-            batch_state[key] = self.states[key][idx].to(self.device)
+            if key in self.feature_keys:
+                continue
+
+            batch["state"][key] = select(self.states[key], idx, "state", key)
 
             if not self.optimize_memory:
                 # Standard approach - load next_states directly
-                batch_next_state[key] = self.next_states[key][idx].to(self.device)
+                batch["next_state"][key] = select(self.next_states[key], idx, "next_state", key)
             else:
-                # Memory-optimized approach - get next_state from the next index
-                next_idx = (idx + 1) % self.capacity
-                batch_next_state[key] = self.states[key][next_idx].to(self.device)
+                # Memory-optimized approach - get next_state from the next index, except at episode ends
+                next_state = select(self.states[key], next_idx, "next_state", key)
+                if has_final:
+                    next_state[is_final] = self.final_next_states[key][final_slots[is_final]]
+                batch["next_state"][key] = next_state
+
+        batch[ACTION] = select(self.actions, idx, ACTION)
+        batch["reward"] = select(self.rewards, idx, "reward")
+        batch["done"] = select(self.dones, idx, "done")
+        batch["truncated"] = select(self.truncateds, idx, "truncated")
+
+        batch["complementary_info"] = None
+        if self.has_complementary_info:
+            batch["complementary_info"] = {
+                key: select(self.complementary_info[key], idx, "complementary_info", key)
+                for key in self.complementary_info_keys
+            }
+
+        if self.feature_encoder is not None:
+            self._fill_feature_cache(idx)
+            batch["observation_feature"] = {key: self.feature_cache[key][idx] for key in self.feature_keys}
+
+            if not self.optimize_memory:
+                self._fill_feature_cache(idx, next_states=True)
+                next_features = {key: self.next_feature_cache[key][idx] for key in self.feature_keys}
+            else:
+                self._fill_feature_cache(next_idx[~is_final] if has_final else next_idx)
+                next_features = {key: self.feature_cache[key][next_idx] for key in self.feature_keys}
+                if has_final:
+                    # The final next_states of the episodes are not cached
+                    final_features = self._encode_features(
+                        {key: self.final_next_states[key][final_slots[is_final]] for key in self.feature_keys}
+                    )
+                    for key, value in final_features.items():
+                        next_features[key][is_final] = value
+            batch["next_observation_feature"] = next_features
+
+        if weights is not None:
+            batch["index"] = idx
+            batch["weight"] = weights
+
+        return batch
+
+    def _to_batch_transition(self, batch: dict, non_blocking: bool = False) -> BatchTransition:
+        """Moves a batch from `_gather` to `device`, converts it back to float and applies the augmentation"""
+
+        def to_device(tensor: torch.Tensor) -> torch.Tensor:
+            return tensor.to(self.device, non_blocking=non_blocking)
+
+        batch_size = batch[ACTION].shape[0]
+
+        # Identify image keys that need augmentation
+        image_keys = [k for k in batch["state"] if k.startswith(OBS_IMAGE)] if self.use_drq else []
+
+        # First pass: load all state tensors to target device
+        batch_state = {
+            key: self._from_storage(key, to_device(value)) for key, value in batch["state"].items()
+        }
+        batch_next_state = {
+            key: self._from_storage(key, to_device(value)) for key, value in batch["next_state"].items()
+        }
 
         # Apply image augmentation in a batched way if needed
         if self.use_drq and image_keys:
@@ -280,34 +857,42 @@ class ReplayBuffer:
                 # Next states start after the states at index (i*2+1)*batch_size and also take up batch_size slots
                 batch_next_state[key] = augmented_images[(i * 2 + 1) * batch_size : (i + 1) * 2 * batch_size]
 
-        # Sample other tensors
-        batch_actions = self.actions[idx].to(self.device)
-        batch_rewards = self.rewards[idx].to(self.device)
-        batch_dones = self.dones[idx].to(self.device).float()
-        batch_truncateds = self.truncateds[idx].to(self.device).float()
-
         # Sample complementary_info if available
         batch_complementary_info = None
-        if self.has_complementary_info:
-            batch_complementary_info = {}
-            for key in self.complementary_info_keys:
-                batch_complementary_info[key] = self.complementary_info[key][idx].to(self.device)
+        if batch["complementary_info"] is not None:
+            batch_complementary_info = {
+                key: to_device(value) for key, value in batch["complementary_info"].items()
+            }
 
-        return BatchTransition(
+        batch_transition = BatchTransition(
             state=batch_state,
-            action=batch_actions,
-            reward=batch_rewards,
+            action=to_device(batch[ACTION]),
+            reward=to_device(batch["reward"]),
             next_state=batch_next_state,
-            done=batch_dones,
-            truncated=batch_truncateds,
+            done=to_device(batch["done"]).float(),
+            truncated=to_device(batch["truncated"]).float(),
             complementary_info=batch_complementary_info,
         )
+        if "observation_feature" in batch:
+            batch_transition["observation_feature"] = {
+                key: to_device(value) for key, value in batch["observation_feature"].items()
+            }
+            batch_transition["next_observation_feature"] = {
+                key: to_device(value) for key, value in batch["next_observation_feature"].items()
+            }
+        if "weight" in batch:
+            # The indices stay on the storage device, where the priorities are updated
+            batch_transition["index"] = batch["index"]
+            batch_transition["weight"] = to_device(batch["weight"])
+
+        return batch_transition
 
     def get_iterator(
         self,
         batch_size: int,
         async_prefetch: bool = True,
         queue_size: int = 2,
+        cuda_prefetch: bool = False,
     ):
         """
         Creates an infinite iterator that yields batches of transitions.
@@ -317,12 +902,24 @@ class ReplayBuffer:
             batch_size (int): Size of batches to sample
             async_prefetch (bool): Whether to use asynchronous prefetching with threads (default: True)
             queue_size (int): Number of batches to prefetch (default: 2)
+            cuda_prefetch (bool): Whether to gather the batches in pinned memory and copy them to the GPU on a
+                side CUDA stream (default: False). Takes precedence over `async_prefetch` when the buffer is
+                stored on CPU and sampled on a CUDA device, ignored otherwise.
 
         Yields:
             BatchTransition: Batched transitions
         """
+        use_cuda_prefetch = (
+            cuda_prefetch
+            and torch.cuda.is_available()
+            and torch.device(self.device).type == "cuda"
+            and torch.device(self.storage_device).type == "cpu"
+        )
+
         while True:  # Create an infinite loop
-            if async_prefetch:
+            if use_cuda_prefetch:
+                iterator = self._get_cuda_prefetch_iterator(batch_size=batch_size)
+            elif async_prefetch:
                 # Get the standard iterator
                 iterator = self._get_async_iterator(queue_size=queue_size, batch_size=batch_size)
             else:
@@ -386,6 +983,89 @@ class ReplayBuffer:
             # Give the producer thread a bit of time to finish.
             producer_thread.join(timeout=1.0)
 
+    def _allocate_staging_buffers(self, batch_size: int) -> dict:
+        """Allocates pinned CPU buffers with the layout of a `_gather` output of `batch_size` transitions"""
+
+        def empty_like_row(storage: torch.Tensor) -> torch.Tensor:
+            return torch.empty((batch_size, *storage.shape[1:]), dtype=storage.dtype, pin_memory=True)
+
+        return {
+            "state": {
+                key: empty_like_row(storage)
+                for key, storage in self.states.items()
+                if key not in self.feature_keys
+            },
+            "next_state": {
+                key: empty_like_row(storage)
+                for key, storage in self.states.items()
+                if key not in self.feature_keys
+            },
+            ACTION: empty_like_row(self.actions),
+            "reward": empty_like_row(self.rewards),
+            "done": empty_like_row(self.dones),
+            "truncated": empty_like_row(self.truncateds),
+            "complementary_info": (
+                {key: empty_like_row(storage) for key, storage in self.complementary_info.items()}
+                if self.has_complementary_info
+                else None
+            ),
+        }
+
+    def _get_cuda_prefetch_iterator(self, batch_size: int, num_staging_buffers: int = 2):
+        """
+        Create an iterator that overlaps the host-to-device transfer of the next batch with the computation on
+        the current one.
+
+        Batches are gathered into preallocated pinned staging buffers (used round-robin), then copied to the GPU
+        with non-blocking copies issued on a dedicated CUDA stream, which also runs the dtype conversion and the
+        augmentation. The consumer's stream only waits on the event recorded after them.
+
+        Args:
+            batch_size (int): Size of batches to sample.
+            num_staging_buffers (int): Number of pinned staging buffers (2 for double buffering).
+
+        Yields:
+            BatchTransition: A batch sampled from the replay buffer, on `device`.
+        """
+        device = torch.device(self.device)
+        stream = torch.cuda.Stream(device=device)
+        staging_buffers = [self._allocate_staging_buffers(batch_size) for _ in range(num_staging_buffers)]
+        # Event recorded after the last copy from each staging buffer
+        copy_events: list[torch.cuda.Event | None] = [None] * num_staging_buffers
+
+        def prefetch(i: int) -> tuple[BatchTransition, torch.cuda.Event]:
+            # The staging buffer can only be overwritten once the previous copy from it is done
+            if copy_events[i] is not None:
+                copy_events[i].synchronize()
+
+            idx, weights = self._sample_indices(min(batch_size, self.size))
+            gathered = self._gather(idx, weights=weights, out=staging_buffers[i])
+
+            with torch.cuda.stream(stream):
+                batch = self._to_batch_transition(gathered, non_blocking=True)
+                event = torch.cuda.Event()
+                event.record(stream)
+            copy_events[i] = event
+            return batch, event
+
+        pending = prefetch(0)
+        step = 1
+        while True:
+            next_pending = prefetch(step % num_staging_buffers)
+            step += 1
+
+            batch, event = pending
+            consumer_stream = torch.cuda.current_stream(device)
+            consumer_stream.wait_event(event)
+            # The batch was allocated on the side stream: its memory must not be reused before the consumer is
+            # done with it
+            for tensor in _iter_tensors(batch):
+                if tensor.device.type == "cuda":
+                    tensor.record_stream(consumer_stream)
+
+            yield batch
+            pending = next_pending
+
     def _get_naive_iterator(self, batch_size: int, queue_size: int = 2):
         """
         Creates a simple non-threaded iterator that yields batches.
@@ -422,6 +1102,12 @@ class ReplayBuffer:
         use_drq: bool = True,
         storage_device: str = "cpu",
         optimize_memory: bool = False,
+        store_images_as_uint8: bool = False,
+        prioritized: bool = False,
+        priority_alpha: float = 0.6,
+        priority_beta: float = 0.4,
+        priority_eps: float = 1e-6,
+        storage_dir: str | Path | None = None,
     ) -> "ReplayBuffer":
         """
         Convert a LeRobotDataset into a ReplayBuffer.
@@ -437,6 +1123,10 @@ class ReplayBuffer:
             use_drq (bool): Whether to use DrQ image augmentation when sampling.
             storage_device (str): Device for storing tensor data. Using "cpu" saves GPU memory.
             optimize_memory (bool): If True, reduces memory usage by not duplicating state data.
+            store_images_as_uint8 (bool): If True, stores images as uint8.
+            prioritized (bool): If True, uses prioritized sampling (see `ReplayBuffer.__init__` for the
+                `priority_*` arguments).
+            storage_dir (str | Path | None): Directory of the memmap files for a disk-backed buffer.
 
         Returns:
             ReplayBuffer: The replay buffer with dataset transitions.
@@ -458,6 +1148,12 @@ class ReplayBuffer:
             use_drq=use_drq,
             storage_device=storage_device,
             optimize_memory=optimize_memory,
+            store_images_as_uint8=store_images_as_uint8,
+            prioritized=prioritized,
+            priority_alpha=priority_alpha,
+            priority_beta=priority_beta,
+            priority_eps=priority_eps,
+            storage_dir=storage_dir,
         )
 
         # Convert dataset to transitions
@@ -539,7 +1235,7 @@ class ReplayBuffer:
 
         # Add state keys
         for key in self.states:
-            sample_val = self.states[key][0]
+            sample_val = self._from_storage(key, self.states[key][0])
             f_info = guess_feature_info(t=sample_val, name=key)
             features[key] = f_info
 
@@ -574,7 +1270,7 @@ class ReplayBuffer:
 
             # Fill the data for state keys
             for key in self.states:
-                frame_dict[key] = self.states[key][actual_idx].cpu()
+                frame_dict[key] = self._from_storage(key, self.states[key][actual_idx].cpu())
 
             # Fill action, reward, done
             frame_dict[ACTION] = self.actions[actual_idx].cpu()
@@ -758,6 +1454,15 @@ def guess_feature_info(t, name: str):
         }
 
 
+def _iter_tensors(data):
+    """Yields the tensors of a (possibly nested) dict"""
+    if isinstance(data, torch.Tensor):
+        yield data
+    elif isinstance(data, dict):
+        for value in data.values():
+            yield from _iter_tensors(value)
+
+
 def concatenate_batch_transitions(
     left_batch_transitions: BatchTransition, right_batch_transition: BatchTransition
 ) -> BatchTransition:
@@ -831,4 +1536,57 @@ def concatenate_batch_transitions(
                 else:
                     left_info[key] = right_info[key]
 
+    # Handle cached features
+    for feature_key in ("observation_feature", "next_observation_feature"):
+        if feature_key in left_batch_transitions and feature_key in right_batch_transition:
+            left_batch_transitions[feature_key] = {
+                key: torch.cat([value, right_batch_transition[feature_key][key]], dim=0)
+                for key, value in left_batch_transitions[feature_key].items()
+            }
+
+    # Handle prioritized replay fields: the transitions without importance-sampling weights get a weight of 1
+    left_weight = left_batch_transitions.get("weight")
+    right_weight = right_batch_transition.get("weight")
+    if left_weight is not None or right_weight is not None:
+        if left_weight is None:
+            left_weight = right_weight.new_ones(
+                left_batch_transitions["reward"].shape[0] - right_weight.shape[0]
+            )
+        if right_weight is None:
+            right_weight = left_weight.new_ones(right_batch_transition["reward"].shape[0])
+        left_batch_transitions["weight"] = torch.cat([left_weight, right_weight], dim=0)
+    # The storage indices refer to different buffers, they can't be concatenated
+    left_batch_transitions.pop("index", None)
+
     return left_batch_transitions
+
+
+def split_batch_transition(batch: BatchTransition, num_splits: int) -> list[BatchTransition]:
+    """
+    Splits a BatchTransition into `num_splits` batches of equal size along dimension 0.
+
+    The tensors of the returned batches are views of the tensors of `batch`, no data is copied.
+
+    Args:
+        batch (BatchTransition): The batch to split. Its size must be divisible by `num_splits`.
+        num_splits (int): Number of batches to return.
+
+    Returns:
+        list[BatchTransition]: The consecutive slices of `batch`.
+    """
+    batch_size = batch[ACTION].shape[0]
+    if batch_size % num_splits != 0:
+        raise ValueError(f"Cannot split a batch of {batch_size} transitions into {num_splits} equal batches")
+    split_size = batch_size // num_splits
+
+    def split(value):
+        if isinstance(value, torch.Tensor):
+            return value.split(split_size, dim=0)
+        if isinstance(value, dict):
+            splits = {key: split(item) for key, item in value.items()}
+            return [{key: item[i] for key, item in splits.items()} for i in range(num_splits)]
+        # e.g. a missing complementary_info
+        return [value] * num_splits
+
+    splits = {key: split(value) for key, value in batch.items()}
+    return [{key: value[i] for key, value in splits.items()} for i in range(num_splits)]
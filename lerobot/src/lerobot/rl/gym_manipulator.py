@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
 import logging
 import time
 from dataclasses import dataclass
@@ -310,21 +311,7 @@ def make_robot_env(cfg: HILSerlRobotEnvConfig) -> tuple[gym.Env, Any]:
     # Check if this is a GymHIL simulation environment
     if cfg.name == "gym_hil":
         assert cfg.robot is None and cfg.teleop is None, "GymHIL environment does not support robot or teleop"
-        import gym_hil  # noqa: F401
-
-        # Extract gripper settings with defaults
-        use_gripper = cfg.processor.gripper.use_gripper if cfg.processor.gripper is not None else True
-        gripper_penalty = cfg.processor.gripper.gripper_penalty if cfg.processor.gripper is not None else 0.0
-
-        env = gym.make(
-            f"gym_hil/{cfg.task}",
-            image_obs=True,
-            render_mode="human",
-            use_gripper=use_gripper,
-            gripper_penalty=gripper_penalty,
-        )
-
-        return env, None
+        return make_gym_hil_env(cfg), None
 
     # Real robot environment
     assert cfg.robot is not None, "Robot config must be provided for real robot environment"
@@ -351,15 +338,69 @@ def make_robot_env(cfg: HILSerlRobotEnvConfig) -> tuple[gym.Env, Any]:
     return env, teleop_device
 
 
+def make_gym_hil_env(cfg: HILSerlRobotEnvConfig, render_mode: str | None = "human") -> gym.Env:
+    """Create a GymHIL simulation environment from configuration.
+
+    Args:
+        cfg: Environment configuration.
+        render_mode: Render mode of the environment, None to run it headless.
+
+    Returns:
+        The gym environment.
+    """
+    import gym_hil  # noqa: F401
+
+    # Extract gripper settings with defaults
+    use_gripper = cfg.processor.gripper.use_gripper if cfg.processor.gripper is not None else True
+    gripper_penalty = cfg.processor.gripper.gripper_penalty if cfg.processor.gripper is not None else 0.0
+
+    return gym.make(
+        f"gym_hil/{cfg.task}",
+        image_obs=True,
+        render_mode=render_mode,
+        use_gripper=use_gripper,
+        gripper_penalty=gripper_penalty,
+    )
+
+
+def make_vector_robot_env(cfg: HILSerlRobotEnvConfig) -> gym.vector.VectorEnv:
+    """Create `cfg.num_envs` copies of a GymHIL simulation environment, each stepped in its own process.
+
+    Only the first copy is rendered. Finished episodes are reset within the same step
+    (`gym.vector.AutoresetMode.SAME_STEP`): their last observations are in `info["final_obs"]`.
+
+    Args:
+        cfg: Environment configuration.
+
+    Returns:
+        The vectorized environment.
+    """
+    if cfg.name != "gym_hil":
+        raise ValueError(
+            f"Vectorized environments are only supported in simulation (gym_hil), got '{cfg.name}'. "
+            "Use num_envs=1 with real robots."
+        )
+    assert cfg.robot is None and cfg.teleop is None, "GymHIL environment does not support robot or teleop"
+
+    env_fns = [
+        functools.partial(make_gym_hil_env, cfg, render_mode="human" if i == 0 else None)
+        for i in range(cfg.num_envs)
+    ]
+    return gym.vector.AsyncVectorEnv(env_fns, autoreset_mode=gym.vector.AutoresetMode.SAME_STEP)
+
+
 def make_processors(
-    env: gym.Env, teleop_device: Teleoperator | None, cfg: HILSerlRobotEnvConfig, device: str = "cpu"
+    env: gym.Env | gym.vector.VectorEnv,
+    teleop_device: Teleoperator | None,
+    cfg: HILSerlRobotEnvConfig,
+    device: str = "cpu",
 ) -> tuple[
     DataProcessorPipeline[EnvTransition, EnvTransition], DataProcessorPipeline[EnvTransition, EnvTransition]
 ]:
     """Create environment and action processors.
 
     Args:
-        env: Robot environment instance.
+        env: Robot environment instance, or vectorized simulation environments.
         teleop_device: Teleoperator device for intervention.
         cfg: Processor configuration.
         device: Target device for computations.
@@ -372,11 +413,18 @@ def make_processors(
     )
 
     if cfg.name == "gym_hil":
-        action_pipeline_steps = [
-            InterventionActionProcessorStep(terminate_on_success=terminate_on_success),
-            Torch2NumpyActionProcessorStep(),
-        ]
-
+        if isinstance(env, gym.vector.VectorEnv):
+            # The actions of all the environments are processed at once. Human interventions are not supported
+            # with several environments, the rewards and terminations come from the environments.
+            action_pipeline_steps = [Torch2NumpyActionProcessorStep(squeeze_batch_dim=False)]
+        else:
+            action_pipeline_steps = [
+                InterventionActionProcessorStep(terminate_on_success=terminate_on_success),
+                Torch2NumpyActionProcessorStep(),
+            ]
+
+        # The observations of vectorized environments are already batched: AddBatchDimensionProcessorStep only
+        # adds a batch dimension to the observations of a single environment
         env_pipeline_steps = [
             Numpy2TorchActionProcessorStep(),
             VanillaObservationProcessorStep(),
@@ -453,6 +501,8 @@ def make_processors(
                 success_threshold=cfg.processor.reward_classifier.success_threshold,
                 success_reward=cfg.processor.reward_classifier.success_reward,
                 terminate_on_success=terminate_on_success,
+                async_inference=cfg.processor.reward_classifier.async_inference,
+                history_size=cfg.processor.reward_classifier.history_size,
             )
         )
 
@@ -505,6 +555,15 @@ def make_processors(
     )
 
 
+def close_processors(*pipelines: DataProcessorPipeline) -> None:
+    """Releases the resources held by the steps of the pipelines, e.g. the worker thread of an asynchronous
+    reward classifier."""
+    for pipeline in pipelines:
+        for step in pipeline.steps:
+            if hasattr(step, "close"):
+                step.close()
+
+
 def step_env_and_process_transition(
     env: gym.Env,
     transition: EnvTransition,
@@ -715,6 +774,8 @@ def control_loop(
         # Maintain fps timing
         busy_wait(dt - (time.perf_counter() - step_start_time))
 
+    close_processors(env_processor, action_processor)
+
     if dataset is not None and cfg.dataset.push_to_hub:
         logging.info("Pushing dataset to hub")
         dataset.push_to_hub()
@@ -48,6 +48,7 @@ import logging
 import os
 import shutil
 import time
+from collections.abc import Iterator
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from pprint import pformat
@@ -66,7 +67,14 @@ from lerobot.datasets.factory import make_dataset
 from lerobot.datasets.lerobot_dataset import LeRobotDataset
 from lerobot.policies.factory import make_policy
 from lerobot.policies.sac.modeling_sac import SACPolicy
-from lerobot.rl.buffer import ReplayBuffer, concatenate_batch_transitions
+from lerobot.rl.buffer import (
+    REPLAY_BUFFER_HEADER,
+    BatchTransition,
+    ReplayBuffer,
+    concatenate_batch_transitions,
+    split_batch_transition,
+)
+from lerobot.rl.parameter_sync import ParameterSyncEncoder
 from lerobot.rl.process import ProcessSignalHandler
 from lerobot.rl.wandb_utils import WandBLogger
 from lerobot.robots import so100_follower  # noqa: F401
@@ -75,15 +83,16 @@ from lerobot.teleoperators.utils import TeleopEvents
 from lerobot.transport import services_pb2_grpc
 from lerobot.transport.utils import (
     MAX_MESSAGE_SIZE,
+    batch_bytes_to_transitions,
     bytes_to_python_object,
-    bytes_to_transitions,
-    state_to_bytes,
 )
 from lerobot.utils.constants import (
     ACTION,
     CHECKPOINTS_DIR,
     LAST_CHECKPOINT_LINK,
+    OFFLINE_REPLAY_BUFFER_DIR,
     PRETRAINED_MODEL_DIR,
+    REPLAY_BUFFER_DIR,
     TRAINING_STATE_DIR,
 )
 from lerobot.utils.random_utils import set_seed
@@ -93,7 +102,7 @@ from lerobot.utils.train_utils import (
     save_checkpoint,
     update_last_checkpoint,
 )
-from lerobot.utils.transition import move_state_dict_to_device, move_transition_to_device
+from lerobot.utils.transition import move_transition_to_device
 from lerobot.utils.utils import (
     format_big_number,
     get_safe_torch_device,
@@ -287,6 +296,7 @@ def add_actor_information_and_train(
     clip_grad_norm_value = cfg.policy.grad_clip_norm
     online_step_before_learning = cfg.policy.online_step_before_learning
     utd_ratio = cfg.policy.utd_ratio
+    fused_utd = cfg.policy.fused_utd
     fps = cfg.env.fps
     log_freq = cfg.log_freq
     save_freq = cfg.save_freq
@@ -295,6 +305,8 @@ def add_actor_information_and_train(
     saving_checkpoint = cfg.save_checkpoint
     online_steps = cfg.policy.online_steps
     async_prefetch = cfg.policy.async_prefetch
+    cuda_prefetch = cfg.policy.cuda_prefetch
+    prioritized_replay = cfg.prioritized_replay
 
     # Initialize logging for multiprocessing
     if not use_threads(cfg):
@@ -315,7 +327,15 @@ def add_actor_information_and_train(
 
     policy.train()
 
-    push_actor_policy_to_queue(parameters_queue=parameters_queue, policy=policy)
+    actor_learner_config = cfg.policy.actor_learner_config
+    parameter_sync = ParameterSyncEncoder(
+        mode=actor_learner_config.parameter_sync_mode,
+        delta_dtype=actor_learner_config.parameter_delta_dtype,
+        full_sync_interval=actor_learner_config.full_sync_interval,
+    )
+    push_actor_policy_to_queue(
+        parameters_queue=parameters_queue, policy=policy, parameter_sync=parameter_sync
+    )
 
     last_time_policy_pushed = time.time()
 
@@ -338,6 +358,19 @@ def add_actor_information_and_train(
         )
         batch_size: int = batch_size // 2  # We will sample from both replay buffer
 
+    if (
+        cfg.policy.cache_image_features
+        and cfg.policy.vision_encoder_name is not None
+        and cfg.policy.freeze_vision_encoder
+        and policy.actor.encoder.has_images
+    ):
+        logging.info("Caching the frozen image features in the replay buffers")
+        for buffer in (replay_buffer, offline_replay_buffer):
+            if buffer is not None:
+                buffer.set_feature_encoder(
+                    policy.actor.encoder.get_cached_image_features, keys=policy.actor.encoder.image_keys
+                )
+
     logging.info("Starting learner thread")
     interaction_message = None
     optimization_step = resume_optimization_step if resume_optimization_step is not None else 0
@@ -350,6 +383,8 @@ def add_actor_information_and_train(
     # Initialize iterators
     online_iterator = None
     offline_iterator = None
+    # Whether the iterators yield the batches of all the critic updates of an optimization step at once
+    fused = False
 
     # NOTE: THIS IS THE MAIN LOOP OF THE LEARNER
     while True:
@@ -380,26 +415,52 @@ def add_actor_information_and_train(
         if len(replay_buffer) < online_step_before_learning:
             continue
 
+        # With fused UTD, each sample holds the batches of all the critic updates of an optimization step. The
+        # buffers are sampled for each update until they hold that many transitions, as a smaller fused batch
+        # couldn't be split into `utd_ratio` batches.
+        if fused_utd and not fused:
+            fused = len(replay_buffer) >= batch_size * utd_ratio and (
+                offline_replay_buffer is None or len(offline_replay_buffer) >= batch_size * utd_ratio
+            )
+            if fused:
+                for iterator in (online_iterator, offline_iterator):
+                    if iterator is not None:
+                        iterator.close()
+                online_iterator, offline_iterator = None, None
+        iterator_batch_size = batch_size * utd_ratio if fused else batch_size
+
         if online_iterator is None:
             online_iterator = replay_buffer.get_iterator(
-                batch_size=batch_size, async_prefetch=async_prefetch, queue_size=2
+                batch_size=iterator_batch_size,
+                async_prefetch=async_prefetch,
+                queue_size=2,
+                cuda_prefetch=cuda_prefetch,
             )
 
         if offline_replay_buffer is not None and offline_iterator is None:
             offline_iterator = offline_replay_buffer.get_iterator(
-                batch_size=batch_size, async_prefetch=async_prefetch, queue_size=2
+                batch_size=iterator_batch_size,
+                async_prefetch=async_prefetch,
+                queue_size=2,
+                cuda_prefetch=cuda_prefetch,
             )
 
+        if prioritized_replay.enable:
+            beta = prioritized_replay.beta_at(optimization_step)
+            replay_buffer.priority_beta = beta
+            if offline_replay_buffer is not None:
+                offline_replay_buffer.priority_beta = beta
+
         time_for_one_optimization_step = time.time()
+        utd_batches = iterate_utd_batches(
+            online_iterator=online_iterator,
+            offline_iterator=offline_iterator if dataset_repo_id is not None else None,
+            utd_ratio=utd_ratio,
+            fused=fused,
+        )
         for _ in range(utd_ratio - 1):
             # Sample from the iterators
-            batch = next(online_iterator)
-
-            if dataset_repo_id is not None:
-                batch_offline = next(offline_iterator)
-                batch = concatenate_batch_transitions(
-                    left_batch_transitions=batch, right_batch_transition=batch_offline
-                )
+            batch, online_indices, offline_indices = next(utd_batches)
 
             actions = batch[ACTION]
             rewards = batch["reward"]
@@ -409,7 +470,7 @@ def add_actor_information_and_train(
             check_nan_in_transition(observations=observations, actions=actions, next_state=next_observations)
 
             observation_features, next_observation_features = get_observation_features(
-                policy=policy, observations=observations, next_observations=next_observations
+                policy=policy, observations=observations, next_observations=next_observations, batch=batch
             )
 
             # Create a batch dictionary with all required elements for the forward method
@@ -422,6 +483,7 @@ def add_actor_information_and_train(
                 "observation_feature": observation_features,
                 "next_observation_feature": next_observation_features,
                 "complementary_info": batch["complementary_info"],
+                "weight": batch.get("weight"),
             }
 
             # Use the forward method for critic loss
@@ -436,6 +498,15 @@ def add_actor_information_and_train(
             )
             optimizers["critic"].step()
 
+            if prioritized_replay.enable:
+                update_replay_priorities(
+                    td_error=critic_output["td_error"],
+                    replay_buffer=replay_buffer,
+                    online_indices=online_indices,
+                    offline_replay_buffer=offline_replay_buffer,
+                    offline_indices=offline_indices,
+                )
+
             # Discrete critic optimization (if available)
             if policy.config.num_discrete_actions is not None:
                 discrete_critic_output = policy.forward(forward_batch, model="discrete_critic")
@@ -451,13 +522,7 @@ def add_actor_information_and_train(
             policy.update_target_networks()
 
         # Sample for the last update in the UTD ratio
-        batch = next(online_iterator)
-
-        if dataset_repo_id is not None:
-            batch_offline = next(offline_iterator)
-            batch = concatenate_batch_transitions(
-                left_batch_transitions=batch, right_batch_transition=batch_offline
-            )
+        batch, online_indices, offline_indices = next(utd_batches)
 
         actions = batch[ACTION]
         rewards = batch["reward"]
@@ -468,7 +533,7 @@ def add_actor_information_and_train(
         check_nan_in_transition(observations=observations, actions=actions, next_state=next_observations)
 
         observation_features, next_observation_features = get_observation_features(
-            policy=policy, observations=observations, next_observations=next_observations
+            policy=policy, observations=observations, next_observations=next_observations, batch=batch
         )
 
         # Create a batch dictionary with all required elements for the forward method
@@ -480,6 +545,7 @@ def add_actor_information_and_train(
             "done": done,
             "observation_feature": observation_features,
             "next_observation_feature": next_observation_features,
+            "weight": batch.get("weight"),
         }
 
         critic_output = policy.forward(forward_batch, model="critic")
@@ -492,6 +558,15 @@ def add_actor_information_and_train(
         ).item()
         optimizers["critic"].step()
 
+        if prioritized_replay.enable:
+            update_replay_priorities(
+                td_error=critic_output["td_error"],
+                replay_buffer=replay_buffer,
+                online_indices=online_indices,
+                offline_replay_buffer=offline_replay_buffer,
+                offline_indices=offline_indices,
+            )
+
         # Initialize training info dictionary
         training_infos = {
             "loss_critic": loss_critic.item(),
@@ -550,7 +625,9 @@ def add_actor_information_and_train(
 
         # Push policy to actors if needed
         if time.time() - last_time_policy_pushed > policy_parameters_push_frequency:
-            push_actor_policy_to_queue(parameters_queue=parameters_queue, policy=policy)
+            push_actor_policy_to_queue(
+                parameters_queue=parameters_queue, policy=policy, parameter_sync=parameter_sync
+            )
             last_time_policy_pushed = time.time()
 
         # Update target networks (main and discrete)
@@ -571,13 +648,20 @@ def add_actor_information_and_train(
         time_for_one_optimization_step = time.time() - time_for_one_optimization_step
         frequency_for_one_optimization_step = 1 / (time_for_one_optimization_step + 1e-9)
 
-        logging.info(f"[LEARNER] Optimization frequency loop [Hz]: {frequency_for_one_optimization_step}")
+        # Each optimization step performs `utd_ratio` critic updates
+        frequency_for_one_critic_update = utd_ratio * frequency_for_one_optimization_step
+
+        logging.info(
+            f"[LEARNER] Optimization frequency loop [Hz]: {frequency_for_one_optimization_step}, "
+            f"critic updates [Hz]: {frequency_for_one_critic_update}"
+        )
 
         # Log optimization frequency
         if wandb_logger:
             wandb_logger.log_dict(
                 {
                     "Optimization frequency loop [Hz]": frequency_for_one_optimization_step,
+                    "Critic update frequency [Hz]": frequency_for_one_critic_update,
                     "Optimization step": optimization_step,
                 },
                 mode="train",
@@ -735,6 +819,14 @@ def save_training_checkpoint(
     # Update the "last" symlink
     update_last_checkpoint(checkpoint_dir)
 
+    if cfg.policy.memmap_replay_buffer:
+        # The buffers already live on disk: only their header needs to be updated
+        replay_buffer.flush()
+        if offline_replay_buffer is not None:
+            offline_replay_buffer.flush()
+        logging.info("Resume training")
+        return
+
     # TODO : temporary save replay buffer here, remove later when on the robot
     # We want to control this with the keyboard inputs
     dataset_dir = os.path.join(cfg.output_dir, "dataset")
@@ -946,13 +1038,26 @@ def initialize_replay_buffer(
     Returns:
         ReplayBuffer: Initialized replay buffer
     """
-    if not cfg.resume:
+    storage_dir = None
+    if cfg.policy.memmap_replay_buffer:
+        storage_dir = os.path.join(cfg.output_dir, REPLAY_BUFFER_DIR)
+
+    # A disk-backed buffer resumes from its own files
+    if not cfg.resume or (
+        storage_dir is not None and os.path.exists(os.path.join(storage_dir, REPLAY_BUFFER_HEADER))
+    ):
         return ReplayBuffer(
             capacity=cfg.policy.online_buffer_capacity,
             device=device,
             state_keys=cfg.policy.input_features.keys(),
             storage_device=storage_device,
             optimize_memory=True,
+            store_images_as_uint8=cfg.policy.store_images_as_uint8,
+            prioritized=cfg.prioritized_replay.enable,
+            priority_alpha=cfg.prioritized_replay.alpha,
+            priority_beta=cfg.prioritized_replay.beta,
+            priority_eps=cfg.prioritized_replay.eps,
+            storage_dir=storage_dir,
         )
 
     logging.info("Resume training load the online dataset")
@@ -972,6 +1077,12 @@ def initialize_replay_buffer(
         device=device,
         state_keys=cfg.policy.input_features.keys(),
         optimize_memory=True,
+        store_images_as_uint8=cfg.policy.store_images_as_uint8,
+        prioritized=cfg.prioritized_replay.enable,
+        priority_alpha=cfg.prioritized_replay.alpha,
+        priority_beta=cfg.prioritized_replay.beta,
+        priority_eps=cfg.prioritized_replay.eps,
+        storage_dir=storage_dir,
     )
 
 
@@ -991,6 +1102,25 @@ def initialize_offline_replay_buffer(
     Returns:
         ReplayBuffer: Initialized offline replay buffer
     """
+    storage_dir = None
+    if cfg.policy.memmap_replay_buffer:
+        storage_dir = os.path.join(cfg.output_dir, OFFLINE_REPLAY_BUFFER_DIR)
+        if cfg.resume and os.path.exists(os.path.join(storage_dir, REPLAY_BUFFER_HEADER)):
+            logging.info("Reopen the offline replay buffer")
+            return ReplayBuffer(
+                capacity=cfg.policy.offline_buffer_capacity,
+                device=device,
+                state_keys=cfg.policy.input_features.keys(),
+                storage_device=storage_device,
+                optimize_memory=True,
+                store_images_as_uint8=cfg.policy.store_images_as_uint8,
+                prioritized=cfg.prioritized_replay.enable,
+                priority_alpha=cfg.prioritized_replay.alpha,
+                priority_beta=cfg.prioritized_replay.beta,
+                priority_eps=cfg.prioritized_replay.eps,
+                storage_dir=storage_dir,
+            )
+
     if not cfg.resume:
         logging.info("make_dataset offline buffer")
         offline_dataset = make_dataset(cfg)
@@ -1009,7 +1139,13 @@ def initialize_offline_replay_buffer(
         state_keys=cfg.policy.input_features.keys(),
         storage_device=storage_device,
         optimize_memory=True,
+        store_images_as_uint8=cfg.policy.store_images_as_uint8,
         capacity=cfg.policy.offline_buffer_capacity,
+        prioritized=cfg.prioritized_replay.enable,
+        priority_alpha=cfg.prioritized_replay.alpha,
+        priority_beta=cfg.prioritized_replay.beta,
+        priority_eps=cfg.prioritized_replay.eps,
+        storage_dir=storage_dir,
     )
     return offline_replay_buffer
 
@@ -1017,8 +1153,55 @@ def initialize_offline_replay_buffer(
 # Utilities/Helpers functions
 
 
+def iterate_utd_batches(
+    online_iterator: Iterator[BatchTransition],
+    offline_iterator: Iterator[BatchTransition] | None,
+    utd_ratio: int,
+    fused: bool = False,
+) -> Iterator[tuple[BatchTransition, torch.Tensor | None, torch.Tensor | None]]:
+    """
+    Yield the `utd_ratio` batches of one optimization step.
+
+    Without `fused`, each batch is sampled from the iterators. With `fused`, the iterators yield batches of
+    `utd_ratio * batch_size` transitions, which are sampled once and sliced on device.
+
+    Args:
+        online_iterator: Iterator over the online replay buffer
+        offline_iterator: Iterator over the offline replay buffer, if any
+        utd_ratio: The number of critic updates per optimization step
+        fused: Whether the iterators yield the batches of all the critic updates at once
+
+    Returns:
+        Iterator over (batch, online_indices, offline_indices), with the indices of the transitions in the
+        replay buffers (None without prioritized replay).
+    """
+    if fused:
+        online_batches = split_batch_transition(next(online_iterator), utd_ratio)
+        offline_batches = (
+            split_batch_transition(next(offline_iterator), utd_ratio)
+            if offline_iterator is not None
+            else None
+        )
+
+    for i in range(utd_ratio):
+        batch = online_batches[i] if fused else next(online_iterator)
+        online_indices, offline_indices = batch.get("index"), None
+
+        if offline_iterator is not None:
+            batch_offline = offline_batches[i] if fused else next(offline_iterator)
+            offline_indices = batch_offline.get("index")
+            batch = concatenate_batch_transitions(
+                left_batch_transitions=batch, right_batch_transition=batch_offline
+            )
+
+        yield batch, online_indices, offline_indices
+
+
 def get_observation_features(
-    policy: SACPolicy, observations: torch.Tensor, next_observations: torch.Tensor
+    policy: SACPolicy,
+    observations: torch.Tensor,
+    next_observations: torch.Tensor,
+    batch: BatchTransition | None = None,
 ) -> tuple[torch.Tensor | None, torch.Tensor | None]:
     """
     Get observation features from the policy encoder. It act as cache for the observation features.
@@ -1029,6 +1212,7 @@ def get_observation_features(
         policy: The policy model
         observations: The current observations
         next_observations: The next observations
+        batch: The sampled batch, whose features are returned if the replay buffers cached them
 
     Returns:
         tuple: observation_features, next_observation_features
@@ -1037,6 +1221,9 @@ def get_observation_features(
     if policy.config.vision_encoder_name is None or not policy.config.freeze_vision_encoder:
         return None, None
 
+    if batch is not None and "observation_feature" in batch:
+        return batch["observation_feature"], batch["next_observation_feature"]
+
     with torch.no_grad():
         observation_features = policy.actor.encoder.get_cached_image_features(observations)
         next_observation_features = policy.actor.encoder.get_cached_image_features(next_observations)
@@ -1094,20 +1281,26 @@ def check_nan_in_transition(
     return nan_detected
 
 
-def push_actor_policy_to_queue(parameters_queue: Queue, policy: nn.Module):
+def push_actor_policy_to_queue(
+    parameters_queue: Queue, policy: nn.Module, parameter_sync: ParameterSyncEncoder | None = None
+):
     logging.debug("[LEARNER] Pushing actor policy to the queue")
 
-    # Create a dictionary to hold all the state dicts
-    state_dicts = {"policy": move_state_dict_to_device(policy.actor.state_dict(), device="cpu")}
+    # Create a dictionary to hold all the modules to synchronize
+    modules = {"policy": policy.actor}
 
     # Add discrete critic if it exists
     if hasattr(policy, "discrete_critic") and policy.discrete_critic is not None:
-        state_dicts["discrete_critic"] = move_state_dict_to_device(
-            policy.discrete_critic.state_dict(), device="cpu"
-        )
+        modules["discrete_critic"] = policy.discrete_critic
         logging.debug("[LEARNER] Including discrete critic in state dict push")
 
-    state_bytes = state_to_bytes(state_dicts)
+    if parameter_sync is None:
+        parameter_sync = ParameterSyncEncoder(mode="full")
+
+    state_bytes = parameter_sync.encode(modules)
+    logging.debug(
+        f"[LEARNER] Parameters v{parameter_sync.version} serialized ({len(state_bytes) / 1024 / 1024:.2f} MB)"
+    )
     parameters_queue.put(state_bytes)
 
 
@@ -1126,6 +1319,35 @@ def process_interaction_message(
     return message
 
 
+def update_replay_priorities(
+    td_error: torch.Tensor,
+    replay_buffer: ReplayBuffer,
+    online_indices: torch.Tensor | None,
+    offline_replay_buffer: ReplayBuffer | None = None,
+    offline_indices: torch.Tensor | None = None,
+):
+    """Update the priorities of the sampled transitions with their critic TD-errors.
+
+    The batches are the concatenation of the online batch and (if any) the offline batch, in this order.
+
+    Args:
+        td_error: Absolute TD-error of each transition of the batch
+        replay_buffer: Online replay buffer
+        online_indices: Storage indices of the online transitions
+        offline_replay_buffer: Offline replay buffer
+        offline_indices: Storage indices of the offline transitions
+    """
+    num_online = 0
+    if online_indices is not None:
+        num_online = online_indices.shape[0]
+        replay_buffer.update_priorities(indices=online_indices, td_errors=td_error[:num_online])
+
+    if offline_replay_buffer is not None and offline_indices is not None:
+        offline_replay_buffer.update_priorities(
+            indices=offline_indices, td_errors=td_error[num_online : num_online + offline_indices.shape[0]]
+        )
+
+
 def process_transitions(
     transition_queue: Queue,
     replay_buffer: ReplayBuffer,
@@ -1145,28 +1367,42 @@ def process_transitions(
         shutdown_event: Event to signal shutdown
     """
     while not transition_queue.empty() and not shutdown_event.is_set():
-        transition_list = transition_queue.get()
-        transition_list = bytes_to_transitions(buffer=transition_list)
-
-        for transition in transition_list:
-            transition = move_transition_to_device(transition=transition, device=device)
-
-            # Skip transitions with NaN values
-            if check_nan_in_transition(
-                observations=transition["state"],
-                actions=transition[ACTION],
-                next_state=transition["next_state"],
-            ):
-                logging.warning("[LEARNER] NaN detected in transition, skipping")
-                continue
-
-            replay_buffer.add(**transition)
-
-            # Add to offline buffer if it's an intervention
-            if dataset_repo_id is not None and transition.get("complementary_info", {}).get(
-                TeleopEvents.IS_INTERVENTION
-            ):
-                offline_replay_buffer.add(**transition)
+        batch = batch_bytes_to_transitions(buffer=transition_queue.get())
+        batch = move_transition_to_device(transition=batch, device=device)
+
+        # Skip transitions with NaN values
+        num_transitions = batch[ACTION].shape[0]
+        valid = ~torch.isnan(batch[ACTION]).reshape(num_transitions, -1).any(dim=1)
+        for column in (batch["state"], batch["next_state"]):
+            for tensor in column.values():
+                if tensor.is_floating_point():
+                    valid &= ~torch.isnan(tensor).reshape(num_transitions, -1).any(dim=1)
+
+        if not valid.all():
+            logging.warning(f"[LEARNER] NaN detected in {int((~valid).sum())} transitions, skipping them")
+            batch = _select_transitions(batch, valid)
+
+        replay_buffer.add_batch(**batch)
+
+        # Add to offline buffer the transitions that are interventions
+        is_intervention = (batch.get("complementary_info") or {}).get(TeleopEvents.IS_INTERVENTION.value)
+        if dataset_repo_id is not None and is_intervention is not None:
+            interventions = is_intervention.reshape(is_intervention.shape[0], -1).any(dim=1)
+            if interventions.any():
+                offline_replay_buffer.add_batch(**_select_transitions(batch, interventions))
+
+
+def _select_transitions(batch: dict, mask: torch.Tensor) -> dict:
+    """Select the rows of a batched transition (as returned by `batch_bytes_to_transitions`)"""
+    selected = {}
+    for key, value in batch.items():
+        if isinstance(value, dict):
+            selected[key] = {k: v[mask] for k, v in value.items()}
+        elif isinstance(value, torch.Tensor):
+            selected[key] = value[mask]
+        else:
+            selected[key] = value
+    return selected
 
 
 def process_interaction_messages(
@@ -19,7 +19,7 @@ import logging
 import time
 from multiprocessing import Event, Queue
 
-from lerobot.rl.queue import get_last_item_from_queue
+from lerobot.rl.parameter_sync import get_last_parameter_updates
 from lerobot.transport import services_pb2, services_pb2_grpc
 from lerobot.transport.utils import receive_bytes_in_chunks, send_bytes_in_chunks
 
@@ -65,19 +65,20 @@ class LearnerService(services_pb2_grpc.LearnerServiceServicer):
                 continue
 
             logging.info("[LEARNER] Push parameters to the Actor")
-            buffer = get_last_item_from_queue(
+            buffers = get_last_parameter_updates(
                 self.parameters_queue, block=True, timeout=self.queue_get_timeout
             )
 
-            if buffer is None:
+            if not buffers:
                 continue
 
-            yield from send_bytes_in_chunks(
-                buffer,
-                services_pb2.Parameters,
-                log_prefix="[LEARNER] Sending parameters",
-                silent=True,
-            )
+            for buffer in buffers:
+                yield from send_bytes_in_chunks(
+                    buffer,
+                    services_pb2.Parameters,
+                    log_prefix="[LEARNER] Sending parameters",
+                    silent=True,
+                )
 
             last_push_time = time.time()
             logging.info("[LEARNER] Parameters sent")
@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Learner -> actor parameter synchronization.
+
+In "full" mode, every push carries the whole state dicts of the synchronized modules.
+
+In "delta" mode, a full push (keyframe) is sent every `full_sync_interval` pushes, and the pushes in between
+only carry the tensors that changed since the keyframe, as deltas against it (optionally cast to fp16/bf16 or
+quantized to int8). Deltas are taken against the keyframe rather than against the previous push, because the
+learner service only streams the most recent push and intermediate ones may never reach the actor. Each delta
+therefore only depends on the keyframe. The queues of pushes are drained with `get_last_parameter_updates`,
+which keeps the last keyframe along with the most recent push, so that the keyframe a delta is based on is
+never dropped.
+"""
+
+import logging
+
+import torch
+from torch import nn
+from torch.multiprocessing import Queue
+
+from lerobot.rl.queue import get_all_items_from_queue
+from lerobot.transport.utils import bytes_to_metadata, bytes_to_state_dict_and_metadata, state_to_bytes
+
+PARAMETER_SYNC_MODES = ["full", "delta"]
+PARAMETER_DELTA_DTYPES = ["float32", "float16", "bfloat16", "int8"]
+
+INT8_MAX = 127
+
+
+class ParameterSyncEncoder:
+    """Learner side: serializes the parameters of the synchronized modules for the actors"""
+
+    def __init__(self, mode: str = "full", delta_dtype: str = "float32", full_sync_interval: int = 10):
+        if mode not in PARAMETER_SYNC_MODES:
+            raise ValueError(f"Unknown parameter sync mode '{mode}'. Available: {PARAMETER_SYNC_MODES}")
+        if delta_dtype not in PARAMETER_DELTA_DTYPES:
+            raise ValueError(f"Unknown delta dtype '{delta_dtype}'. Available: {PARAMETER_DELTA_DTYPES}")
+        if full_sync_interval < 1:
+            raise ValueError(f"full_sync_interval must be positive, got {full_sync_interval}")
+
+        self.mode = mode
+        self.delta_dtype = delta_dtype
+        self.full_sync_interval = full_sync_interval
+
+        self.version = 0
+        self.keyframe_version: int | None = None
+        # Copy of the state dicts at the last keyframe, kept on the modules' device
+        self._keyframe: dict[str, dict[str, torch.Tensor]] = {}
+        # Keys of the tensors that changed at least once since the last keyframe
+        self._changed: dict[str, set[str]] = {}
+
+    def encode(self, modules: dict[str, nn.Module]) -> bytearray:
+        self.version += 1
+
+        if (
+            self.mode == "full"
+            or self.keyframe_version is None
+            or self.version - self.keyframe_version >= self.full_sync_interval
+            or self._keyframe.keys() != modules.keys()
+        ):
+            return self._encode_full(modules)
+
+        return self._encode_delta(modules)
+
+    def _encode_full(self, modules: dict[str, nn.Module]) -> bytearray:
+        state_dicts = {name: module.state_dict() for name, module in modules.items()}
+
+        if self.mode == "delta":
+            self.keyframe_version = self.version
+            self._keyframe = {
+                name: {key: tensor.detach().clone() for key, tensor in state_dict.items()}
+                for name, state_dict in state_dicts.items()
+            }
+            self._changed = {name: set() for name in state_dicts}
+
+        metadata = {"sync": "full", "version": self.version, "keyframe": self.mode == "delta"}
+        return state_to_bytes(state_dicts, metadata=metadata)
+
+    def _encode_delta(self, modules: dict[str, nn.Module]) -> bytearray:
+        deltas = {}
+        scales = {}
+        absolute = {}
+        for name, module in modules.items():
+            keyframe = self._keyframe[name]
+            changed = self._changed[name]
+            deltas[name], scales[name], absolute[name] = {}, {}, []
+
+            for key, tensor in module.state_dict().items():
+                tensor = tensor.detach()
+                if key not in changed:
+                    if torch.equal(tensor, keyframe[key]):
+                        continue
+                    changed.add(key)
+
+                if not tensor.is_floating_point():
+                    # e.g. BatchNorm's num_batches_tracked
+                    deltas[name][key] = tensor.cpu()
+                    absolute[name].append(key)
+                elif self.delta_dtype == "float32":
+                    # Lossless: send the new values rather than the delta
+                    deltas[name][key] = tensor.float().cpu()
+                    absolute[name].append(key)
+                else:
+                    deltas[name][key], scale = self._quantize(tensor - keyframe[key])
+                    if scale is not None:
+                        scales[name][key] = scale
+
+        metadata = {
+            "sync": "delta",
+            "version": self.version,
+            "base_version": self.keyframe_version,
+            "scales": scales,
+            "absolute": absolute,
+        }
+        return state_to_bytes(deltas, metadata=metadata)
+
+    def _quantize(self, delta: torch.Tensor) -> tuple[torch.Tensor, float | None]:
+        if self.delta_dtype == "int8":
+            # Symmetric per-tensor quantization
+            scale = delta.abs().max().item() / INT8_MAX
+            if scale == 0:
+                return torch.zeros_like(delta, dtype=torch.int8, device="cpu"), 0.0
+            quantized = torch.round(delta / scale).clamp_(-INT8_MAX, INT8_MAX).to(torch.int8)
+            return quantized.cpu(), scale
+
+        return delta.to(getattr(torch, self.delta_dtype)).cpu(), None
+
+
+def get_last_parameter_updates(
+    queue: Queue, block: bool = True, timeout: float = 0.1
+) -> list[bytes | bytearray]:
+    """Drains a queue of pushes serialized by `ParameterSyncEncoder`, returning the ones to apply in order: the
+    most recent push, preceded by the last keyframe when the most recent push is a delta based on it."""
+    pushes = get_all_items_from_queue(queue, block=block, timeout=timeout)
+    if not pushes:
+        return []
+
+    last_push = pushes[-1]
+    if bytes_to_metadata(last_push).get("sync", "full") == "delta":
+        for push in reversed(pushes[:-1]):
+            if bytes_to_metadata(push).get("keyframe", False):
+                return [push, last_push]
+    return [last_push]
+
+
+class ParameterSyncDecoder:
+    """Actor side: applies the parameters serialized by `ParameterSyncEncoder` in place"""
+
+    def __init__(self):
+        self.version: int | None = None
+        self.keyframe_version: int | None = None
+        self._keyframe: dict[str, dict[str, torch.Tensor]] = {}
+
+    def apply(self, buffer: bytes | bytearray, modules: dict[str, nn.Module]) -> bool:
+        """Updates `modules` from `buffer`. Returns False if the update was skipped."""
+        state_dicts, metadata = bytes_to_state_dict_and_metadata(buffer)
+
+        if metadata.get("sync", "full") == "full":
+            self._apply_full(state_dicts, metadata, modules)
+            return True
+
+        if metadata["base_version"] != self.keyframe_version:
+            logging.warning(
+                f"[ACTOR] Skipping parameters v{metadata['version']}: based on keyframe "
+                f"v{metadata['base_version']}, while the last keyframe received is v{self.keyframe_version}. "
+                "Waiting for the next full sync."
+            )
+            return False
+
+        self._apply_delta(state_dicts, metadata, modules)
+        return True
+
+    def _apply_full(self, state_dicts: dict, metadata: dict, modules: dict[str, nn.Module]) -> None:
+        for name, state_dict in state_dicts.items():
+            if name in modules:
+                # Copies into the existing parameters (and across devices), without reallocating them
+                modules[name].load_state_dict(state_dict)
+
+        self.version = metadata.get("version")
+        if metadata.get("keyframe", False):
+            self.keyframe_version = self.version
+            self._keyframe = {
+                name: {key: tensor.detach().clone() for key, tensor in modules[name].state_dict().items()}
+                for name in state_dicts
+                if name in modules
+            }
+
+    @torch.no_grad()
+    def _apply_delta(self, state_dicts: dict, metadata: dict, modules: dict[str, nn.Module]) -> None:
+        for name, deltas in state_dicts.items():
+            if name not in modules:
+                continue
+
+            targets = modules[name].state_dict()
+            keyframe = self._keyframe[name]
+            absolute = set(metadata["absolute"].get(name, []))
+            scales = metadata["scales"].get(name, {})
+
+            for key, delta in deltas.items():
+                target = targets[key]
+                if key in absolute:
+                    target.copy_(delta)
+                    continue
+
+                delta = delta.to(device=target.device, dtype=target.dtype)
+                torch.add(keyframe[key], delta, alpha=scales.get(key, 1.0), out=target)
+
+        self.version = metadata["version"]
@@ -23,30 +23,36 @@ from torch.multiprocessing import Queue
 
 
 def get_last_item_from_queue(queue: Queue, block=True, timeout: float = 0.1) -> Any:
+    # Drain queue and keep only the most recent parameters
+    items = get_all_items_from_queue(queue, block=block, timeout=timeout)
+    return items[-1] if items else None
+
+
+def get_all_items_from_queue(queue: Queue, block=True, timeout: float = 0.1) -> list[Any]:
+    """Drains the queue, returning its items from the oldest to the most recent. With `block`, waits up to
+    `timeout` for the first item."""
+    items = []
     if block:
         try:
-            item = queue.get(timeout=timeout)
+            items.append(queue.get(timeout=timeout))
         except Empty:
-            return None
-    else:
-        item = None
+            return items
 
-    # Drain queue and keep only the most recent parameters
     if platform.system() == "Darwin":
         # On Mac, avoid using `qsize` due to unreliable implementation.
         # There is a comment on `qsize` code in the Python source:
         # Raises NotImplementedError on Mac OSX because of broken sem_getvalue()
         try:
             while True:
-                item = queue.get_nowait()
+                items.append(queue.get_nowait())
         except Empty:
             pass
 
-        return item
+        return items
 
     # Details about using qsize in https://github.com/huggingface/lerobot/issues/1523
     while queue.qsize() > 0:
         with suppress(Empty):
-            item = queue.get_nowait()
+            items.append(queue.get_nowait())
 
-    return item
+    return items
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import torch
+
+
+class SumTree:
+    """Binary sum-tree over `capacity` non-negative priorities, stored as a flat tensor.
+
+    Node `i` has children `2 * i` and `2 * i + 1`, the root is node 1 and the leaves are nodes
+    `[num_leaves, 2 * num_leaves)`. Updates and sampling are vectorized over the batch, and both take
+    O(log(capacity)) tensor operations.
+    """
+
+    def __init__(self, capacity: int, device: str | torch.device = "cpu"):
+        if capacity <= 0:
+            raise ValueError("Capacity must be greater than 0.")
+
+        self.capacity = capacity
+        self.depth = max(1, (capacity - 1).bit_length())
+        self.num_leaves = 1 << self.depth
+        # float64 keeps the rounding errors of the partial sums small for large buffers
+        self.tree = torch.zeros(2 * self.num_leaves, dtype=torch.float64, device=device)
+
+    @property
+    def total(self) -> float:
+        return self.tree[1].item()
+
+    def get(self, indices: torch.Tensor) -> torch.Tensor:
+        return self.tree[indices + self.num_leaves]
+
+    def update(self, indices: torch.Tensor, priorities: torch.Tensor) -> None:
+        """Sets the priorities of the leaves `indices`. For duplicated indices, one of their priorities is kept."""
+        nodes = indices.to(device=self.tree.device, dtype=torch.long) + self.num_leaves
+        self.tree.index_put_((nodes,), priorities.to(self.tree), accumulate=False)
+
+        for _ in range(self.depth):
+            nodes = torch.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def sample(self, batch_size: int) -> tuple[torch.Tensor, torch.Tensor]:
+        """Stratified sampling of `batch_size` leaves with probability proportional to their priority.
+
+        Returns:
+            The leaf indices and their priorities.
+        """
+        device = self.tree.device
+        total = self.tree[1]
+        # One uniform sample per segment of the [0, total) range
+        segment = total / batch_size
+        values = (torch.arange(batch_size, device=device) + torch.rand(batch_size, device=device)) * segment
+
+        nodes = torch.ones(batch_size, dtype=torch.long, device=device)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            left_sum = self.tree[left]
+            # Because of rounding errors, `values` can exceed the sum of a subtree: never go right towards
+            # a subtree of zero priority
+            go_right = (values >= left_sum) & (self.tree[left + 1] > 0)
+            values = torch.where(go_right, values - left_sum, values)
+            nodes = left + go_right.long()
+
+        return nodes - self.num_leaves, self.tree[nodes]
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measures the planning throughput of TD-MPC: the MPPI/CEM planner (`TDMPCPolicy.plan`) is run on random latent
+states, with the eager value estimation and with the compiled one (`--policy.compile_planner`).
+
+Plans are run back to back without resetting the policy, so that every plan is warm started from the previous
+one as during a rollout.
+
+Example:
+
+```shell
+lerobot-benchmark-planner \
+    --policy.path=outputs/train/tdmpc_pusht/checkpoints/last/pretrained_model \
+    --policy.device=cuda \
+    --batch_size=1 \
+    --num_plans=200
+```
+"""
+
+import logging
+import time
+from dataclasses import dataclass, replace
+from pprint import pformat
+
+import numpy as np
+import torch
+
+from lerobot.configs import parser
+from lerobot.configs.policies import PreTrainedConfig
+from lerobot.policies.factory import get_policy_class
+from lerobot.utils.import_utils import register_third_party_devices
+from lerobot.utils.random_utils import set_seed
+from lerobot.utils.utils import get_safe_torch_device, init_logging
+
+
+@dataclass
+class BenchmarkPlannerConfig:
+    policy: PreTrainedConfig | None = None
+    # Number of environments planned for at once
+    batch_size: int = 1
+    # Number of measured plans
+    num_plans: int = 100
+    # Number of plans run before measuring, which includes the compilation
+    num_warmup: int = 10
+    seed: int = 1000
+
+    def __post_init__(self):
+        # HACK: We parse again the cli args here to get the pretrained path if there was one.
+        policy_path = parser.get_path_arg("policy")
+        if policy_path:
+            cli_overrides = parser.get_cli_overrides("policy")
+            self.policy = PreTrainedConfig.from_pretrained(policy_path, cli_overrides=cli_overrides)
+            self.policy.pretrained_path = policy_path
+
+        if self.policy is None or not self.policy.pretrained_path:
+            raise ValueError("A pretrained policy must be provided with `--policy.path`")
+
+        if self.policy.type != "tdmpc":
+            raise ValueError(f"Planning is only benchmarked for TD-MPC policies, got '{self.policy.type}'")
+
+    @classmethod
+    def __get_path_fields__(cls) -> list[str]:
+        """This enables the parser to load config from the policy using `--policy.path=local/dir`"""
+        return ["policy"]
+
+
+@torch.no_grad()
+def measure_planning(cfg: BenchmarkPlannerConfig, compile_planner: bool) -> list[float]:
+    """Latencies, in seconds, of `num_plans` consecutive plans."""
+    policy_cfg = replace(cfg.policy, compile_planner=compile_planner)
+    policy = get_policy_class(policy_cfg.type).from_pretrained(policy_cfg.pretrained_path, config=policy_cfg)
+    device = get_safe_torch_device(policy_cfg.device)
+    policy.to(device)
+    policy.eval()
+    policy.reset()
+
+    set_seed(cfg.seed)
+    latencies = []
+    for i in range(cfg.num_warmup + cfg.num_plans):
+        z = torch.rand(cfg.batch_size, policy_cfg.latent_dim, device=device)
+        start = time.perf_counter()
+        # Moving the actions to the CPU waits for the device to be done with the plan
+        policy.plan(z).cpu()
+        if i >= cfg.num_warmup:
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+@parser.wrap()
+def benchmark_planner(cfg: BenchmarkPlannerConfig) -> dict:
+    init_logging()
+    logging.info(pformat(cfg))
+
+    # Candidate trajectories evaluated per plan, for each environment
+    n_candidates = cfg.policy.cem_iterations * (cfg.policy.n_gaussian_samples + cfg.policy.n_pi_samples)
+
+    results = {}
+    for name, compile_planner in [("eager", False), ("compiled", True)]:
+        latencies = np.array(measure_planning(cfg, compile_planner))
+        results[name] = {
+            "plan_latency_ms": float(latencies.mean() * 1e3),
+            "plans_per_s": float(cfg.batch_size / latencies.mean()),
+            "trajectories_per_s": float(cfg.batch_size * n_candidates / latencies.mean()),
+        }
+        logging.info(
+            f"{name}: {results[name]['plan_latency_ms']:.2f} ms per plan | "
+            f"p95 {np.percentile(latencies, 95) * 1e3:.2f} ms | "
+            f"{results[name]['plans_per_s']:.1f} plans/s | "
+            f"{results[name]['trajectories_per_s']:.0f} trajectories/s"
+        )
+
+    results["speedup"] = results["eager"]["plan_latency_ms"] / results["compiled"]["plan_latency_ms"]
+    logging.info(f"Speedup: {results['speedup']:.2f}x")
+    return results
+
+
+def main():
+    register_third_party_devices()
+    benchmark_planner()
+
+
+if __name__ == "__main__":
+    main()
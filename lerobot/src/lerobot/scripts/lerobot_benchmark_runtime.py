@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compares the latency and the actions of a policy runtime (see `lerobot.policies.runtime`) against the eager
+float policy on CPU, on frames sampled from a dataset.
+
+Each frame is run through the pre-processor, `select_action` (after a reset, so that every call runs the
+model) and the post-processor of both policies, with the same random seed so that sampling policies draw the
+same noise. The action error is measured on the post-processed actions, in the units of the robot.
+
+Example:
+
+```shell
+lerobot-benchmark-runtime \
+    --policy.path=${HF_USER}/my_policy \
+    --dataset.repo_id=${HF_USER}/umbra03 \
+    --runtime=cpu_int8 \
+    --num_samples=100
+```
+"""
+
+import logging
+import time
+from dataclasses import dataclass, replace
+from pprint import pformat
+
+import numpy as np
+import torch
+
+from lerobot.configs import parser
+from lerobot.configs.default import DatasetConfig
+from lerobot.configs.policies import POLICY_RUNTIMES, PreTrainedConfig
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.policies.factory import make_policy, make_pre_post_processors
+from lerobot.policies.runtime import apply_policy_runtime
+from lerobot.utils.constants import OBS_STR
+from lerobot.utils.import_utils import register_third_party_devices
+from lerobot.utils.utils import init_logging
+
+
+@dataclass
+class BenchmarkRuntimeConfig:
+    dataset: DatasetConfig
+    policy: PreTrainedConfig | None = None
+    # Runtime compared against the eager float policy
+    runtime: str = "cpu_int8"
+    # Number of frames, evenly spaced over the dataset
+    num_samples: int = 100
+    # Number of frames run before measuring the latency
+    num_warmup: int = 5
+    # Number of CPU threads used by torch. Defaults to the torch default
+    num_threads: int | None = None
+    seed: int = 1000
+
+    def __post_init__(self):
+        # HACK: We parse again the cli args here to get the pretrained path if there was one.
+        policy_path = parser.get_path_arg("policy")
+        if policy_path:
+            cli_overrides = parser.get_cli_overrides("policy")
+            self.policy = PreTrainedConfig.from_pretrained(policy_path, cli_overrides=cli_overrides)
+            self.policy.pretrained_path = policy_path
+
+        if self.policy is None or not self.policy.pretrained_path:
+            raise ValueError("A pretrained policy must be provided with `--policy.path`")
+
+        if self.runtime not in POLICY_RUNTIMES:
+            raise ValueError(f"runtime must be one of {POLICY_RUNTIMES}, got {self.runtime}")
+
+    @classmethod
+    def __get_path_fields__(cls) -> list[str]:
+        """This enables the parser to load config from the policy using `--policy.path=local/dir`"""
+        return ["policy"]
+
+
+def make_runtime_policy(cfg: BenchmarkRuntimeConfig, runtime: str, dataset: LeRobotDataset):
+    """Loads the policy and its processors on CPU, for `runtime`."""
+    policy_cfg = replace(cfg.policy, device="cpu", runtime=runtime)
+    policy = make_policy(policy_cfg, ds_meta=dataset.meta)
+    preprocessor, postprocessor = make_pre_post_processors(
+        policy_cfg=policy_cfg,
+        pretrained_path=policy_cfg.pretrained_path,
+        preprocessor_overrides={"device_processor": {"device": "cpu"}},
+        postprocessor_overrides={"device_processor": {"device": "cpu"}},
+    )
+    policy = apply_policy_runtime(policy, preprocessor, postprocessor)
+    policy.eval()
+    return policy, preprocessor, postprocessor
+
+
+@torch.inference_mode()
+def run_policy(
+    policy, preprocessor, postprocessor, observation: dict, seed: int
+) -> tuple[torch.Tensor, float]:
+    """Runs the policy on one observation, returning the post-processed action and the latency in seconds."""
+    torch.manual_seed(seed)
+    policy.reset()
+    preprocessor.reset()
+    postprocessor.reset()
+
+    start = time.perf_counter()
+    action = postprocessor(policy.select_action(preprocessor(dict(observation))))
+    return action.squeeze(0), time.perf_counter() - start
+
+
+def latency_stats(latencies: list[float]) -> str:
+    latencies_ms = np.array(latencies) * 1e3
+    return (
+        f"mean {latencies_ms.mean():.1f} ms | p50 {np.percentile(latencies_ms, 50):.1f} ms | "
+        f"p95 {np.percentile(latencies_ms, 95):.1f} ms | max {latencies_ms.max():.1f} ms"
+    )
+
+
+@parser.wrap()
+def benchmark_runtime(cfg: BenchmarkRuntimeConfig) -> dict:
+    init_logging()
+    logging.info(pformat(cfg))
+
+    if cfg.num_threads is not None:
+        torch.set_num_threads(cfg.num_threads)
+
+    dataset = LeRobotDataset(
+        cfg.dataset.repo_id,
+        root=cfg.dataset.root,
+        episodes=cfg.dataset.episodes,
+        revision=cfg.dataset.revision,
+        video_backend=cfg.dataset.video_backend,
+    )
+    indices = np.linspace(0, len(dataset) - 1, cfg.num_samples + cfg.num_warmup).round().astype(int)
+
+    eager = make_runtime_policy(cfg, "eager", dataset)
+    runtime = make_runtime_policy(cfg, cfg.runtime, dataset)
+
+    eager_latencies, runtime_latencies, errors = [], [], []
+    for i, index in enumerate(indices):
+        item = dataset[int(index)]
+        observation = {key: value for key, value in item.items() if key.startswith(OBS_STR)}
+        observation["task"] = item["task"]
+
+        eager_action, eager_latency = run_policy(*eager, observation, cfg.seed + i)
+        runtime_action, runtime_latency = run_policy(*runtime, observation, cfg.seed + i)
+        if i < cfg.num_warmup:
+            continue
+        eager_latencies.append(eager_latency)
+        runtime_latencies.append(runtime_latency)
+        errors.append((runtime_action - eager_action).abs())
+
+    errors = torch.stack(errors)
+    results = {
+        "eager_latency_s": float(np.mean(eager_latencies)),
+        "runtime_latency_s": float(np.mean(runtime_latencies)),
+        "speedup": float(np.mean(eager_latencies) / np.mean(runtime_latencies)),
+        "action_mae": errors.mean().item(),
+        "action_max_error": errors.max().item(),
+        "action_mae_per_dim": errors.mean(dim=0).tolist(),
+    }
+
+    logging.info(f"eager: {latency_stats(eager_latencies)}")
+    logging.info(f"{cfg.runtime}: {latency_stats(runtime_latencies)}")
+    logging.info(f"Speedup: {results['speedup']:.2f}x")
+    logging.info(
+        f"Action error over {len(errors)} frames: mean {results['action_mae']:.4g} | "
+        f"max {results['action_max_error']:.4g}"
+    )
+    logging.info(f"Mean action error per dimension: {[round(e, 4) for e in results['action_mae_per_dim']]}")
+    return results
+
+
+def main():
+    register_third_party_devices()
+    benchmark_runtime()
+
+
+if __name__ == "__main__":
+    main()
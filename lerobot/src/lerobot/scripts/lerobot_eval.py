@@ -118,6 +118,8 @@ def rollout(
         "done": A (batch, sequence) tensor of **cumulative** done conditions. For any given batch element,
             the first True is followed by True's all the way till the end. This can be used for masking
             extraneous elements from the sequences above.
+        "policy_step_s": A (sequence,) tensor of the wall time, in seconds, taken by the pre-processor, the
+            policy and the post-processor to produce the actions of the batch at each step.
 
     Args:
         env: The batch of environments.
@@ -144,6 +146,7 @@ def rollout(
     all_rewards = []
     all_successes = []
     all_dones = []
+    all_policy_step_s = []
 
     step = 0
     # Keep track of which environments are done.
@@ -165,13 +168,15 @@ def rollout(
         # Infer "task" from attributes of environments.
         # TODO: works with SyncVectorEnv but not AsyncVectorEnv
         observation = add_envs_task(env, observation)
+        policy_step_start = time.perf_counter()
         observation = preprocessor(observation)
         with torch.inference_mode():
             action = policy.select_action(observation)
         action = postprocessor(action)
 
-        # Convert to CPU / numpy.
+        # Convert to CPU / numpy. This waits for the device, so the measured time includes the policy compute.
         action_numpy: np.ndarray = action.to("cpu").numpy()
+        all_policy_step_s.append(time.perf_counter() - policy_step_start)
         assert action_numpy.ndim == 2, "Action dimensions should be (batch, action_dim)"
 
         # Apply the next action.
@@ -223,6 +228,7 @@ def rollout(
         "reward": torch.stack(all_rewards, dim=1),
         "success": torch.stack(all_successes, dim=1),
         "done": torch.stack(all_dones, dim=1),
+        "policy_step_s": torch.tensor(all_policy_step_s),
     }
     if return_observations:
         stacked_observations = {}
@@ -281,6 +287,7 @@ def eval_policy(
     max_rewards = []
     all_successes = []
     all_seeds = []
+    all_policy_step_s = []
     threads = []  # for video saving threads
     n_episodes_rendered = 0  # for saving the correct number of videos
 
@@ -342,6 +349,7 @@ def eval_policy(
         max_rewards.extend(batch_max_rewards.tolist())
         batch_successes = einops.reduce((rollout_data["success"] * mask), "b n -> b", "any")
         all_successes.extend(batch_successes.tolist())
+        all_policy_step_s.extend(rollout_data["policy_step_s"].tolist())
         if seeds:
             all_seeds.extend(seeds)
         else:
@@ -423,6 +431,7 @@ def eval_policy(
             "pc_success": float(np.nanmean(all_successes[:n_episodes]) * 100),
             "eval_s": time.time() - start,
             "eval_ep_s": (time.time() - start) / n_episodes,
+            **policy_step_metrics(all_policy_step_s),
         },
     }
 
@@ -435,6 +444,21 @@ def eval_policy(
     return info
 
 
+def policy_step_metrics(policy_step_s: list[float]) -> dict[str, float]:
+    """Mean and 95th percentile, in milliseconds, of the wall time taken by the policy at each rollout step.
+
+    Policies predicting chunks of actions only run their model at some of the steps: the mean reflects the
+    overall cost of the policy, the 95th percentile the latency of the steps where the model runs.
+    """
+    if not policy_step_s:
+        return {"avg_policy_step_ms": float("nan"), "p95_policy_step_ms": float("nan")}
+    policy_step_ms = np.array(policy_step_s) * 1e3
+    return {
+        "avg_policy_step_ms": float(policy_step_ms.mean()),
+        "p95_policy_step_ms": float(np.percentile(policy_step_ms, 95)),
+    }
+
+
 def _compile_episode_data(
     rollout_data: dict, done_indices: Tensor, start_episode_index: int, start_data_index: int, fps: float
 ) -> dict:
@@ -552,9 +576,18 @@ class TaskMetrics(TypedDict):
     max_rewards: list[float]
     successes: list[bool]
     video_paths: list[str]
+    avg_policy_step_ms: float
+    p95_policy_step_ms: float
 
 
-ACC_KEYS = ("sum_rewards", "max_rewards", "successes", "video_paths")
+ACC_KEYS = (
+    "sum_rewards",
+    "max_rewards",
+    "successes",
+    "video_paths",
+    "avg_policy_step_ms",
+    "p95_policy_step_ms",
+)
 
 
 def eval_one(
@@ -591,6 +624,8 @@ def eval_one(
         max_rewards=[ep["max_reward"] for ep in per_episode],
         successes=[ep["success"] for ep in per_episode],
         video_paths=task_result.get("video_paths", []),
+        avg_policy_step_ms=task_result["aggregated"]["avg_policy_step_ms"],
+        p95_policy_step_ms=task_result["aggregated"]["p95_policy_step_ms"],
     )
 
 
@@ -684,6 +719,9 @@ def eval_policy_all(
         _append("sum_rewards", metrics.get("sum_rewards"))
         _append("max_rewards", metrics.get("max_rewards"))
         _append("successes", metrics.get("successes"))
+        # the policy step timings are per task, averaged over the tasks
+        _append("avg_policy_step_ms", metrics.get("avg_policy_step_ms"))
+        _append("p95_policy_step_ms", metrics.get("p95_policy_step_ms"))
         # video_paths is list-like
         paths = metrics.get("video_paths", [])
         if paths:
@@ -737,6 +775,8 @@ def eval_policy_all(
             "avg_max_reward": _agg_from_list(acc["max_rewards"]),
             "pc_success": _agg_from_list(acc["successes"]) * 100 if acc["successes"] else float("nan"),
             "n_episodes": len(acc["sum_rewards"]),
+            "avg_policy_step_ms": _agg_from_list(acc["avg_policy_step_ms"]),
+            "p95_policy_step_ms": _agg_from_list(acc["p95_policy_step_ms"]),
             "video_paths": list(acc["video_paths"]),
         }
 
@@ -748,6 +788,8 @@ def eval_policy_all(
         "n_episodes": len(overall["sum_rewards"]),
         "eval_s": time.time() - start_t,
         "eval_ep_s": (time.time() - start_t) / max(1, len(overall["sum_rewards"])),
+        "avg_policy_step_ms": _agg_from_list(overall["avg_policy_step_ms"]),
+        "p95_policy_step_ms": _agg_from_list(overall["p95_policy_step_ms"]),
         "video_paths": list(overall["video_paths"]),
     }
 
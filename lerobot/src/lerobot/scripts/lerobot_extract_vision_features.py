@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Precomputes the frozen vision features of the frames of a dataset, to fine-tune a policy whose vision encoder
+is frozen (e.g. SmolVLA with `freeze_vision_encoder=true`) without decoding and encoding the camera frames at
+every training step. See `lerobot.datasets.feature_cache`.
+
+The features are extracted with the pretrained policy the fine-tuning starts from, and are only valid for it.
+Running it again on an existing cache only extracts the frames it misses (e.g. after an interruption, or for
+other episodes), `--overwrite=true` starts from an empty cache instead.
+
+Example:
+
+```shell
+lerobot-extract-vision-features \
+    --policy.path=lerobot/smolvla_base \
+    --dataset.repo_id=${HF_USER}/umbra03 \
+    --output_dir=outputs/vision_features/umbra03
+
+lerobot-train \
+    --policy.path=lerobot/smolvla_base \
+    --dataset.repo_id=${HF_USER}/umbra03 \
+    --dataset.vision_feature_cache=outputs/vision_features/umbra03
+```
+"""
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from pprint import pformat
+
+import torch
+from tqdm import tqdm
+
+from lerobot.configs import parser
+from lerobot.configs.default import DatasetConfig
+from lerobot.configs.policies import PreTrainedConfig
+from lerobot.datasets.feature_cache import VisionFeatureCache
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.policies.factory import make_policy, make_pre_post_processors
+from lerobot.utils.import_utils import register_third_party_devices
+from lerobot.utils.utils import init_logging
+
+
+@dataclass
+class ExtractVisionFeaturesConfig:
+    dataset: DatasetConfig
+    policy: PreTrainedConfig | None = None
+    # Directory of the cache. Defaults to "vision_features" in the root of the dataset
+    output_dir: str | None = None
+    batch_size: int = 32
+    num_workers: int = 4
+    # Storage dtype of the features
+    dtype: str = "float16"
+    # Whether to replace an existing cache in `output_dir` rather than completing it with the missing frames
+    overwrite: bool = False
+
+    def __post_init__(self):
+        # HACK: We parse again the cli args here to get the pretrained path if there was one.
+        policy_path = parser.get_path_arg("policy")
+        if policy_path:
+            cli_overrides = parser.get_cli_overrides("policy")
+            self.policy = PreTrainedConfig.from_pretrained(policy_path, cli_overrides=cli_overrides)
+            self.policy.pretrained_path = policy_path
+
+        if self.policy is None or not self.policy.pretrained_path:
+            raise ValueError("A pretrained policy must be provided with `--policy.path`")
+
+        if not hasattr(self.policy, "vision_features_signature"):
+            raise ValueError(f"Vision features can't be precomputed for the policy '{self.policy.type}'")
+
+    @classmethod
+    def __get_path_fields__(cls) -> list[str]:
+        """This enables the parser to load config from the policy using `--policy.path=local/dir`"""
+        return ["policy"]
+
+
+@parser.wrap()
+def extract_vision_features(cfg: ExtractVisionFeaturesConfig) -> VisionFeatureCache | None:
+    init_logging()
+    logging.info(pformat(cfg))
+
+    # Without delta timestamps, the items hold the current frame of each camera
+    dataset = LeRobotDataset(
+        cfg.dataset.repo_id,
+        root=cfg.dataset.root,
+        episodes=cfg.dataset.episodes,
+        revision=cfg.dataset.revision,
+        video_backend=cfg.dataset.video_backend,
+    )
+    policy = make_policy(cfg.policy, ds_meta=dataset.meta)
+    policy.eval()
+    preprocessor, _ = make_pre_post_processors(
+        policy_cfg=cfg.policy, pretrained_path=cfg.policy.pretrained_path
+    )
+
+    output_dir = Path(cfg.output_dir) if cfg.output_dir else dataset.root / "vision_features"
+    dataloader = torch.utils.data.DataLoader(
+        dataset,
+        batch_size=cfg.batch_size,
+        num_workers=cfg.num_workers,
+        shuffle=False,
+        pin_memory=cfg.policy.device != "cpu",
+    )
+
+    cache = None
+    vision_weights_hash = policy.vision_weights_hash()
+    with torch.inference_mode():
+        for batch in tqdm(dataloader, desc="Extracting vision features"):
+            indices = batch["index"].numpy()
+            # Frames extracted by a previous run, e.g. an interrupted one
+            if cache is not None and cache.is_written(indices):
+                continue
+            features = policy.encode_vision_features(preprocessor(batch))
+            features = {key: feature.float().cpu().numpy() for key, feature in features.items()}
+            if cache is None:
+                cache = VisionFeatureCache.create(
+                    output_dir,
+                    camera_keys=list(features),
+                    num_frames=dataset.meta.total_frames,
+                    shape=next(iter(features.values())).shape[1:],
+                    dtype=cfg.dtype,
+                    signature=cfg.policy.vision_features_signature(),
+                    vision_weights_hash=vision_weights_hash,
+                    pretrained_path=str(cfg.policy.pretrained_path),
+                    overwrite=cfg.overwrite,
+                )
+            cache.write(indices, features)
+
+    if cache is None:
+        logging.warning("The selected episodes have no frames, no vision features were extracted")
+        return None
+    cache.flush()
+
+    logging.info(f"Wrote the features of {cache.camera_keys} for {len(dataset)} frames to {output_dir}")
+    return cache
+
+
+def main():
+    register_third_party_devices()
+    extract_vision_features()
+
+
+if __name__ == "__main__":
+    main()
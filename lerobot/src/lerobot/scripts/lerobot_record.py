@@ -33,6 +33,12 @@ lerobot-record \
     # --teleop.id=blue \
     # <- Policy optional if you want to record with a policy \
     # --policy.path=${HF_USER}/my_policy \
+    # <- Optionally predict the next action chunk while the current one is executed \
+    # --policy_async_inference=true \
+    # <- Optionally run the policy on CPU, quantized to int8 \
+    # --policy.runtime=cpu_int8 \
+    # <- Optionally load the policy weights directly on its device \
+    # --policy.fast_load=true \
 ```
 
 Example recording with bimanual so100:
@@ -65,6 +71,7 @@ from pathlib import Path
 from pprint import pformat
 from typing import Any
 
+from lerobot.async_inference.configs import AGGREGATE_FUNCTIONS, get_aggregate_function
 from lerobot.cameras import (  # noqa: F401
     CameraConfig,  # noqa: F401
 )
@@ -80,6 +87,7 @@ from lerobot.datasets.utils import build_dataset_frame, combine_feature_dicts
 from lerobot.datasets.video_utils import VideoEncodingManager
 from lerobot.policies.factory import make_policy, make_pre_post_processors
 from lerobot.policies.pretrained import PreTrainedPolicy
+from lerobot.policies.runtime import apply_policy_runtime
 from lerobot.policies.utils import make_robot_action
 
 from lerobot.processor import (
@@ -116,6 +124,7 @@ from lerobot.teleoperators import (  # noqa: F401
 from lerobot.teleoperators.keyboard.teleop_keyboard import KeyboardTeleop
 from lerobot.utils.constants import ACTION, OBS_STR
 from lerobot.utils.control_utils import (
+    AsyncPolicyRunner,
     init_keyboard_listener,
     is_headless,
     predict_action,
@@ -190,6 +199,13 @@ class RecordConfig:
     play_sounds: bool = True
     # Resume recording on an existing dataset.
     resume: bool = False
+    # Run the policy on a worker thread, predicting the next action chunk while the current one is executed
+    policy_async_inference: bool = False
+    # Fraction of an action chunk left to execute when the next chunk is requested (with `policy_async_inference`)
+    chunk_size_threshold: float = 0.5
+    # Function blending the overlapping actions of consecutive chunks (with `policy_async_inference`).
+    # Options: "weighted_average", "latest_only", "average", "conservative"
+    aggregate_fn_name: str = "weighted_average"
 
     def __post_init__(self):
         # HACK: We parse again the cli args here to get the pretrained path if there was one.
@@ -202,6 +218,12 @@ class RecordConfig:
         if self.teleop is None and self.policy is None:
             raise ValueError("Choose a policy, a teleoperator or both to control the robot")
 
+        if self.aggregate_fn_name not in AGGREGATE_FUNCTIONS:
+            raise ValueError(
+                f"Unknown aggregate function '{self.aggregate_fn_name}'. "
+                f"Available: {list(AGGREGATE_FUNCTIONS.keys())}"
+            )
+
     @classmethod
     def __get_path_fields__(cls) -> list[str]:
         """This enables the parser to load config from the policy using `--policy.path=local/dir`"""
@@ -260,6 +282,7 @@ def record_loop(
     control_time_s: int | None = None,
     single_task: str | None = None,
     display_data: bool = False,
+    policy_runner: AsyncPolicyRunner | None = None,
 ):
     if dataset is not None and dataset.fps != fps:
         raise ValueError(f"The dataset fps should be equal to requested fps ({dataset.fps} != {fps}).")
@@ -285,7 +308,9 @@ def record_loop(
             )
 
     # Reset policy and processor if they are provided
-    if policy is not None and preprocessor is not None and postprocessor is not None:
+    if policy_runner is not None:
+        policy_runner.reset()
+    elif policy is not None and preprocessor is not None and postprocessor is not None:
         policy.reset()
         preprocessor.reset()
         postprocessor.reset()
@@ -309,7 +334,13 @@ def record_loop(
             observation_frame = build_dataset_frame(dataset.features, obs_processed, prefix=OBS_STR)
 
         # Get action from either policy or teleop
-        if policy is not None and preprocessor is not None and postprocessor is not None:
+        if policy is not None and policy_runner is not None:
+            # The next chunk is predicted on the runner's worker thread, the loop only pops queued actions
+            action_values = policy_runner.step(observation_frame)
+
+            act_processed_policy: RobotAction = make_robot_action(action_values, dataset.features)
+
+        elif policy is not None and preprocessor is not None and postprocessor is not None:
             action_values = predict_action(
                 observation=observation_frame,
                 policy=policy,
@@ -455,6 +486,21 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
                 "rename_observations_processor": {"rename_map": cfg.dataset.rename_map},
             },
         )
+        policy = apply_policy_runtime(policy, preprocessor, postprocessor)
+
+    policy_runner = None
+    if policy is not None and cfg.policy_async_inference:
+        policy_runner = AsyncPolicyRunner(
+            policy=policy,
+            device=get_safe_torch_device(policy.config.device),
+            preprocessor=preprocessor,
+            postprocessor=postprocessor,
+            use_amp=policy.config.use_amp,
+            task=cfg.dataset.single_task,
+            robot_type=robot.robot_type,
+            chunk_size_threshold=cfg.chunk_size_threshold,
+            aggregate_fn=get_aggregate_function(cfg.aggregate_fn_name),
+        )
 
     robot.connect()
     if teleop is not None:
@@ -481,6 +527,7 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
                 control_time_s=cfg.dataset.episode_time_s,
                 single_task=cfg.dataset.single_task,
                 display_data=cfg.display_data,
+                policy_runner=policy_runner,
             )
 
             # Execute a few seconds without recording to give time to manually reset the environment
@@ -514,6 +561,9 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
 
     log_say("Stop recording", cfg.play_sounds, blocking=True)
 
+    if policy_runner is not None:
+        policy_runner.close()
+
     robot.disconnect()
     if teleop is not None:
         teleop.disconnect()
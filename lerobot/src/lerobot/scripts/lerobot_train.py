@@ -206,6 +206,10 @@ def train(cfg: TrainPipelineConfig, accelerator: Accelerator | None = None):
         rename_map=cfg.rename_map,
     )
 
+    vision_feature_cache = getattr(dataset, "vision_feature_cache", None)
+    if vision_feature_cache is not None:
+        vision_feature_cache.check_weights(policy.vision_weights_hash())
+
     # Wait for all processes to finish policy creation before continuing
     accelerator.wait_for_everyone()
 
@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team.
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Shared-memory ring buffers to exchange fixed-shape arrays between processes running on the same host.
+
+The buffer is made of `num_slots` slots, each one holding one array per field. The writer fills the slots
+round-robin and the reader accesses them by (slot, sequence) reference: each slot carries the sequence number
+of the last write (a seqlock), so that readers can detect whether the data they point to has been overwritten
+in the meantime. Only the small reference needs to be sent through a notification channel (e.g. gRPC).
+
+`SharedMemoryMessageQueue` is a queue of variable-size byte messages built on the same layout, for a single
+producer and a single consumer.
+"""
+
+import contextlib
+import time
+import uuid
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from queue import Empty, Full
+
+import numpy as np
+
+# Slots and fields are aligned to cache lines
+ALIGNMENT = 64
+
+# Sequence value of a slot being written
+SLOT_WRITING = -1
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+@dataclass
+class SharedMemoryRingSpec:
+    """Layout of a shared-memory ring buffer, sent to the processes attaching to it.
+
+    Args:
+        name: Name of the shared memory block.
+        num_slots: Number of slots in the ring.
+        fields: Mapping from field name to (shape, numpy dtype string) of the array stored in each slot.
+    """
+
+    name: str
+    num_slots: int
+    fields: dict[str, tuple[tuple[int, ...], str]]
+
+    def field_nbytes(self, key: str) -> int:
+        shape, dtype = self.fields[key]
+        return int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize
+
+    @property
+    def header_nbytes(self) -> int:
+        return _align(self.num_slots * np.dtype(np.int64).itemsize)
+
+    @property
+    def slot_nbytes(self) -> int:
+        return sum(_align(self.field_nbytes(key)) for key in self.fields)
+
+    @property
+    def total_nbytes(self) -> int:
+        return self.header_nbytes + self.num_slots * self.slot_nbytes
+
+
+@dataclass
+class SharedMemoryRef:
+    """Reference to the content written in a ring buffer slot"""
+
+    slot: int
+    sequence: int
+
+
+class SharedMemoryRingBuffer:
+    """Single-writer ring buffer of fixed-shape arrays living in a `multiprocessing.shared_memory` block.
+
+    Use `SharedMemoryRingBuffer.create` on the writer side, and `SharedMemoryRingBuffer.attach` with the
+    writer's `spec` on the reader side.
+    """
+
+    def __init__(self, spec: SharedMemoryRingSpec, shm: shared_memory.SharedMemory, owner: bool):
+        self.spec = spec
+        self._shm = shm
+        self._owner = owner
+        self._next_sequence = 0
+
+        self._sequences = np.ndarray((spec.num_slots,), dtype=np.int64, buffer=shm.buf, offset=0)
+
+        # Pre-build the numpy views over every (slot, field), so that reads and writes don't allocate
+        self._views: list[dict[str, np.ndarray]] = []
+        for slot in range(spec.num_slots):
+            offset = spec.header_nbytes + slot * spec.slot_nbytes
+            views = {}
+            for key, (shape, dtype) in spec.fields.items():
+                views[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+                offset += _align(spec.field_nbytes(key))
+            self._views.append(views)
+
+    @classmethod
+    def create(
+        cls, fields: dict[str, tuple[tuple[int, ...], str]], num_slots: int, name: str | None = None
+    ) -> "SharedMemoryRingBuffer":
+        if num_slots < 1:
+            raise ValueError(f"num_slots must be positive, got {num_slots}")
+
+        spec = SharedMemoryRingSpec(
+            name=name or f"lerobot_{uuid.uuid4().hex[:16]}",
+            num_slots=num_slots,
+            fields={key: (tuple(shape), np.dtype(dtype).str) for key, (shape, dtype) in fields.items()},
+        )
+        shm = shared_memory.SharedMemory(name=spec.name, create=True, size=spec.total_nbytes)
+        ring = cls(spec, shm, owner=True)
+        ring._sequences[:] = SLOT_WRITING
+        return ring
+
+    @classmethod
+    def attach(cls, spec: SharedMemoryRingSpec) -> "SharedMemoryRingBuffer":
+        shm = shared_memory.SharedMemory(name=spec.name, create=False)
+        # The block is owned (and unlinked) by the writer. Without this, the resource tracker of the reader
+        # process would unlink it as well when the reader exits.
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(spec, shm, owner=False)
+
+    def write(self, data: dict[str, np.ndarray | float]) -> SharedMemoryRef:
+        """Copy `data` in the next slot of the ring, and return the reference to read it back"""
+        sequence = self._next_sequence
+        slot = sequence % self.spec.num_slots
+
+        self._sequences[slot] = SLOT_WRITING
+        for key, view in self._views[slot].items():
+            np.copyto(view, data[key], casting="unsafe")
+        self._sequences[slot] = sequence
+
+        self._next_sequence += 1
+        return SharedMemoryRef(slot=slot, sequence=sequence)
+
+    def is_valid(self, ref: SharedMemoryRef) -> bool:
+        """Whether the slot still holds the data written for `ref`"""
+        return int(self._sequences[ref.slot]) == ref.sequence
+
+    def read(self, ref: SharedMemoryRef) -> dict[str, np.ndarray] | None:
+        """Zero-copy read of the slot pointed by `ref`. Returns None if it has been overwritten already.
+
+        The returned arrays are views over the shared memory: callers that keep them around should either copy
+        them or check `is_valid` once done with them.
+        """
+        if not self.is_valid(ref):
+            return None
+        return dict(self._views[ref.slot])
+
+    def close(self) -> None:
+        self._views = []
+        self._sequences = None
+        # Views handed out by `read` may still be alive: the mapping is then released when they are collected
+        with contextlib.suppress(BufferError):
+            self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+# Length recorded in a message queue slot whose message went through the overflow queue
+SLOT_OVERFLOW = -1
+
+
+class SharedMemoryMessageQueue:
+    """Single-producer single-consumer queue of byte messages living in a `multiprocessing.shared_memory` block.
+
+    Drop-in replacement of a `multiprocessing.Queue` carrying serialized messages between two threads or
+    processes: messages are copied into fixed-size slots, without pickling them nor taking a lock. The producer
+    owns the tail counter and the consumer the head counter, each one being written by a single side only.
+    Messages larger than a slot go through an overflow `torch.multiprocessing.Queue`, a marker slot keeping
+    them in order with the others. `put` blocks while all the slots hold messages not yet consumed, use a
+    `timeout` to give up (`queue.Full`) when the consumer may be stalled.
+
+    The block takes about `num_slots * slot_nbytes` bytes of /dev/shm, which Docker limits to 64 MB by default.
+
+    The queue can be passed as argument to a `multiprocessing.Process`: the child process attaches to the same
+    shared memory block. Only one process may `put` and only one may `get`.
+    """
+
+    # Polling period of a blocked `put` or `get`, in seconds
+    poll_interval_s = 5e-4
+
+    def __init__(self, num_slots: int = 16, slot_nbytes: int = 1 << 20, name: str | None = None):
+        if num_slots < 1:
+            raise ValueError(f"num_slots must be positive, got {num_slots}")
+        if slot_nbytes < 1:
+            raise ValueError(f"slot_nbytes must be positive, got {slot_nbytes}")
+
+        from torch.multiprocessing import Queue
+
+        self.num_slots = num_slots
+        self.slot_nbytes = slot_nbytes
+        self._overflow = Queue()
+        self._shm = shared_memory.SharedMemory(
+            name=name or f"lerobot_{uuid.uuid4().hex[:16]}", create=True, size=self._total_nbytes()
+        )
+        self._owner = True
+        self._map_views()
+        self._head[0] = 0
+        self._tail[0] = 0
+
+    def _slot_stride(self) -> int:
+        return _align(np.dtype(np.int64).itemsize + self.slot_nbytes)
+
+    def _total_nbytes(self) -> int:
+        # Head and tail live on their own cache line, written by a single side each
+        return 2 * ALIGNMENT + self.num_slots * self._slot_stride()
+
+    def _map_views(self) -> None:
+        buf = self._shm.buf
+        self._head = np.ndarray((1,), dtype=np.int64, buffer=buf, offset=0)
+        self._tail = np.ndarray((1,), dtype=np.int64, buffer=buf, offset=ALIGNMENT)
+        self._lengths = []
+        self._payloads = []
+        for slot in range(self.num_slots):
+            offset = 2 * ALIGNMENT + slot * self._slot_stride()
+            self._lengths.append(np.ndarray((1,), dtype=np.int64, buffer=buf, offset=offset))
+            start = offset + np.dtype(np.int64).itemsize
+            self._payloads.append(buf[start : start + self.slot_nbytes])
+
+    def __getstate__(self) -> dict:
+        return {
+            "name": self._shm.name,
+            "num_slots": self.num_slots,
+            "slot_nbytes": self.slot_nbytes,
+            "overflow": self._overflow,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.num_slots = state["num_slots"]
+        self.slot_nbytes = state["slot_nbytes"]
+        self._overflow = state["overflow"]
+        self._shm = shared_memory.SharedMemory(name=state["name"], create=False)
+        # The block is unlinked by the process that created it, see `SharedMemoryRingBuffer.attach`
+        resource_tracker.unregister(self._shm._name, "shared_memory")
+        self._owner = False
+        self._map_views()
+
+    def qsize(self) -> int:
+        return int(self._tail[0] - self._head[0])
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def put(self, message: bytes | bytearray | memoryview, block: bool = True, timeout: float | None = None):
+        """Append `message` to the queue. Raises `queue.Full` if no slot frees up in time"""
+        tail = int(self._tail[0])
+        self._wait(lambda: tail - int(self._head[0]) < self.num_slots, block, timeout, Full)
+
+        slot = tail % self.num_slots
+        message = memoryview(message).cast("B")
+        if message.nbytes > self.slot_nbytes:
+            self._overflow.put(bytes(message))
+            self._lengths[slot][0] = SLOT_OVERFLOW
+        else:
+            self._payloads[slot][: message.nbytes] = message
+            self._lengths[slot][0] = message.nbytes
+
+        # Publish the slot once its content is written
+        self._tail[0] = tail + 1
+
+    def put_nowait(self, message: bytes | bytearray | memoryview) -> None:
+        self.put(message, block=False)
+
+    def get(self, block: bool = True, timeout: float | None = None) -> bytes:
+        """Pop the oldest message of the queue. Raises `queue.Empty` if none comes in time"""
+        head = int(self._head[0])
+        self._wait(lambda: int(self._tail[0]) > head, block, timeout, Empty)
+
+        slot = head % self.num_slots
+        length = int(self._lengths[slot][0])
+        # The slot is reused once released: its content is copied out first
+        message = self._overflow.get() if length == SLOT_OVERFLOW else bytes(self._payloads[slot][:length])
+
+        self._head[0] = head + 1
+        return message
+
+    def get_nowait(self) -> bytes:
+        return self.get(block=False)
+
+    def _wait(self, ready, block: bool, timeout: float | None, exception: type[Exception]) -> None:
+        if ready():
+            return
+        if not block:
+            raise exception
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not ready():
+            if deadline is not None and time.monotonic() >= deadline:
+                raise exception
+            time.sleep(self.poll_interval_s)
+
+    def close(self) -> None:
+        self._head = self._tail = None
+        self._lengths = []
+        self._payloads = []
+        with contextlib.suppress(BufferError):
+            self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+            self._owner = False
+        self._overflow.close()
+
+    def cancel_join_thread(self) -> None:
+        self._overflow.cancel_join_thread()
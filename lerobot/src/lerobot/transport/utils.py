@@ -26,11 +26,25 @@ from typing import Any
 import torch
 
 from lerobot.transport import services_pb2
+from lerobot.utils.constants import ACTION, OBS_IMAGE
 from lerobot.utils.transition import Transition
 
 CHUNK_SIZE = 2 * 1024 * 1024  # 2 MB
 MAX_MESSAGE_SIZE = 4 * 1024 * 1024  # 4 MB
 
+# Flat state dict serialization: size of the header length prefix, and alignment of the tensors data
+HEADER_SIZE_NBYTES = 8
+ALIGNMENT = 64
+
+
+# Compression of the transition batches. The index in this list is the codec id written in the first byte.
+TRANSITION_COMPRESSIONS = [None, "lz4", "zstd"]
+ZSTD_LEVEL = 3
+
+
+def _align(nbytes: int) -> int:
+    return (nbytes + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
 
 def bytes_buffer_size(buffer: io.BytesIO) -> int:
     buffer.seek(0, io.SEEK_END)
@@ -39,9 +53,12 @@ def bytes_buffer_size(buffer: io.BytesIO) -> int:
     return result
 
 
-def send_bytes_in_chunks(buffer: bytes, message_class: Any, log_prefix: str = "", silent: bool = True):
-    buffer = io.BytesIO(buffer)
-    size_in_bytes = bytes_buffer_size(buffer)
+def send_bytes_in_chunks(
+    buffer: bytes | bytearray | memoryview, message_class: Any, log_prefix: str = "", silent: bool = True
+):
+    # Chunks are sliced out of a memoryview: the only copy is the one protobuf makes of each chunk
+    buffer = memoryview(buffer).cast("B")
+    size_in_bytes = buffer.nbytes
 
     sent_bytes = 0
 
@@ -58,17 +75,51 @@ def send_bytes_in_chunks(buffer: bytes, message_class: Any, log_prefix: str = ""
             transfer_state = services_pb2.TransferState.TRANSFER_BEGIN
 
         size_to_read = min(CHUNK_SIZE, size_in_bytes - sent_bytes)
-        chunk = buffer.read(size_to_read)
+        chunk = bytes(buffer[sent_bytes : sent_bytes + size_to_read])
+
+        # The first chunk announces the total size, so that the receiver can allocate its buffer once
+        total_size = size_in_bytes if sent_bytes == 0 else 0
 
-        yield message_class(transfer_state=transfer_state, data=chunk)
+        yield message_class(transfer_state=transfer_state, data=chunk, total_size=total_size)
         sent_bytes += size_to_read
         logging_method(f"{log_prefix} Sent {sent_bytes}/{size_in_bytes} bytes with state {transfer_state}")
 
     logging_method(f"{log_prefix} Published {sent_bytes / 1024 / 1024} MB")
 
 
+class _ReceiveBuffer:
+    """Receive buffer preallocated from the total size announced by the first chunk.
+
+    Falls back to growing the buffer when the sender doesn't announce the total size.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.size = 0
+
+    def begin(self, total_size: int) -> None:
+        self.buffer = bytearray(total_size)
+        self.size = 0
+
+    def write(self, data: bytes) -> None:
+        end = self.size + len(data)
+        if end > len(self.buffer):
+            self.buffer.extend(bytes(end - len(self.buffer)))
+        memoryview(self.buffer)[self.size : end] = data
+        self.size = end
+
+    def pop(self) -> bytearray:
+        """Hands over the received payload, and resets the receive buffer"""
+        buffer = self.buffer
+        if self.size != len(buffer):
+            del buffer[self.size :]
+        self.buffer = bytearray()
+        self.size = 0
+        return buffer
+
+
 def receive_bytes_in_chunks(iterator, queue: Queue | None, shutdown_event: Event, log_prefix: str = ""):
-    bytes_buffer = io.BytesIO()
+    bytes_buffer = _ReceiveBuffer()
     step = 0
 
     logging.info(f"{log_prefix} Starting receiver")
@@ -79,8 +130,7 @@ def receive_bytes_in_chunks(iterator, queue: Queue | None, shutdown_event: Event
             return
 
         if item.transfer_state == services_pb2.TransferState.TRANSFER_BEGIN:
-            bytes_buffer.seek(0)
-            bytes_buffer.truncate(0)
+            bytes_buffer.begin(item.total_size)
             bytes_buffer.write(item.data)
             logging.debug(f"{log_prefix} Received data at step 0")
             step = 0
@@ -89,16 +139,16 @@ def receive_bytes_in_chunks(iterator, queue: Queue | None, shutdown_event: Event
             step += 1
             logging.debug(f"{log_prefix} Received data at step {step}")
         elif item.transfer_state == services_pb2.TransferState.TRANSFER_END:
+            if item.total_size > 0:  # single-chunk payload, no TRANSFER_BEGIN was sent
+                bytes_buffer.begin(item.total_size)
             bytes_buffer.write(item.data)
-            logging.debug(f"{log_prefix} Received data at step end size {bytes_buffer_size(bytes_buffer)}")
+            logging.debug(f"{log_prefix} Received data at step end size {bytes_buffer.size}")
 
             if queue is not None:
-                queue.put(bytes_buffer.getvalue())
+                queue.put(bytes_buffer.pop())
             else:
-                return bytes_buffer.getvalue()
+                return bytes_buffer.pop()
 
-            bytes_buffer.seek(0)
-            bytes_buffer.truncate(0)
             step = 0
 
             logging.debug(f"{log_prefix} Queue updated")
@@ -107,19 +157,116 @@ def receive_bytes_in_chunks(iterator, queue: Queue | None, shutdown_event: Event
             raise ValueError(f"Received unknown transfer state {item.transfer_state}")
 
 
-def state_to_bytes(state_dict: dict[str, torch.Tensor]) -> bytes:
-    """Convert model state dict to flat array for transmission"""
-    buffer = io.BytesIO()
+def _flatten_state_dict(
+    state_dict: dict, prefix: tuple[str, ...] = ()
+) -> list[tuple[list[str], torch.Tensor]]:
+    flat = []
+    for key, value in state_dict.items():
+        if isinstance(value, dict):
+            flat.extend(_flatten_state_dict(value, (*prefix, key)))
+        elif isinstance(value, torch.Tensor):
+            flat.append(([*prefix, key], value))
+        else:
+            raise TypeError(
+                f"State dict values must be tensors or dicts of tensors, got {type(value)} for {key}"
+            )
+    return flat
 
-    torch.save(state_dict, buffer)
 
-    return buffer.getvalue()
+def state_to_bytes(state_dict: dict[str, torch.Tensor], metadata: dict | None = None) -> bytearray:
+    """Serialize a (possibly nested) state dict into a single flat buffer, safetensors-style:
 
+    [8 bytes little-endian header size][JSON header][padding][tensor data, each aligned on ALIGNMENT bytes]
+
+    The header lists the key path, dtype, shape and byte range of every tensor, along with the optional
+    JSON-serializable `metadata`. Tensors are copied once, directly into the output buffer.
+    """
+    flat = _flatten_state_dict(state_dict)
+
+    entries = []
+    data_size = 0
+    for key_path, tensor in flat:
+        nbytes = tensor.numel() * tensor.element_size()
+        entries.append(
+            {
+                "key": key_path,
+                "dtype": str(tensor.dtype).removeprefix("torch."),
+                "shape": list(tensor.shape),
+                "offset": data_size,
+                "nbytes": nbytes,
+            }
+        )
+        data_size += _align(nbytes)
+
+    header = json.dumps({"metadata": metadata or {}, "tensors": entries}).encode("utf-8")
+    data_start = _align(HEADER_SIZE_NBYTES + len(header))
+
+    buffer = bytearray(data_start + data_size)
+    buffer[:HEADER_SIZE_NBYTES] = len(header).to_bytes(HEADER_SIZE_NBYTES, "little")
+    buffer[HEADER_SIZE_NBYTES : HEADER_SIZE_NBYTES + len(header)] = header
+
+    view = memoryview(buffer)
+    for entry, (_, tensor) in zip(entries, flat, strict=True):
+        if entry["nbytes"] == 0:
+            continue
+        start = data_start + entry["offset"]
+        # Reinterpret as raw bytes, so that dtypes without a numpy equivalent (e.g. bfloat16) are supported
+        raw = tensor.detach().cpu().contiguous().reshape(-1).view(torch.uint8)
+        view[start : start + entry["nbytes"]] = raw.numpy()
+
+    return buffer
 
-def bytes_to_state_dict(buffer: bytes) -> dict[str, torch.Tensor]:
-    buffer = io.BytesIO(buffer)
-    buffer.seek(0)
-    return torch.load(buffer, weights_only=True)
+
+def bytes_to_state_dict(buffer: bytes | bytearray) -> dict[str, torch.Tensor]:
+    """Deserialize a buffer produced by `state_to_bytes`.
+
+    The returned tensors are views over `buffer` when it is writable (e.g. the bytearray returned by
+    `receive_bytes_in_chunks`), so no copy is made.
+    """
+    state_dict, _ = bytes_to_state_dict_and_metadata(buffer)
+    return state_dict
+
+
+def _read_header(buffer: bytes | bytearray) -> tuple[dict, int]:
+    header_size = int.from_bytes(buffer[:HEADER_SIZE_NBYTES], "little")
+    header = json.loads(bytes(buffer[HEADER_SIZE_NBYTES : HEADER_SIZE_NBYTES + header_size]))
+    return header, _align(HEADER_SIZE_NBYTES + header_size)
+
+
+def bytes_to_metadata(buffer: bytes | bytearray) -> dict:
+    """The metadata passed to `state_to_bytes`, without deserializing the tensors"""
+    header, _ = _read_header(buffer)
+    return header["metadata"]
+
+
+def bytes_to_state_dict_and_metadata(buffer: bytes | bytearray) -> tuple[dict[str, torch.Tensor], dict]:
+    """Same as `bytes_to_state_dict`, also returning the metadata passed to `state_to_bytes`"""
+    if isinstance(buffer, bytes):
+        buffer = bytearray(buffer)
+
+    header, data_start = _read_header(buffer)
+
+    state_dict = {}
+    for entry in header["tensors"]:
+        dtype = getattr(torch, entry["dtype"])
+        if entry["nbytes"] == 0:
+            tensor = torch.empty(entry["shape"], dtype=dtype)
+        else:
+            tensor = (
+                torch.frombuffer(
+                    buffer, dtype=torch.uint8, count=entry["nbytes"], offset=data_start + entry["offset"]
+                )
+                .view(dtype)
+                .view(entry["shape"])
+            )
+
+        *parents, key = entry["key"]
+        node = state_dict
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[key] = tensor
+
+    return state_dict, header["metadata"]
 
 
 def python_object_to_bytes(python_object: Any) -> bytes:
@@ -147,6 +294,136 @@ def transitions_to_bytes(transitions: list[Transition]) -> bytes:
     return buffer.getvalue()
 
 
+def _compress(buffer: bytearray, compression: str | None) -> bytes | bytearray:
+    if compression is None:
+        return buffer
+    if compression == "lz4":
+        import lz4.frame
+
+        return lz4.frame.compress(buffer)
+    if compression == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(buffer)
+    raise ValueError(f"Unknown compression '{compression}'. Available: {TRANSITION_COMPRESSIONS}")
+
+
+def _decompress(buffer: bytes | bytearray, compression: str | None) -> bytes | bytearray:
+    if compression is None:
+        return buffer
+    if compression == "lz4":
+        import lz4.frame
+
+        return lz4.frame.decompress(buffer)
+    if compression == "zstd":
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(buffer)
+    raise ValueError(f"Unknown compression '{compression}'. Available: {TRANSITION_COMPRESSIONS}")
+
+
+def _stack_column(values: list) -> torch.Tensor:
+    """Stacks per-transition values (tensors with a leading batch dim of 1, or python scalars) into (N, ...)"""
+    if isinstance(values[0], torch.Tensor):
+        return torch.stack([value.squeeze(0) for value in values])
+    return torch.tensor(values)
+
+
+def transitions_to_batch_bytes(transitions: list[Transition], compression: str | None = None) -> bytes:
+    """Serialize a list of transitions in a columnar batch: one stacked (N, ...) tensor per key.
+
+    - Floating point images (keys starting with `observation.image`) are sent as uint8 when all their values
+      are in [0, 1], and as is otherwise.
+    - When the transitions are consecutive steps of an episode (next_state[i] == state[i+1]), only the last
+      next_state is sent.
+    - The serialized batch is optionally compressed with "lz4" or "zstd" (requires the `lz4` or `zstandard`
+      packages, installed with `pip install 'lerobot[compression]'`).
+
+    The first byte of the output identifies the compression, the rest is a flat buffer from `state_to_bytes`.
+    """
+    if compression not in TRANSITION_COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}'. Available: {TRANSITION_COMPRESSIONS}")
+
+    states = {key: _stack_column([t["state"][key] for t in transitions]) for key in transitions[0]["state"]}
+    next_states = {
+        key: _stack_column([t["next_state"][key] for t in transitions])
+        for key in transitions[0]["next_state"]
+    }
+
+    next_state_shifted = next_states.keys() == states.keys() and all(
+        torch.equal(next_states[key][:-1], states[key][1:]) for key in states
+    )
+    if next_state_shifted:
+        next_states = {key: value[-1:] for key, value in next_states.items()}
+
+    image_keys = [
+        key
+        for key, value in {**states, **next_states}.items()
+        if key.startswith(OBS_IMAGE) and value.is_floating_point()
+    ]
+    # The quantization assumes images in [0, 1], other ones would be clipped, so they are sent as is
+    columns = (states, next_states)
+    uint8_keys = [
+        key
+        for key in image_keys
+        if all(column[key].min() >= 0 and column[key].max() <= 1 for column in columns if key in column)
+    ]
+    for column in columns:
+        for key in uint8_keys:
+            if key in column:
+                column[key] = column[key].mul(255).round_().to(torch.uint8)
+
+    batch = {
+        "state": states,
+        "next_state": next_states,
+        ACTION: _stack_column([t[ACTION] for t in transitions]),
+        "reward": _stack_column([t["reward"] for t in transitions]).float().reshape(-1),
+        "done": _stack_column([t["done"] for t in transitions]).bool().reshape(-1),
+        "truncated": _stack_column([t["truncated"] for t in transitions]).bool().reshape(-1),
+    }
+
+    if transitions[0].get("complementary_info") is not None:
+        batch["complementary_info"] = {
+            key: _stack_column([t["complementary_info"][key] for t in transitions])
+            for key in transitions[0]["complementary_info"]
+        }
+
+    metadata = {
+        "num_transitions": len(transitions),
+        "uint8_keys": uint8_keys,
+        "next_state_shifted": next_state_shifted,
+    }
+    buffer = _compress(state_to_bytes(batch, metadata=metadata), compression)
+
+    return TRANSITION_COMPRESSIONS.index(compression).to_bytes(1, "little") + buffer
+
+
+def batch_bytes_to_transitions(buffer: bytes | bytearray) -> dict[str, Any]:
+    """Deserialize a buffer produced by `transitions_to_batch_bytes`.
+
+    Returns a batched transition: the same keys as `Transition`, with stacked (N, ...) tensors as values.
+    """
+    compression = TRANSITION_COMPRESSIONS[buffer[0]]
+    payload = _decompress(memoryview(buffer)[1:], compression)
+    if not isinstance(payload, bytearray):
+        payload = bytearray(payload)
+
+    batch, metadata = bytes_to_state_dict_and_metadata(payload)
+
+    for column in (batch["state"], batch["next_state"]):
+        for key in metadata["uint8_keys"]:
+            if key in column:
+                column[key] = column[key].float().div_(255)
+
+    if metadata["next_state_shifted"]:
+        batch["next_state"] = {
+            key: torch.cat([batch["state"][key][1:], value]) for key, value in batch["next_state"].items()
+        }
+
+    batch.setdefault("complementary_info", None)
+    return batch
+
+
 def grpc_channel_options(
     max_receive_message_length: int = MAX_MESSAGE_SIZE,
     max_send_message_length: int = MAX_MESSAGE_SIZE,
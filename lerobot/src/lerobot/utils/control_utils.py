@@ -19,6 +19,8 @@
 
 import logging
 import traceback
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import nullcontext
 from copy import copy
 from functools import cache
@@ -115,6 +117,152 @@ def predict_action(
     return action
 
 
+class AsyncPolicyRunner:
+    """
+    Runs an action chunking policy on a worker thread, concurrently with the control loop.
+
+    This is the in-process counterpart of `RobotClient` and `PolicyServer`: once the number of queued actions
+    falls to `chunk_size_threshold` of a chunk, the next chunk is predicted on the worker thread from the latest
+    observation while the control loop keeps executing the queued actions. The actions of the new chunk that
+    overlap with queued ones are blended with `aggregate_fn`. The control loop only waits for the policy when
+    no action is queued for the current step, i.e. at the start of an episode or when inference is slower
+    than the execution of `1 - chunk_size_threshold` of a chunk.
+
+    The policy, preprocessor and postprocessor are only used from the worker thread.
+
+    Args:
+        policy: The `PreTrainedPolicy` predicting the action chunks.
+        device: The `torch.device` to run inference on.
+        preprocessor: The `PolicyProcessorPipeline` for preprocessing observations.
+        postprocessor: The `PolicyProcessorPipeline` for postprocessing actions.
+        use_amp: A boolean to enable/disable Automatic Mixed Precision for CUDA inference.
+        task: An optional string identifier for the task.
+        robot_type: An optional string identifier for the robot type.
+        chunk_size_threshold: Fraction of a chunk left in the queue below which the next chunk is requested.
+        aggregate_fn: Function blending the queued action and the new action predicted for the same step.
+            Defaults to keeping the new action.
+    """
+
+    def __init__(
+        self,
+        policy: PreTrainedPolicy,
+        device: torch.device,
+        preprocessor: PolicyProcessorPipeline[dict[str, Any], dict[str, Any]],
+        postprocessor: PolicyProcessorPipeline[PolicyAction, PolicyAction],
+        use_amp: bool,
+        task: str | None = None,
+        robot_type: str | None = None,
+        chunk_size_threshold: float = 0.5,
+        aggregate_fn: Callable[[torch.Tensor, torch.Tensor], torch.Tensor] | None = None,
+    ):
+        if not 0 <= chunk_size_threshold <= 1:
+            raise ValueError(f"chunk_size_threshold must be in [0, 1], got {chunk_size_threshold}")
+
+        self.policy = policy
+        self.device = device
+        self.preprocessor = preprocessor
+        self.postprocessor = postprocessor
+        self.use_amp = use_amp
+        self.task = task
+        self.robot_type = robot_type
+        self.chunk_size_threshold = chunk_size_threshold
+        self.aggregate_fn = aggregate_fn if aggregate_fn is not None else (lambda old, new: new)
+
+        # Number of actions of a chunk executed before the next one, updated with the size of predicted chunks
+        self.chunk_size = getattr(policy.config, "n_action_steps", None) or 1
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="policy_runner")
+        self._future: Future | None = None
+        # Queued actions, by timestep. Only accessed from the control loop thread.
+        self._actions: dict[int, torch.Tensor] = {}
+        self._timestep = 0
+
+    def reset(self) -> None:
+        """Waits for the in-flight inference, drops the queued actions and resets the policy and processors."""
+        if self._future is not None:
+            self._future.exception()
+            self._future = None
+        self._actions.clear()
+        self._timestep = 0
+
+        self.policy.reset()
+        self.preprocessor.reset()
+        self.postprocessor.reset()
+
+    def step(self, observation: dict[str, np.ndarray]) -> torch.Tensor:
+        """
+        Returns the action to execute at the current step, and requests the next chunk if the queue runs low.
+
+        Args:
+            observation: A dictionary of NumPy arrays representing the robot's current observation.
+
+        Returns:
+            A `torch.Tensor` of shape (action_dim,) containing the action, ready for the robot.
+        """
+        timestep = self._timestep
+
+        if self._future is not None and self._future.done():
+            self._merge_chunk(*self._future.result())
+            self._future = None
+
+        # Nothing queued for this step: wait for the in-flight chunk, or predict one from this observation
+        while timestep not in self._actions:
+            if self._future is None:
+                self._future = self._executor.submit(self._predict_chunk, observation, timestep)
+            self._merge_chunk(*self._future.result())
+            self._future = None
+
+        action = self._actions.pop(timestep)
+        self._timestep += 1
+
+        if self._future is None and len(self._actions) / self.chunk_size <= self.chunk_size_threshold:
+            self._future = self._executor.submit(self._predict_chunk, observation, timestep)
+
+        return action
+
+    def close(self) -> None:
+        """Stops the worker thread, once the in-flight inference is done."""
+        self._executor.shutdown(wait=True)
+        self._future = None
+
+    def _merge_chunk(self, start_timestep: int, chunk: torch.Tensor) -> None:
+        """Queues the actions of a chunk predicted at `start_timestep`, skipping the ones already executed."""
+        self.chunk_size = max(self.chunk_size, len(chunk))
+        for i, action in enumerate(chunk):
+            timestep = start_timestep + i
+            if timestep < self._timestep:
+                continue
+            if timestep in self._actions:
+                action = self.aggregate_fn(self._actions[timestep], action)
+            self._actions[timestep] = action
+
+    def _predict_chunk(self, observation: dict[str, np.ndarray], timestep: int) -> tuple[int, torch.Tensor]:
+        """Predicts the action chunk of an observation, on the worker thread."""
+        observation = copy(observation)
+        with (
+            torch.inference_mode(),
+            torch.autocast(device_type=self.device.type)
+            if self.device.type == "cuda" and self.use_amp
+            else nullcontext(),
+        ):
+            observation = prepare_observation_for_inference(
+                observation, self.device, self.task, self.robot_type
+            )
+            observation = self.preprocessor(observation)
+
+            chunk = self.policy.predict_action_chunk(observation)
+            if chunk.ndim != 3:
+                chunk = chunk.unsqueeze(0)  # adding batch dimension, now shape is (B, chunk_size, action_dim)
+            n_action_steps = getattr(self.policy.config, "n_action_steps", None)
+            if n_action_steps is not None:
+                chunk = chunk[:, :n_action_steps]
+
+            # The postprocessor expects (B, action_dim) actions
+            chunk = torch.stack([self.postprocessor(chunk[:, i]) for i in range(chunk.shape[1])], dim=1)
+
+        return timestep, chunk.squeeze(0).cpu()
+
+
 def init_keyboard_listener():
     """
     Initializes a non-blocking keyboard listener for real-time user interaction.